@@ -0,0 +1,228 @@
+"""
+Agent store - struct-of-arrays state for snails, ducks and weed pickers
+
+Every moving agent owns a slot in parallel NumPy arrays (position,
+velocity, move target, timer, lifetime, walk animation). One vectorized
+step moves all agents toward their targets, advances their walk cycles
+and finds expired timers; only the agents that arrived or whose timer
+ran out get a Python callback. Freed slots are recycled from a free list.
+
+Owners (the Snail, Duck and WeedPicker views) implement:
+    arrive(current_time)      - reached the move target
+    timer_done(current_time)  - the slot's timer expired
+    target_lost()             - the agent being followed was despawned
+"""
+import math
+import numpy as np
+from config import SNAIL_HASH_CELL_SIZE
+
+# Per-agent fields, their dtypes and the value of a free slot
+AGENT_FIELDS = {
+    'x': (np.float64, 0.0),
+    'y': (np.float64, 0.0),
+    'prev_x': (np.float64, 0.0),           # Position before the last step, for interpolation
+    'prev_y': (np.float64, 0.0),
+    'vx': (np.float64, 0.0),               # Velocity of the last step (pixels per second)
+    'vy': (np.float64, 0.0),
+    'target_x': (np.float64, 0.0),
+    'target_y': (np.float64, 0.0),
+    'follow': (np.int64, -1),              # Slot whose position is the target, or -1
+    'speed': (np.float64, 0.0),            # Pixels per second
+    'arrive_distance': (np.float64, 0.0),  # Distance that counts as arrived
+    'moving': (np.bool_, False),
+    'walking': (np.bool_, False),          # Walk cycle advances
+    'walk_cycle': (np.float64, 0.0),
+    'walk_speed': (np.float64, 0.0),
+    'timer_end': (np.float64, math.inf),
+    'spawn_time': (np.float64, 0.0),
+    'lifetime': (np.float64, math.inf),
+    'cell_x': (np.int64, 0),               # Spatial hash cell of the position
+    'cell_y': (np.int64, 0),
+    'alive': (np.bool_, False)
+}
+
+
+class AgentStore:
+    """Parallel arrays holding every live agent, with a free list of slots"""
+
+    def __init__(self, capacity=64, cell_size=SNAIL_HASH_CELL_SIZE):
+        self.cell_size = cell_size
+        self.capacity = max(1, capacity)
+        self.count = 0      # High-water mark of used slots
+        self.free = []      # Released slots, reused before growing
+        self.owners = [None] * self.capacity
+        for name, (dtype, empty) in AGENT_FIELDS.items():
+            setattr(self, name, np.full(self.capacity, empty, dtype=dtype))
+
+    def _ensure_capacity(self, needed):
+        """Grow all arrays (amortized doubling) to hold at least `needed` slots"""
+        if needed <= self.capacity:
+            return
+        new_capacity = max(needed, self.capacity * 2)
+        for name, (dtype, empty) in AGENT_FIELDS.items():
+            new_array = np.full(new_capacity, empty, dtype=dtype)
+            new_array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, new_array)
+        self.owners.extend([None] * (new_capacity - self.capacity))
+        self.capacity = new_capacity
+
+    def spawn(self, owner, x, y, speed, arrive_distance, current_time=0.0,
+              lifetime=math.inf, walk_speed=0.0):
+        """Give an owner a slot at (x, y), standing still, and return the slot"""
+        if self.free:
+            slot = self.free.pop()
+        else:
+            self._ensure_capacity(self.count + 1)
+            slot = self.count
+            self.count += 1
+        self.owners[slot] = owner
+        self.x[slot] = self.prev_x[slot] = x
+        self.y[slot] = self.prev_y[slot] = y
+        self.speed[slot] = speed
+        self.arrive_distance[slot] = arrive_distance
+        self.walk_speed[slot] = walk_speed
+        self.spawn_time[slot] = current_time
+        self.lifetime[slot] = lifetime
+        self.cell_x[slot] = math.floor(x / self.cell_size)
+        self.cell_y[slot] = math.floor(y / self.cell_size)
+        self.alive[slot] = True
+        return slot
+
+    def despawn(self, slot):
+        """Free a slot; agents following it are stopped and told their target is gone"""
+        for name, (dtype, empty) in AGENT_FIELDS.items():
+            getattr(self, name)[slot] = empty
+        self.owners[slot] = None
+        self.free.append(slot)
+
+        followers = np.flatnonzero(self.follow[:self.count] == slot)
+        if len(followers):
+            self.follow[followers] = -1
+            self.moving[followers] = False
+            self.vx[followers] = self.vy[followers] = 0.0
+            for follower in followers.tolist():
+                self.owners[follower].target_lost()
+
+    def place(self, slot, x, y):
+        """Put an agent at (x, y) without moving there (e.g. when loading a save)"""
+        self.x[slot] = self.prev_x[slot] = x
+        self.y[slot] = self.prev_y[slot] = y
+        self.cell_x[slot] = math.floor(x / self.cell_size)
+        self.cell_y[slot] = math.floor(y / self.cell_size)
+
+    def move_to(self, slot, x, y):
+        """Head for a fixed point"""
+        self.target_x[slot] = x
+        self.target_y[slot] = y
+        self.follow[slot] = -1
+        self.moving[slot] = True
+
+    def chase(self, slot, other):
+        """Head for another agent, following it while it moves"""
+        self.follow[slot] = other
+        self.moving[slot] = True
+
+    def stop(self, slot):
+        """Stand still"""
+        self.follow[slot] = -1
+        self.moving[slot] = False
+        self.vx[slot] = self.vy[slot] = 0.0
+
+    def start_timer(self, slot, when):
+        """Call the owner's timer_done once `when` is reached"""
+        self.timer_end[slot] = when
+
+    def step(self, delta_time, current_time):
+        """Advance every agent and return the slots that need a callback
+
+        Returns (arrived, due, crossed): agents that reached their target,
+        agents whose timer expired, and agents that moved into another
+        spatial hash cell.
+        """
+        n = self.count
+        if n == len(self.free):
+            nothing = np.empty(0, dtype=np.int64)
+            return nothing, nothing, nothing
+        x, y = self.x[:n], self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+
+        # Followers aim at the current position of the agent they chase
+        follow = self.follow[:n]
+        following = np.flatnonzero(self.moving[:n] & (follow >= 0))
+        if len(following):
+            self.target_x[following] = x[follow[following]]
+            self.target_y[following] = y[follow[following]]
+
+        # Arrive or take one step toward the target
+        active = np.flatnonzero(self.moving[:n])
+        dx = self.target_x[active] - x[active]
+        dy = self.target_y[active] - y[active]
+        distance = np.hypot(dx, dy)
+        reached = distance < self.arrive_distance[active]
+
+        arrived = active[reached]
+        self.moving[arrived] = False
+        self.vx[arrived] = self.vy[arrived] = 0.0
+
+        movers = active[~reached]
+        distance = distance[~reached]
+        distance[distance == 0] = 1.0  # Only possible with arrive_distance 0
+        scale = self.speed[movers] / distance
+        self.vx[movers] = dx[~reached] * scale
+        self.vy[movers] = dy[~reached] * scale
+        x[movers] += self.vx[movers] * delta_time
+        y[movers] += self.vy[movers] * delta_time
+
+        # Walk animation
+        walking = self.walking[:n]
+        self.walk_cycle[:n][walking] += self.walk_speed[:n][walking] * delta_time
+
+        # Expired timers fire once
+        due = np.flatnonzero(self.timer_end[:n] <= current_time)
+        self.timer_end[due] = math.inf
+
+        # Movers that changed spatial hash cell
+        cell_x = np.floor(x[movers] / self.cell_size).astype(np.int64)
+        cell_y = np.floor(y[movers] / self.cell_size).astype(np.int64)
+        changed = (cell_x != self.cell_x[movers]) | (cell_y != self.cell_y[movers])
+        crossed = movers[changed]
+        self.cell_x[crossed] = cell_x[changed]
+        self.cell_y[crossed] = cell_y[changed]
+
+        return arrived, due, crossed
+
+    def update(self, delta_time, current_time):
+        """Step all agents, then run the owners' callbacks
+
+        Returns the owners that moved into another spatial hash cell.
+        """
+        arrived, due, crossed = self.step(delta_time, current_time)
+        # Callbacks may despawn agents, so skip slots freed meanwhile
+        for slot in arrived.tolist():
+            if self.alive[slot]:
+                self.owners[slot].arrive(current_time)
+        for slot in due.tolist():
+            if self.alive[slot]:
+                self.owners[slot].timer_done(current_time)
+        return [self.owners[slot] for slot in crossed.tolist() if self.alive[slot]]
+
+    def position(self, slot, alpha=1.0):
+        """Integer draw position `alpha` of the way through the last step"""
+        prev_x, prev_y = self.prev_x[slot], self.prev_y[slot]
+        return (int(prev_x + (self.x[slot] - prev_x) * alpha),
+                int(prev_y + (self.y[slot] - prev_y) * alpha))
+
+    def __len__(self):
+        return self.count - len(self.free)
+
+
+def _agent_field(name):
+    """Property that reads/writes one field of this agent in the AgentStore"""
+    def getter(self):
+        return getattr(self.agents, name)[self.slot].item()
+
+    def setter(self, value):
+        getattr(self.agents, name)[self.slot] = value
+
+    return property(getter, setter)
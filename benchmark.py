@@ -0,0 +1,378 @@
+"""
+Performance benchmarks for the garden simulation
+
+Usage:
+    python benchmark.py plots [--sizes 10000 1000000] [--ticks 200]
+    python benchmark.py pickers [--counts 1 2 4 8] [--minutes 5] [--rows 6] [--cols 8]
+    python benchmark.py agents [--counts 100 1000 5000] [--ticks 300]
+    python benchmark.py netsync [--agents 100] [--ticks 600] [--rows 6] [--cols 8]
+    python benchmark.py suite [--plots 48 10000] [--snails 50] [--ducks 5] [--pickers 5]
+                              [--weather rainy] [--sprinkler] [--rain-barrel] [--effects]
+                              [--ticks 600] [--json results.json]
+                              [--save-baseline base.json | --baseline base.json [--tolerance 0.1]]
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+import numpy as np
+import pygame
+from plot_store import PlotStore, CROP_TYPES
+from game_clock import TickClock
+from garden import Garden
+from weed_picker import WeedPicker
+from duck import Duck
+from snail import Snail
+from net_sync import SyncEncoder, SyncDecoder, quantize_plots, quantize_agents
+from config import WEATHER_OPTIONS, FPS, MIN_REGROW_TIME, MAX_REGROW_TIME
+
+
+def build_plot_store(size, current_time=0.0):
+    """Create a store with `size` plots in a mix of states"""
+    store = PlotStore(size, clock=TickClock())
+    side = int(np.ceil(np.sqrt(size)))
+    index = np.arange(size)
+    xs = (index % side) * 100
+    ys = (index // side) * 120
+    types = [CROP_TYPES[i % len(CROP_TYPES)] for i in range(size)]
+    store.add_plots(xs, ys, types, current_time)
+    store.start_weed_checks(current_time)
+
+    # Half the plots growing, a few dead, moisture spread out
+    store.grown[:size] = index % 2 == 0
+    store.plant_dead[:size] = index % 10 == 9
+    store.soil_moisture[:size] = np.random.uniform(0.2, 1.0, size)
+    store.refresh_states()
+    return store
+
+
+def bench_plots(sizes, ticks):
+    """Time one plot store tick (due events, weather change every second) per garden size"""
+    print(f"{'plots':>10} {'ms/tick':>10} {'ticks/s':>10}")
+    for size in sizes:
+        store = build_plot_store(size)
+        clock = store.clock
+        start = time.perf_counter()
+        for tick in range(ticks):
+            current_time = clock.tick()
+            if tick % 60 == 0:
+                store.set_weather(WEATHER_OPTIONS[(tick // 60) % len(WEATHER_OPTIONS)], current_time)
+            store.scheduler.run_due(current_time)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>10} {elapsed / ticks * 1000:>10.3f} {ticks / elapsed:>10.1f}")
+
+
+def bench_pickers(counts, minutes, rows, cols):
+    """Weeds removed per minute, in total and per picker, for growing picker crews"""
+    print(f"{'pickers':>8} {'weeds/min':>10} {'per picker':>11}")
+    ticks = int(minutes * 60 * FPS)
+    for count in counts:
+        # Same weed pattern for every crew size
+        random.seed(0)
+        np.random.seed(0)
+        garden = Garden(rows, cols, headless=True)
+        pickers = [WeedPicker(garden.agents, garden.vegetables, garden.plots.weed_queue, garden.clock.now)
+                   for _ in range(count)]
+        garden.weed_pickers.extend(pickers)
+        for _ in range(ticks):
+            garden.update()
+        removed = sum(picker.weeds_removed for picker in pickers)
+        print(f"{count:>8} {removed / minutes:>10.1f} {removed / minutes / count:>11.1f}")
+
+
+def bench_agents(counts, ticks):
+    """Per-tick agent cost with `count` snails plus a tenth as many ducks and weed pickers"""
+    print(f"{'snails':>8} {'helpers':>8} {'ms/tick':>10} {'ticks/s':>10}")
+    for count in counts:
+        random.seed(0)
+        np.random.seed(0)
+        garden = Garden(30, 40, headless=True)
+        now = garden.clock.now
+        for vegetable in garden.vegetables:
+            vegetable.plant_seed('carrot', now)
+        for _ in range(count):
+            Snail(garden.agents, random.choice(garden.vegetables), garden.snails, now)
+        helpers = max(1, count // 10)
+        garden.ducks.extend(Duck(garden.agents, garden.snails, now) for _ in range(helpers))
+        garden.weed_pickers.extend(WeedPicker(garden.agents, garden.vegetables, garden.plots.weed_queue, now)
+                                   for _ in range(helpers))
+        start = time.perf_counter()
+        for _ in range(ticks):
+            garden._update_agents(garden.clock.tick())
+        elapsed = time.perf_counter() - start
+        print(f"{count:>8} {2 * helpers:>8} {elapsed / ticks * 1000:>10.3f} {ticks / elapsed:>10.1f}")
+
+
+def bench_netsync(agent_count, ticks, rows, cols):
+    """Bytes per tick of the state stream for a planted garden in the rain
+
+    About 80% of the agents are snails, the rest ducks and weed pickers.
+    Every packet is decoded again and checked against the garden.
+    """
+    random.seed(0)
+    np.random.seed(0)
+    garden = Garden(rows, cols, headless=True)
+    now = garden.clock.now
+    for vegetable in garden.vegetables:
+        vegetable.plant_seed(random.choice(CROP_TYPES), now)
+    garden.weather.restore('rainy', now, ticks * garden.clock.step + 60.0)
+    garden._on_weather_change('rainy', now)
+    helpers = agent_count // 10
+    for _ in range(agent_count - 2 * helpers):
+        Snail(garden.agents, random.choice(garden.vegetables), garden.snails, now)
+    for _ in range(helpers):
+        garden._add_helper(garden.ducks, Duck(garden.agents, garden.snails, now))
+        garden._add_helper(garden.weed_pickers, WeedPicker(garden.agents, garden.vegetables,
+                                                           garden.plots.weed_queue, now, 'rainy'))
+
+    encoder = SyncEncoder()
+    decoder = SyncDecoder(garden.inventory.items)
+    deltas, keyframes = [], []
+    for _ in range(ticks):
+        garden.update()
+        packet = encoder.encode(garden)
+        decoder.apply(packet)
+        (keyframes if packet[0] else deltas).append(len(packet))
+
+        # The client mirror must match the garden exactly (in quantized form)
+        kind, flags, x, y = quantize_agents(garden)
+        alive = np.flatnonzero(kind)
+        expected = dict(zip(alive.tolist(), zip(kind[alive].tolist(), flags[alive].tolist(),
+                                                x[alive].tolist(), y[alive].tolist())))
+        assert decoder.agents == expected, "agent mismatch"
+        assert np.array_equal(decoder.plots, quantize_plots(garden)), "plot mismatch"
+        assert decoder.credits == garden.credits and decoder.weather == garden.weather.get_weather()
+
+    sizes = deltas + keyframes
+    mean = sum(sizes) / len(sizes)
+    print(f"{rows * cols} plots, {len(garden.agents)} agents at the end, rain, {ticks} ticks")
+    print(f"{'bytes/tick':>12} {'delta avg':>10} {'delta max':>10} {'keyframe':>10} {'kB/s':>8}")
+    print(f"{mean:>12.1f} {sum(deltas) / max(1, len(deltas)):>10.1f} {max(deltas, default=0):>10} "
+          f"{max(keyframes, default=0):>10} {mean * FPS / 1000:>8.2f}")
+
+
+def build_garden(plots, snails=0, ducks=0, pickers=0, weather='sunny', sprinkler=False,
+                 rain_barrel=False, headless=True):
+    """A garden of about `plots` planted plots with agents, fixed weather and automation"""
+    cols = max(1, int(math.ceil(math.sqrt(plots))))
+    rows = max(1, int(math.ceil(plots / cols)))
+    garden = Garden(rows, cols, headless=headless)
+    now = garden.clock.now
+
+    # Planted plots in a mix of states, set in bulk like build_plot_store
+    store = garden.plots
+    n = store.count
+    index = np.arange(n)
+    store.plant_dead[:n] = False
+    store.grown[:n] = index % 2 == 0
+    store.crop[:n] = index % len(CROP_TYPES)
+    store.weed_level[:n] = np.where(index % 7 == 0, 1, 0)
+    store.weed_start_time[:n] = np.where(index % 7 == 0, now, np.nan)
+    store.set_moisture(index, np.random.uniform(0.3, 1.0, n))
+    for plot in np.flatnonzero(~store.grown[:n]).tolist():
+        store.set_regrow_time(plot, now + random.uniform(MIN_REGROW_TIME, MAX_REGROW_TIME))
+    store.restore(store.to_records())  # Re-register weed growth and rebuild the indexes
+
+    # Weather that lasts for the whole run
+    garden.weather.restore(weather, now, 1e9)
+    garden._on_weather_change(weather, now)
+
+    if sprinkler:
+        garden.inventory.set_sprinkler(True)
+        garden.sprinkler.activate()
+    if rain_barrel:
+        garden.inventory.set_rain_barrel(True)
+        garden._schedule_rain_barrel(now)
+
+    for _ in range(snails):
+        Snail(garden.agents, garden.vegetables[garden.plots.living.choice()], garden.snails, now)
+    for _ in range(ducks):
+        garden._add_helper(garden.ducks, Duck(garden.agents, garden.snails, now))
+    for _ in range(pickers):
+        garden._add_helper(garden.weed_pickers, WeedPicker(garden.agents, garden.vegetables,
+                                                           garden.plots.weed_queue, now, weather))
+    return garden
+
+
+def garden_phases(garden):
+    """(name, owner, method) of Garden.update itself and of each subsystem step it runs"""
+    return [
+        ('update', garden, 'update'),
+        ('scheduler', garden.scheduler, 'run_due'),  # Regrowth, weeds, drying out, spawns, sprinkler rounds
+        ('weather', garden.weather, 'update'),
+        ('sound', garden, '_update_sound'),  # Effects, sound loading and the ambient loop
+        ('particles', garden.particles, 'update'),
+        ('sprinkler', garden.sprinkler, 'update'),
+        ('effects', garden.effects, 'update'),
+        ('agents', garden, '_update_agents'),
+        ('storage_house', garden.storage_house, 'update'),
+        ('rain_barrel', garden.rain_barrel_visual, 'update'),
+        ('weather_tv', garden.weather_tv, 'update')
+    ]
+
+
+def time_phases(garden, ticks, warmup=60):
+    """Run `ticks` updates with every phase wrapped in a timer; returns seconds per call by phase"""
+    # Let the sound loader finish the effects and the weather's ambient loop
+    # first, so its decoding and output stay out of the timed run
+    garden.update()
+    while garden.sound.loading():
+        time.sleep(0.01)
+    for _ in range(warmup):
+        garden.update()
+
+    samples = {}
+
+    def timed(name, method):
+        calls = samples.setdefault(name, [])
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            calls.append(time.perf_counter() - start)
+            return result
+        return wrapper
+
+    phases = garden_phases(garden)
+    for name, owner, method in phases:
+        setattr(owner, method, timed(name, getattr(owner, method)))
+    try:
+        for _ in range(ticks):
+            garden.update()
+    finally:
+        for _, owner, method in phases:
+            delattr(owner, method)  # Back to the class method
+    return samples
+
+
+def summarize(seconds):
+    """Mean, p50 and p99 in milliseconds of one phase's samples"""
+    ms = np.array(seconds) * 1000
+    return {'calls': len(ms), 'mean_ms': float(ms.mean()), 'p50_ms': float(np.percentile(ms, 50)),
+            'p99_ms': float(np.percentile(ms, 99)), 'ticks_per_s': float(1000 / ms.mean()) if ms.mean() else None}
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Print phases slower than the baseline by more than `tolerance`; returns how many regressed"""
+    previous = {scenario['name']: scenario['phases'] for scenario in baseline['scenarios']}
+    regressions = 0
+    for scenario in results['scenarios']:
+        if scenario['name'] not in previous:
+            print(f"{scenario['name']}: not in baseline")
+            continue
+        for phase, stats in scenario['phases'].items():
+            before = previous[scenario['name']].get(phase)
+            if before is None:
+                continue
+            ratio = stats['mean_ms'] / before['mean_ms'] if before['mean_ms'] else 1.0
+            # Ignore sub-10 microsecond differences, they are timer noise
+            if ratio > 1 + tolerance and stats['mean_ms'] - before['mean_ms'] > 0.01:
+                regressions += 1
+                print(f"REGRESSION {scenario['name']} {phase}: {before['mean_ms']:.3f} -> "
+                      f"{stats['mean_ms']:.3f} ms ({ratio - 1:+.0%})")
+    return regressions
+
+
+def bench_suite(args):
+    """Time Garden.update and its subsystems for synthetic gardens of each size"""
+    if args.effects:
+        # Cosmetic phases only run in non-headless gardens; no real display needed
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+    results = {'ticks': args.ticks, 'scenarios': []}
+    for plots in args.plots:
+        random.seed(0)
+        np.random.seed(0)
+        config = {'plots': plots, 'snails': args.snails, 'ducks': args.ducks, 'pickers': args.pickers,
+                  'weather': args.weather, 'sprinkler': args.sprinkler, 'rain_barrel': args.rain_barrel,
+                  'effects': args.effects}
+        name = ' '.join(f"{key}={value}" for key, value in config.items())
+        garden = build_garden(plots, args.snails, args.ducks, args.pickers, args.weather,
+                              args.sprinkler, args.rain_barrel, headless=not args.effects)
+        samples = time_phases(garden, args.ticks)
+        phases = {phase: summarize(seconds) for phase, seconds in samples.items() if seconds}
+        results['scenarios'].append({'name': name, 'config': config, 'phases': phases})
+
+        print(name)
+        print(f"  {'phase':<14} {'calls':>6} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'ticks/s':>10}")
+        for phase, stats in phases.items():
+            rate = f"{stats['ticks_per_s']:>10.1f}" if phase == 'update' else ''
+            print(f"  {phase:<14} {stats['calls']:>6} {stats['mean_ms']:>9.3f} {stats['p50_ms']:>9.3f} "
+                  f"{stats['p99_ms']:>9.3f} {rate}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        print(f"{regressions} regressions against {args.baseline}")
+        if regressions:
+            sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Garden simulation benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    plots_parser = subparsers.add_parser('plots', help="Per-tick cost of the vectorized plot store")
+    plots_parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 1_000_000])
+    plots_parser.add_argument('--ticks', type=int, default=200)
+
+    pickers_parser = subparsers.add_parser('pickers', help="Weed removal rate per weed picker")
+    pickers_parser.add_argument('--counts', type=int, nargs='+', default=[1, 2, 4, 8])
+    pickers_parser.add_argument('--minutes', type=float, default=5)
+    pickers_parser.add_argument('--rows', type=int, default=6)
+    pickers_parser.add_argument('--cols', type=int, default=8)
+
+    agents_parser = subparsers.add_parser('agents', help="Per-tick cost of moving snails, ducks and weed pickers")
+    agents_parser.add_argument('--counts', type=int, nargs='+', default=[100, 1000, 5000])
+    agents_parser.add_argument('--ticks', type=int, default=300)
+
+    netsync_parser = subparsers.add_parser('netsync', help="Bandwidth of the delta-compressed state stream")
+    netsync_parser.add_argument('--agents', type=int, default=100)
+    netsync_parser.add_argument('--ticks', type=int, default=600)
+    netsync_parser.add_argument('--rows', type=int, default=6)
+    netsync_parser.add_argument('--cols', type=int, default=8)
+
+    suite_parser = subparsers.add_parser('suite', help="Garden.update and each subsystem, with baselines")
+    suite_parser.add_argument('--plots', type=int, nargs='+', default=[48, 10_000])
+    suite_parser.add_argument('--snails', type=int, default=50)
+    suite_parser.add_argument('--ducks', type=int, default=5)
+    suite_parser.add_argument('--pickers', type=int, default=5)
+    suite_parser.add_argument('--weather', choices=WEATHER_OPTIONS, default='rainy')
+    suite_parser.add_argument('--sprinkler', action='store_true')
+    suite_parser.add_argument('--rain-barrel', action='store_true')
+    suite_parser.add_argument('--effects', action='store_true',
+                              help="include particles and cosmetic animations (non-headless garden)")
+    suite_parser.add_argument('--ticks', type=int, default=600)
+    suite_parser.add_argument('--json', help="write the results as JSON to this file")
+    suite_parser.add_argument('--save-baseline', help="save the results as the baseline to compare against")
+    suite_parser.add_argument('--baseline', help="compare against a saved baseline; exit 1 on regressions")
+    suite_parser.add_argument('--tolerance', type=float, default=0.10,
+                              help="allowed slowdown of a phase's mean before it counts as a regression")
+
+    args = parser.parse_args()
+    if args.command == 'plots':
+        bench_plots(args.sizes, args.ticks)
+    elif args.command == 'pickers':
+        bench_pickers(args.counts, args.minutes, args.rows, args.cols)
+    elif args.command == 'agents':
+        bench_agents(args.counts, args.ticks)
+    elif args.command == 'netsync':
+        bench_netsync(args.agents, args.ticks, args.rows, args.cols)
+    elif args.command == 'suite':
+        bench_suite(args)
+
+
+if __name__ == "__main__":
+    main()
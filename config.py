@@ -5,8 +5,29 @@ Game configuration and constants
 # Window settings
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
+SKY_EFFECT_RECT = (WINDOW_WIDTH - 260, 0, 260, 120)  # Area of the animated sun and clouds
 FPS = 60
 
+# Simulation timing
+SIMULATION_STEP = 1.0 / FPS   # Fixed simulation step (seconds), independent of the render rate
+MAX_STEPS_PER_FRAME = 10      # Steps per rendered frame at most; beyond that the game slows down
+
+# Save games
+SAVE_FILE = 'garden.sav'
+AUTOSAVE_INTERVAL = 30.0      # Seconds between automatic saves while playing
+CATCH_UP_MAX_PERIODS = 4096   # Weather periods simulated when resuming; longer absences get longer periods
+
+# Multi-garden server
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+SERVER_STATS_INTERVAL = 5.0   # Seconds between shard latency reports (and rebalancing)
+SERVER_MAX_LOAD = 0.75        # Share of each step a shard may spend ticking before gardens move off it
+SERVER_MAX_ROWS = 64          # Largest garden a client may create
+SERVER_MAX_COLS = 64
+
+# State sync for remote clients
+NET_KEYFRAME_INTERVAL = 300   # Ticks between full-state keyframes
+
 # Colors
 WHITE = (255, 255, 255)
 GREEN = (34, 139, 34)
@@ -81,12 +102,14 @@ WEED_CHECK_INTERVAL = 5.0
 WEED_SPAWN_CHANCE = 0.3
 WEED_GROWTH_TIME = 10
 MAX_WEED_LEVEL = 10
+WEED_LEVEL_PRIORITY = 50      # Extra walking distance (pixels) a picker accepts per weed level
 
 # Snail settings (Schnecken)
 SNAIL_CHECK_INTERVAL = 10.0  # Check every 10 seconds for snail spawn
 SNAIL_SPAWN_CHANCE = 0.25     # 25% chance to spawn on ripe vegetables
 SNAIL_EATING_TIME = 20.0      # Time in seconds until vegetable is eaten
 MAX_SNAILS_PER_PLANT = 3      # Maximum snails on one plant
+SNAIL_HASH_CELL_SIZE = 64     # Cell size of the snail spatial hash (pixels)
 
 # Weather settings
 MIN_WEATHER_DURATION = 20
@@ -141,10 +164,27 @@ SOUND_FILES = {
     'birds': 'sounds/birds.ogg'
 }
 
+# Background loading order of the effects; the ambient loops are decoded when their weather starts
+SOUND_LOAD_ORDER = ['harvest', 'weed', 'error', 'water', 'plant', 'fertilize', 'buy']
+AMBIENT_SOUNDS = ['rain', 'birds']
+
 BACKGROUND_MUSIC = 'sounds/bgm.ogg'
 DEFAULT_VOLUME = 0.7
 MUSIC_VOLUME_MULTIPLIER = 0.5
 AMBIENT_VOLUME_MULTIPLIER = 0.3
+AMBIENT_CROSSFADE = 2.0          # Seconds one ambient loop takes to fade into the next
+AMBIENT_READ_CHUNK = 64 * 1024   # Bytes of an ambient loop file read per tick when there is no loader thread
+
+# Sound effect voices
+MIXER_CHANNELS = 16              # Mixer channels; the first two are reserved for the ambient crossfade
+SOUND_VOICE_LIMIT = 2            # Voices of one sound effect playing at once
+SOUND_RETRIGGER_INTERVAL = 0.06  # Seconds before the same effect starts again; requests in between are merged
+SOUND_BURST_GAIN = 0.15          # Extra volume per doubling of merged requests
+SOUND_PRIORITIES = {             # Effects may take the channel of an effect with lower or equal priority
+    'error': 3, 'buy': 3,
+    'harvest': 2, 'plant': 2,
+    'water': 1, 'fertilize': 1, 'weed': 1
+}
 
 # Particle effects
 WATER_PARTICLE_COUNT = 15
@@ -153,6 +193,24 @@ WEED_PARTICLE_COUNT = 5
 SPARKLE_PARTICLE_COUNT = 8
 MAX_RAIN_PARTICLES = 100
 RAIN_SPAWN_RATE = 5
+MAX_PARTICLES = 4000          # Global cap across all particle kinds
+PARTICLE_POOL_CAPACITY = {    # Fixed pool size per particle kind
+    'default': 512,
+    'rain': MAX_RAIN_PARTICLES + RAIN_SPAWN_RATE,
+    'sprinkler': 1024
+}
+
+# Rendering
+TEXT_CACHE_SIZE = 256         # Rendered text surfaces kept in the LRU cache
+SPRITE_WALK_PHASES = 16       # Baked frames per walk cycle of animated helpers
+
+# Frame profiler (F3 toggles the overlay, F4 writes the trace)
+PROFILER_FRAMES = 600         # Frames kept for the overlay and the trace export
+PROFILER_AVERAGE_FRAMES = 60  # Frames averaged for the per-phase milliseconds
+PROFILER_BUCKET_MS = 2        # Width of a frame-time histogram bar
+PROFILER_BUCKETS = 20         # Histogram bars; the last one also counts slower frames
+PROFILER_OVERLAY_ROWS = 12    # Slowest phases listed in the overlay
+PROFILER_TRACE_FILE = 'frame_trace.json'
 
 # Animation settings
 WATER_PARTICLE_LIFETIME = 1.0
@@ -4,19 +4,28 @@ Duck - Cute helper that walks through the garden eating snails
 import pygame
 import random
 import math
-import time
+from agent_store import _agent_field
+from sprites import SpriteSheet, walk_phase, phase_cycle, bar_level, draw_bar
+from config import SPRITE_WALK_PHASES
 
 
 class Duck:
-    """A cute duck that walks between garden plots eating snails"""
+    """A cute duck that walks between garden plots eating snails
 
-    def __init__(self, snails):
-        self.snails = snails
-        self.size = 30
+    Position, walk cycle and timers live in an AgentStore slot; the store
+    moves the duck after its snail and calls back when it catches it.
+    """
+
+    x = _agent_field('x')
+    y = _agent_field('y')
+    walk_cycle = _agent_field('walk_cycle')
+    spawn_time = _agent_field('spawn_time')
+    lifetime = _agent_field('lifetime')
 
-        # Start at a random position near the garden
-        self.x = random.randint(150, 600)
-        self.y = random.randint(150, 500)
+    def __init__(self, agents, snails, current_time):
+        self.agents = agents
+        self.snails = snails  # SpatialHash of live snails
+        self.size = 30
 
         self.speed = 40  # Pixels per second
         self.target_snail = None
@@ -24,82 +33,65 @@ class Duck:
         self.eat_start_time = None
         self.eat_duration = 0.8  # 0.8 seconds to eat a snail
 
-        # Duration: 2 minutes (120 seconds)
-        self.spawn_time = time.time()
-        self.lifetime = 120.0
-
-        # Walking animation
-        self.walk_cycle = 0
-        self.walk_speed = 5.0  # Animation speed
+        # Start at a random position near the garden, walking (animation speed 5)
+        # Duration: 2 minutes (120 seconds), removal is scheduled by the garden
+        self.slot = agents.spawn(self, random.randint(150, 600), random.randint(150, 500),
+                                 self.speed, 15, current_time, lifetime=120.0, walk_speed=5.0)
+        agents.walking[self.slot] = True
 
         # Find first snail
         self._find_next_target()
 
     def _find_next_target(self):
-        """Find the next snail to eat"""
-        if self.snails:
-            self.target_snail = random.choice(self.snails)
-            self.eating = False
+        """Head for the closest snail (or wait for one to appear)"""
+        self.eating = False
+        self.target_snail = self.snails.nearest(self.x, self.y)
+        if self.target_snail is not None:
+            self.agents.chase(self.slot, self.target_snail.slot)
         else:
-            self.target_snail = None
-
-    def update(self, delta_time):
-        """Update duck position and eating state"""
-        current_time = time.time()
-
-        # Update walking animation
-        self.walk_cycle += self.walk_speed * delta_time
-
-        # Check if lifetime expired
-        if current_time - self.spawn_time >= self.lifetime:
-            return True  # Signal to remove duck
-
-        # If eating a snail
-        if self.eating and self.eat_start_time:
-            elapsed = current_time - self.eat_start_time
-            if elapsed >= self.eat_duration:
-                # Finished eating snail
-                if self.target_snail in self.snails:
-                    self.snails.remove(self.target_snail)
-
-                # Find next snail
-                self._find_next_target()
-            return False
+            self.agents.stop(self.slot)
+
+    def arrive(self, current_time):
+        """Caught up with the snail - start eating"""
+        self.eating = True
+        self.eat_start_time = current_time
+        self.agents.start_timer(self.slot, current_time + self.eat_duration)
+
+    def timer_done(self, current_time):
+        """Finished eating the snail, look for the next one"""
+        if self.target_snail in self.snails:
+            self.target_snail.remove()
+        self._find_next_target()
 
-        # If no target, find one
-        if not self.target_snail or self.target_snail not in self.snails:
+    def target_lost(self):
+        """The chased snail is gone (or there was none) - pick the nearest one"""
+        if not self.eating:
             self._find_next_target()
-            if not self.target_snail:
-                # No snails anywhere, just wander randomly
-                return False
-
-        # Move toward target snail
-        target_x = self.target_snail.x
-        target_y = self.target_snail.y
 
-        dx = target_x - self.x
-        dy = target_y - self.y
-        distance = math.sqrt(dx * dx + dy * dy)
+    def leave(self):
+        """Free the duck's agent slot (its time is up)"""
+        self.agents.despawn(self.slot)
 
-        # Check if reached target
-        if distance < 15:
-            self.eating = True
-            self.eat_start_time = current_time
-            return False
+    def draw(self, screen, current_time, alpha=1.0):
+        """Draw the duck and return the covered rect"""
+        # Eating ducks stand still, walking ones use their walk-cycle frame
+        phase = None if self.eating else walk_phase(self.walk_cycle)
+        x, y = self.agents.position(self.slot, alpha)
+        rect = DUCK_SPRITES.blit(screen, (x, y), phase)
 
-        # Move toward target
-        if distance > 0:
-            self.x += (dx / distance) * self.speed * delta_time
-            self.y += (dy / distance) * self.speed * delta_time
+        # Timer bar showing remaining time
+        remaining_ratio = 1.0 - ((current_time - self.spawn_time) / self.lifetime)
+        return rect.union(draw_bar(screen, x, y + 20, DUCK_BAR_WIDTH,
+                                   bar_level(remaining_ratio, DUCK_BAR_WIDTH), (255, 220, 50)))
 
-        return False
-
-    def draw(self, screen):
-        """Draw the cute duck with walking animation"""
-        x, y = int(self.x), int(self.y)
+    @staticmethod
+    def paint(screen, x, y, phase):
+        """Paint one duck frame (phase None = eating); the timer bar is drawn separately"""
+        eating = phase is None
+        walk_cycle = 0 if eating else phase_cycle(phase)
 
         # Walking animation - bob up and down
-        bob_offset = int(math.sin(self.walk_cycle) * 2) if not self.eating else 0
+        bob_offset = int(math.sin(walk_cycle) * 2) if not eating else 0
 
         # Duck body (yellow oval)
         body_rect = pygame.Rect(x - 12, y - 8 + bob_offset, 24, 16)
@@ -112,7 +104,7 @@ class Duck:
         pygame.draw.circle(screen, (200, 180, 40), (x + 8, head_y), 10, 2)
 
         # Duck beak (orange triangle)
-        if self.eating:
+        if eating:
             # Open beak when eating
             beak_points = [
                 (x + 16, head_y - 2),
@@ -133,8 +125,8 @@ class Duck:
         pygame.draw.circle(screen, (0, 0, 0), (x + 12, head_y - 3), 2)
 
         # Duck legs with walking animation
-        if not self.eating:
-            leg_offset = int(math.sin(self.walk_cycle * 2) * 3)
+        if not eating:
+            leg_offset = int(math.sin(walk_cycle * 2) * 3)
             # Left leg
             pygame.draw.line(screen, (255, 140, 0), (x - 4, y + 8 + bob_offset),
                            (x - 4, y + 14 + bob_offset + leg_offset), 3)
@@ -154,22 +146,8 @@ class Duck:
             pygame.draw.line(screen, (255, 140, 0), (x - 6, y + 14), (x - 2, y + 14), 2)
             pygame.draw.line(screen, (255, 140, 0), (x + 2, y + 14), (x + 6, y + 14), 2)
 
-        # Draw timer bar showing remaining time
-        remaining_ratio = 1.0 - ((time.time() - self.spawn_time) / self.lifetime)
-        bar_width = 40
-        bar_height = 4
-        bar_x = x - bar_width // 2
-        bar_y = y + 20
-
-        # Background
-        pygame.draw.rect(screen, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
-        # Progress
-        pygame.draw.rect(screen, (255, 220, 50), (bar_x, bar_y, int(bar_width * remaining_ratio), bar_height))
-        # Border
-        pygame.draw.rect(screen, (0, 0, 0), (bar_x, bar_y, bar_width, bar_height), 1)
-
         # Draw eating indicator (heart when eating snail)
-        if self.eating:
+        if eating:
             # Draw little heart above duck
             heart_x = x + 8
             heart_y = y - 25
@@ -180,3 +158,10 @@ class Duck:
                 (heart_x, heart_y + 8),
                 (heart_x + 6, heart_y + 2)
             ])
+
+
+DUCK_BAR_WIDTH = 40
+
+# Walk phases plus the eating pose
+DUCK_SPRITES = SpriteSheet((48, 58), (22, 32), Duck.paint,
+                           [None] + list(range(SPRITE_WALK_PHASES)))
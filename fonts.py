@@ -0,0 +1,129 @@
+"""
+Shared fonts and rendered-text cache
+
+Fonts are created once per (name, size) and rendered text surfaces are
+kept in an LRU cache keyed by (font, text, color), so labels that do not
+change between frames are not re-rasterized every frame. Numbers that do
+change every frame (countdowns, counters) are assembled from a glyph atlas.
+"""
+import pygame
+from collections import OrderedDict
+from config import TEXT_CACHE_SIZE
+
+# Characters available in glyph atlases
+GLYPH_CHARSET = "0123456789.,:+-/%s "
+
+
+class FontRegistry:
+    """Creates each font once and hands out the shared instance"""
+
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, size, name=None):
+        """Get the font for (name, size); None is pygame's default font"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces with hit/miss counters"""
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Return the rendered surface, rendering it only on a cache miss"""
+        key = (font, text, tuple(color), antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)  # Evict least recently used
+        return surface
+
+    def clear(self):
+        """Drop all cached surfaces and reset the counters"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class GlyphAtlas:
+    """Digits and punctuation of one font and color, pre-rendered into one sheet
+
+    Text is assembled by blitting glyph areas of the sheet side by side, so
+    drawing a changing number costs a few blits instead of a font render.
+    Only characters from GLYPH_CHARSET can be drawn.
+    """
+
+    def __init__(self, font, color, charset=GLYPH_CHARSET):
+        self.height = font.get_height()
+        glyphs = {char: font.render(char, True, color) for char in charset}
+        # Advances are fractional; measuring a run of the glyph keeps spacing close to font.render
+        self.advances = {char: font.size(char * 8)[0] / 8 for char in charset}
+        self.sheet = pygame.Surface((sum(g.get_width() for g in glyphs.values()), self.height), pygame.SRCALPHA)
+        self.areas = {}
+        x = 0
+        for char, glyph in glyphs.items():
+            self.sheet.blit(glyph, (x, 0))
+            self.areas[char] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+
+    def width(self, text):
+        """Pixel width of text drawn with this atlas"""
+        advances = self.advances
+        return round(sum(advances[char] for char in text))
+
+    def draw(self, screen, text, pos):
+        """Blit text glyph by glyph and return the covered rect"""
+        x, y = pos
+        sheet, areas, advances = self.sheet, self.areas, self.advances
+        blits = []
+        right = x
+        for char in text:
+            left = round(x)
+            blits.append((sheet, (left, y), areas[char]))
+            right = max(right, left + areas[char].width)
+            x += advances[char]
+        screen.blits(blits, False)
+        return pygame.Rect(pos[0], y, right - pos[0], self.height)
+
+
+# Shared instances used by all draw code
+FONTS = FontRegistry()
+TEXT_CACHE = TextCache()
+GLYPH_ATLASES = {}
+
+
+def get_font(size, name=None):
+    """Get a shared font"""
+    return FONTS.get(size, name)
+
+
+def render_text(font, text, color):
+    """Render antialiased text through the shared cache"""
+    return TEXT_CACHE.render(font, text, color)
+
+
+def get_glyph_atlas(font, color):
+    """Get the shared glyph atlas for a font and color"""
+    key = (font, tuple(color))
+    atlas = GLYPH_ATLASES.get(key)
+    if atlas is None:
+        atlas = GlyphAtlas(font, color)
+        GLYPH_ATLASES[key] = atlas
+    return atlas
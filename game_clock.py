@@ -0,0 +1,66 @@
+"""
+Simulation clock and frame accumulator
+
+The garden samples its clock once per tick and hands the resulting
+timestamp to every subsystem, instead of each one calling time.time().
+The simulation always advances in fixed steps; the accumulator turns the
+variable time between rendered frames into a whole number of steps, so
+the game runs at the same speed whatever the frame rate.
+"""
+from config import SIMULATION_STEP, MAX_STEPS_PER_FRAME
+
+
+class TickClock:
+    """Virtual clock: each tick advances time by a fixed step
+
+    Time is derived from the integer tick count, so runs are reproducible
+    and can go as fast as the CPU allows (fast-forward).
+    """
+
+    def __init__(self, step=SIMULATION_STEP, start_tick=0):
+        self.step = step
+        self.ticks = start_tick
+        self.now = self.ticks * self.step
+        self.delta = 0.0
+
+    def tick(self):
+        """Advance by one step and return the new time"""
+        self.ticks += 1
+        self.now = self.ticks * self.step
+        self.delta = self.step
+        return self.now
+
+    def skip(self, seconds):
+        """Jump ahead by whole steps without ticking (offline catch-up)"""
+        self.ticks += int(round(seconds / self.step))
+        self.now = self.ticks * self.step
+
+
+class StepAccumulator:
+    """Converts real frame times into fixed simulation steps
+
+    Leftover time below one step carries over to the next frame; `alpha`
+    is that leftover as a fraction of a step, for interpolated drawing.
+    """
+
+    def __init__(self, step=SIMULATION_STEP, max_steps=MAX_STEPS_PER_FRAME):
+        self.step = step
+        self.max_steps = max_steps
+        self.time = 0.0
+
+    def add(self, frame_time):
+        """Add one frame's real time and return the number of steps to run"""
+        self.time += frame_time
+        steps = int(self.time / self.step)
+        if steps > self.max_steps:
+            # Too far behind (slow machine, window dragged) - drop the backlog
+            steps = self.max_steps
+            self.time = 0.0
+        else:
+            self.time -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self):
+        """Progress toward the next step (0..1)"""
+        return min(1.0, self.time / self.step)
@@ -2,34 +2,73 @@
 Main garden game logic
 """
 import pygame
-import time
 import random
+import numpy as np
 from vegetable import Vegetable
+from plot_store import PlotStore
+from plot_grid import PlotGrid
 from inventory import Inventory
 from shop import Shop
 from weather import WeatherSystem
 from effects import VisualEffects, SprinklerSystem
-from sound_manager import SoundManager
+from sound_manager import SoundManager, NullSoundManager
+from agent_store import AgentStore
 from snail import Snail
+from spatial_hash import SpatialHash
 from weed_picker import WeedPicker
 from duck import Duck
 from storage_house import StorageHouse
 from rain_barrel import RainBarrel
 from weather_tv import WeatherTV
+from game_clock import TickClock, StepAccumulator
+from scheduler import Scheduler
+from particles import ParticleSystem, NullParticleSystem
+from renderer import LayeredRenderer
+from profiler import FrameProfiler
+from sprites import bake_all
+from fonts import render_text, get_glyph_atlas
 from config import (
     INITIAL_CREDITS, GARDEN_ROWS, GARDEN_COLS,
-    GARDEN_START_X, GARDEN_START_Y, GARDEN_SPACING_X, GARDEN_SPACING_Y,
     INITIAL_PLOT_FERTILITY, INITIAL_PLOT_MOISTURE,
     BACKGROUND_COLORS, WEATHER_COLORS, BLACK,
     MUTE_BUTTON_X, MUTE_BUTTON_Y, MUTE_BUTTON_WIDTH, MUTE_BUTTON_HEIGHT,
-    GREEN as CONFIG_GREEN, RED as CONFIG_RED, YELLOW, WHITE
+    GREEN as CONFIG_GREEN, RED as CONFIG_RED, YELLOW, WHITE,
+    WINDOW_WIDTH, WINDOW_HEIGHT, SKY_EFFECT_RECT, SNAIL_HASH_CELL_SIZE
 )
 
 
 class Garden:
-    """Main garden game manager"""
-
-    def __init__(self):
+    """Main garden game manager
+
+    With headless=True the garden runs without a display or audio device:
+    sound and visual effects are swapped for null backends and purely
+    cosmetic animations are not updated, so only the simulation runs.
+
+    The garden owns the simulation clock. It is sampled once per update()
+    and the timestamp is passed down to every subsystem. Each update() is
+    one fixed step of simulated time; interactive games call advance()
+    with the real frame time, which runs as many steps as are due, and
+    draw with the returned alpha to interpolate between steps. Headless
+    gardens call update() directly to fast-forward. Timers (weather
+    changes, snail spawns, sprinkler and rain barrel rounds, helper
+    lifetimes, plot regrowth, weeds and plots drying out) are events on
+    the garden's scheduler rather than per-frame checks.
+    """
+
+    def __init__(self, rows=GARDEN_ROWS, cols=GARDEN_COLS, headless=False, clock=None):
+        self.rows = rows
+        self.cols = cols
+        self.headless = headless
+        if clock is None:
+            clock = TickClock()
+        self.clock = clock
+        self.accumulator = StepAccumulator(clock.step)
+        current_time = clock.now
+        self.scheduler = Scheduler()
+        self.particles = NullParticleSystem() if headless else ParticleSystem()
+        self.plots = PlotStore(rows * cols, self.scheduler, clock)
+        self.plot_grid = PlotGrid(rows, cols)
+        self.plots.particles = self.particles
         self.vegetables = []
         self.credits = INITIAL_CREDITS
         self.selected_vegetable = None
@@ -37,18 +76,29 @@ class Garden:
         # Initialize subsystems
         self.inventory = Inventory()
         self.shop = Shop()
-        self.weather = WeatherSystem()
-        self.effects = VisualEffects()
-        self.sprinkler = SprinklerSystem()
-        self.sound = SoundManager()
+        self.weather = WeatherSystem(self.scheduler, self.particles, current_time)
+        self.weather.add_listener(self._on_weather_change)
+        self.plots.set_weather(self.weather.get_weather(), current_time)
+        self.sprinkler = SprinklerSystem(self.scheduler, self.plots, self.particles, current_time)
+        self.effects = VisualEffects(self.particles)
+        self.renderer = LayeredRenderer()
+        self.profiler = FrameProfiler()  # Phase timings, off until toggled
+        if not headless:
+            bake_all()  # Pre-render helper and pest animation frames
+        self.sound = NullSoundManager() if headless else SoundManager()
 
         # Start background music
         self.sound.play_music()
 
+        # Snails, ducks and weed pickers all move through one agent store
+        self.agents = AgentStore(cell_size=SNAIL_HASH_CELL_SIZE)
+
         # Snail system
-        self.snails = []
-        self.last_snail_spawn = time.time()
+        self.snails = SpatialHash(SNAIL_HASH_CELL_SIZE)  # Live snails, bucketed by position
+        self.last_snail_spawn = current_time
         self.snail_spawn_interval = 15.0  # Spawn snail every 15 seconds
+        self.snail_spawn_event = None
+        self._schedule_snail_spawn()
 
         # Weed picker system
         self.weed_pickers = []
@@ -57,86 +107,173 @@ class Garden:
         self.ducks = []
 
         # Storage house (positioned in top-left area)
-        self.storage_house = StorageHouse(20, 100)
+        self.storage_house = StorageHouse(20, 100, self.particles, current_time)
 
         # Rain barrel (positioned next to storage house)
-        self.rain_barrel_visual = RainBarrel(110, 150)
+        self.rain_barrel_visual = RainBarrel(110, 150, self.particles, current_time)
 
         # Rain barrel system
-        self.last_rain_barrel_collection = time.time()
+        self.last_rain_barrel_collection = current_time
+        self.rain_barrel_event = None
 
         # Weather TV (positioned bottom-left)
         self.weather_tv = WeatherTV()
 
         # Initialize garden plots
         self._initialize_plots()
+        self.plots.start_weed_checks(current_time)
 
     def _initialize_plots(self):
-        """Create initial garden plots (all dead)"""
-        for row in range(GARDEN_ROWS):
-            for col in range(GARDEN_COLS):
-                x = GARDEN_START_X + col * GARDEN_SPACING_X
-                y = GARDEN_START_Y + row * GARDEN_SPACING_Y
-                veg = Vegetable(x, y, 'tomato')
-                veg.plant_dead = True
-                veg.grown = False
-                veg.soil_fertility = INITIAL_PLOT_FERTILITY
-                veg.soil_moisture = INITIAL_PLOT_MOISTURE
-                self.vegetables.append(veg)
+        """Create initial garden plots (all dead), in one batch on the plot store"""
+        plots = self.plots
+        cells = [(row, col) for row in range(self.rows) for col in range(self.cols)]
+        positions = [self.plot_grid.position(row, col) for row, col in cells]
+        indices = plots.add_plots([x for x, _ in positions], [y for _, y in positions],
+                                  ['tomato'] * len(cells), self.clock.now)
+        plots.plant_dead[indices] = True
+        plots.grown[indices] = False
+        plots.soil_fertility[indices] = INITIAL_PLOT_FERTILITY
+        plots.soil_moisture[indices] = INITIAL_PLOT_MOISTURE
+        plots.refresh_states(np.asarray(indices))
+
+        for (row, col), index in zip(cells, indices):
+            veg = Vegetable.attach(plots, index)
+            self.vegetables.append(veg)
+            self.plot_grid.place(row, col, veg)
 
     def update(self):
         """Update all game systems"""
+        profiler = self.profiler
+        profiler.begin('update')
+
+        # Sample the clock once for the whole tick
+        current_time = self.clock.tick()
+
+        # Fire timers that are due (plot regrowth, weeds and drying out, spawns, sprinkler rounds)
+        self.scheduler.run_due(current_time)
+        profiler.lap('scheduler')
+
         # Update weather
-        self.weather.update()
+        self.weather.update(current_time)
         current_weather = self.weather.get_weather()
+        profiler.lap('weather')
 
-        # Play ambient sounds based on weather
-        if current_weather == 'rainy':
-            self.sound.play_ambient('rain')
-        elif current_weather == 'sunny':
-            self.sound.play_ambient('birds')
-        else:
-            self.sound.stop_ambient()
+        # Start this frame's sound effects, play ambient sounds based on weather
+        self._update_sound(current_weather)
+        profiler.lap('sound')
 
-        # Update vegetables
-        for vegetable in self.vegetables:
-            vegetable.update(current_weather)
+        # Move and expire every particle in one pass per pool
+        self.particles.update(current_time, self.clock.delta)
+        profiler.lap('particles')
 
-        # Update sprinkler system
-        if self.inventory.has_sprinkler():
-            if not self.sprinkler.active:
-                self.sprinkler.activate()
-            self.sprinkler.update(self.vegetables)
+        # Update sprinkler animation (watering itself is scheduled)
+        if self.sprinkler.active:
+            self.sprinkler.update(self.vegetables, current_time)
+        profiler.lap('sprinkler')
 
         # Update visual effects
-        self.effects.update()
-
-        # Update snails
-        self._update_snails()
-
-        # Update weed pickers
-        self._update_weed_pickers()
+        self.effects.update(current_time)
+        profiler.lap('effects')
 
-        # Update ducks
-        self._update_ducks()
+        # Move snails, weed pickers and ducks (one vectorized step for all)
+        self._update_agents(current_time)
+        profiler.lap('agents')
 
         # Update storage house
-        self.storage_house.update()
+        if not self.headless:
+            self.storage_house.update(current_time)
+        profiler.lap('storage_house')
 
         # Update rain barrel visual
-        if self.inventory.has_rain_barrel():
-            self.rain_barrel_visual.update(current_weather)
-
-        # Update rain barrel collection
-        self._update_rain_barrel()
+        if self.inventory.has_rain_barrel() and not self.headless:
+            self.rain_barrel_visual.update(current_time, current_weather)
+        profiler.lap('rain_barrel')
 
         # Update weather TV
-        if self.inventory.has_weather_tv():
+        if self.inventory.has_weather_tv() and not self.headless:
             self.weather_tv.update()
+        profiler.lap('weather_tv')
+        profiler.end()
+
+    def catch_up(self, elapsed):
+        """Advance the garden by `elapsed` seconds in closed form (e.g. after loading a save)
+
+        The weather timeline is played forward and the plots are advanced
+        over it analytically (moisture, deaths, regrowth, weeds); the rain
+        barrel collects its water for the rainy time. Timers that came due
+        fire once on the next update, so helpers whose time is up leave.
+        Snails do not spawn while nobody is looking. Returns a short
+        summary for the player.
+        """
+        start = self.clock.now
+        self.clock.skip(elapsed)
+        end = self.clock.now
+        if end <= start:
+            return ""
+
+        segments = self.weather.fast_forward(start, end)
+        sprinkler_from = None
+        if self.sprinkler.active:
+            from config import SPRINKLER_INTERVAL
+            sprinkler_from = self.sprinkler.last_sprinkler_time + SPRINKLER_INTERVAL
+        dried_out, _ = self.plots.catch_up(segments, sprinkler_from)
+
+        collected = 0
+        if self.inventory.has_rain_barrel():
+            from config import RAIN_BARREL_COLLECTION_INTERVAL
+            rain_time = sum(seg_end - seg_start for seg_start, seg_end, weather in segments
+                            if weather == 'rainy')
+            collected = int(rain_time // RAIN_BARREL_COLLECTION_INTERVAL)
+            self.inventory.add_item('water', collected)
+            self.last_rain_barrel_collection = end
+
+        # Re-plan the weather-dependent timers for the weather we resume in
+        self.last_snail_spawn = end
+        self._on_weather_change(self.weather.get_weather(), end)
+
+        news = []
+        if len(dried_out):
+            news.append(f"{len(dried_out)} Pflanzen vertrocknet")
+        if collected:
+            news.append(f"{collected} Wasser gesammelt")
+        minutes = int(end - start) // 60
+        if not minutes and not news:
+            return ""
+        return ", ".join([f"{minutes} Minuten vergangen"] + news) + "."
+
+    def advance(self, frame_time):
+        """Run the fixed steps due after `frame_time` real seconds
+
+        Returns the interpolation alpha to draw with.
+        """
+        for _ in range(self.accumulator.add(frame_time)):
+            self.update()
+        return self.accumulator.alpha
+
+    def _on_weather_change(self, weather, current_time):
+        """Re-plan timers that depend on the weather"""
+        self.plots.set_weather(weather, current_time)
+        # Weed pickers carry an umbrella in the rain
+        for picker in self.weed_pickers:
+            picker.update_weather(weather)
+        self._schedule_snail_spawn()
+        self._schedule_rain_barrel(current_time)
+
+    def _add_helper(self, helpers, helper):
+        """Put a duck or weed picker to work until its lifetime is over"""
+        helpers.append(helper)
+        self.scheduler.schedule(helper.spawn_time + helper.lifetime, self._remove_helper,
+                                helpers, helper)
+
+    def _remove_helper(self, current_time, helpers, helper):
+        """A duck or weed picker's time is up"""
+        if helper in helpers:
+            helpers.remove(helper)
+            helper.leave()
 
     def update_hover(self, mouse_pos):
         """Update hover state"""
-        self.effects.update_hover(mouse_pos, self.vegetables)
+        self.effects.update_hover(mouse_pos, self.plot_grid)
 
     def handle_click(self, mouse_pos, right_click=False):
         """Handle mouse clicks"""
@@ -175,35 +312,40 @@ class Garden:
             if message:
                 if "gekauft" in message:
                     self.sound.play('buy')
-                    if "Sprinkleranlage" in message:
-                        self.sprinkler.activate()
-                    elif "Weed Picker" in message or "Unkrautpflücker" in message:
+                    current_time = self.clock.now
+                    if "Weed Picker" in message or "Unkrautpflücker" in message:
                         # Spawn a weed picker
                         current_weather = self.weather.get_weather()
-                        self.weed_pickers.append(WeedPicker(self.vegetables, current_weather))
+                        picker = WeedPicker(self.agents, self.vegetables, self.plots.weed_queue,
+                                            current_time, current_weather)
+                        self._add_helper(self.weed_pickers, picker)
                     elif "Duck" in message or "Ente" in message:
                         # Spawn a duck
-                        self.ducks.append(Duck(self.snails))
+                        self._add_helper(self.ducks, Duck(self.agents, self.snails, current_time))
+                    # Start automation that was just bought
+                    if self.inventory.has_sprinkler():
+                        self.sprinkler.activate()
+                    self._schedule_rain_barrel(current_time)
                 else:
                     self.sound.play('error')
                 self.credits = new_credits
                 return message
 
-        # Check snail clicks first
-        for snail in self.snails[:]:
+        # Check snail clicks first (only snails in the cells around the click)
+        for snail in self.snails.query(mouse_pos[0], mouse_pos[1], SNAIL_HASH_CELL_SIZE):
             if snail.is_clicked(mouse_pos) and not right_click:
-                self.snails.remove(snail)
+                snail.remove()
                 self.sound.play('weed')
                 return "Schnecke entfernt!"
 
         # Handle vegetable interactions
-        for vegetable in self.vegetables:
-            if vegetable.rect.collidepoint(mouse_pos):
-                if right_click:
-                    self.selected_vegetable = vegetable
-                    return f"Feld ausgewählt (Fruchtbarkeit: {vegetable.soil_fertility:.1f})"
-                else:
-                    return self._handle_vegetable_click(vegetable)
+        vegetable = self.plot_grid.at(mouse_pos)
+        if vegetable is not None:
+            if right_click:
+                self.selected_vegetable = vegetable
+                return f"Feld ausgewählt (Fruchtbarkeit: {vegetable.soil_fertility:.1f})"
+            else:
+                return self._handle_vegetable_click(vegetable)
 
         return ""
 
@@ -218,12 +360,13 @@ class Garden:
 
     def _apply_tool(self, vegetable, tool):
         """Apply a tool to a vegetable plot"""
+        current_time = self.clock.now
         if tool == 'fertilizer':
             if self.inventory.get_item_count('fertilizer') > 0:
                 self.inventory.remove_item('fertilizer')
-                vegetable.fertilize()
+                vegetable.fertilize(current_time)
                 self.sound.play('fertilize')
-                self.effects.add_sparkles(vegetable.x, vegetable.y, CONFIG_GREEN)
+                self.effects.add_sparkles(vegetable.x, vegetable.y, CONFIG_GREEN, current_time)
                 self.inventory.clear_active_tool()
                 return f"Gedüngt! ({self.inventory.get_item_count('fertilizer')} übrig)"
             else:
@@ -233,10 +376,10 @@ class Garden:
         elif tool == 'water':
             if self.inventory.get_item_count('water') > 0:
                 self.inventory.remove_item('water')
-                vegetable.water()
+                vegetable.water(current_time)
                 self.sound.play('water')
                 from config import WATER_BLUE
-                self.effects.add_sparkles(vegetable.x, vegetable.y, WATER_BLUE)
+                self.effects.add_sparkles(vegetable.x, vegetable.y, WATER_BLUE, current_time)
                 self.inventory.clear_active_tool()
                 return f"Gegossen! ({self.inventory.get_item_count('water')} übrig)"
             else:
@@ -262,7 +405,7 @@ class Garden:
             elif self.inventory.get_item_count(tool) > 0 and vegetable.plant_dead:
                 self.inventory.remove_item(tool)
                 seed_type = tool.replace('_seeds', '')
-                vegetable.plant_seed(seed_type)
+                vegetable.plant_seed(seed_type, current_time)
                 self.sound.play('plant')
                 self.inventory.clear_active_tool()
                 remaining = self.inventory.get_item_count(tool)
@@ -273,86 +416,90 @@ class Garden:
 
         return ""
 
-    def _update_snails(self):
-        """Update snail spawning and movement"""
-        current_time = time.time()
-        delta_time = 1.0 / 60.0  # Approximate delta time
-        current_weather = self.weather.get_weather()
+    def _schedule_snail_spawn(self):
+        """(Re)schedule the next snail spawn for the current weather"""
+        if self.snail_spawn_event:
+            self.snail_spawn_event.cancel()
 
         # Adjust spawn interval based on weather
-        if current_weather == 'rainy':
+        if self.weather.get_weather() == 'rainy':
             spawn_interval = 5.0  # Much faster spawning in rain (every 5 seconds)
         else:
             spawn_interval = self.snail_spawn_interval  # Normal 15 seconds
 
-        # Spawn new snails
-        if current_time - self.last_snail_spawn > spawn_interval:
-            # Find all living vegetables (both ripe and unripe)
-            living_vegetables = [v for v in self.vegetables if not v.plant_dead]
-            if living_vegetables:
-                # In rain, spawn multiple snails at once
-                snail_count = random.randint(2, 4) if current_weather == 'rainy' else 1
-                for _ in range(snail_count):
-                    if living_vegetables:  # Check again in case we run out
-                        target = random.choice(living_vegetables)
-                        self.snails.append(Snail(target))
-                self.last_snail_spawn = current_time
-
-        # Update existing snails
-        for snail in self.snails[:]:
-            finished = snail.update(delta_time)
-            if finished:
-                # Snail finished eating - kill the plant (both ripe and unripe)
-                snail.target.grown = False
-                snail.target.plant_dead = True
-                self.snails.remove(snail)
-
-    def _update_weed_pickers(self):
-        """Update weed picker movement and working"""
-        delta_time = 1.0 / 60.0  # Approximate delta time
+        self.snail_spawn_event = self.scheduler.schedule(self.last_snail_spawn + spawn_interval,
+                                                         self._spawn_snails)
+
+    def _spawn_snails(self, current_time):
+        """Snail spawn timer fired"""
+        self.snail_spawn_event = None
         current_weather = self.weather.get_weather()
 
-        for picker in self.weed_pickers[:]:
-            # Update weather for umbrella display
-            picker.update_weather(current_weather)
-            finished = picker.update(delta_time)
-            if finished:
-                # Picker's time is up
-                self.weed_pickers.remove(picker)
-
-    def _update_ducks(self):
-        """Update duck movement and snail eating"""
-        delta_time = 1.0 / 60.0  # Approximate delta time
-
-        for duck in self.ducks[:]:
-            finished = duck.update(delta_time)
-            if finished:
-                # Duck's time is up
-                self.ducks.remove(duck)
-
-    def _update_rain_barrel(self):
-        """Collect water in rain barrel during rain"""
-        if not self.inventory.has_rain_barrel():
+        # Snails go for living vegetables (both ripe and unripe)
+        living = self.plots.living
+        if not living:
+            # Nothing to eat yet - look again shortly
+            self.snail_spawn_event = self.scheduler.schedule(current_time + 1.0, self._spawn_snails)
             return
 
-        current_weather = self.weather.get_weather()
-        if current_weather != 'rainy':
+        # In rain, spawn multiple snails at once
+        snail_count = random.randint(2, 4) if current_weather == 'rainy' else 1
+        for _ in range(snail_count):
+            target = self.vegetables[living.choice()]
+            Snail(self.agents, target, self.snails, current_time)  # Adds itself to the hash
+        self.last_snail_spawn = current_time
+
+        # Ducks without a snail to chase go for the new ones
+        for duck in self.ducks:
+            if duck.target_snail is None:
+                duck.target_lost()
+        self._schedule_snail_spawn()
+
+    def _update_agents(self, current_time):
+        """Move all agents, then handle arrivals (eating, working) and finished timers"""
+        # Keep the snail hash in sync with snails that crossed into another cell
+        for agent in self.agents.update(self.clock.delta, current_time):
+            if agent in self.snails:
+                self.snails.move(agent)
+
+    def _update_sound(self, current_weather):
+        """Start the requested sound effects and the ambient loop of the weather"""
+        self.sound.update()
+        if current_weather == 'rainy':
+            self.sound.play_ambient('rain')
+        elif current_weather == 'sunny':
+            self.sound.play_ambient('birds')
+        else:
+            self.sound.stop_ambient()
+
+    def _schedule_rain_barrel(self, current_time):
+        """Schedule the next water collection if it is raining and a barrel is owned"""
+        if self.rain_barrel_event or not self.inventory.has_rain_barrel():
+            return
+        if self.weather.get_weather() != 'rainy':
             return
 
-        current_time = time.time()
         from config import RAIN_BARREL_COLLECTION_INTERVAL
+        when = max(current_time, self.last_rain_barrel_collection + RAIN_BARREL_COLLECTION_INTERVAL)
+        self.rain_barrel_event = self.scheduler.schedule(when, self._collect_rain_water)
+
+    def _collect_rain_water(self, current_time):
+        """Collect water in rain barrel during rain"""
+        self.rain_barrel_event = None
+        if not self.inventory.has_rain_barrel() or self.weather.get_weather() != 'rainy':
+            return
 
-        if current_time - self.last_rain_barrel_collection >= RAIN_BARREL_COLLECTION_INTERVAL:
-            # Collect 1 water
-            self.inventory.add_item('water', 1)
-            self.last_rain_barrel_collection = current_time
-            # Optional: Could add a visual effect or sound here
+        # Collect 1 water
+        self.inventory.add_item('water', 1)
+        self.last_rain_barrel_collection = current_time
+        self._schedule_rain_barrel(current_time)
 
     def _default_action(self, vegetable):
         """Perform default action on vegetable plot (no tool selected)"""
+        current_time = self.clock.now
         # Priority 1: Remove weeds
         if vegetable.weed_level > 0:
-            vegetable.remove_weeds()
+            vegetable.remove_weeds(current_time)
             self.sound.play('weed')
             if vegetable.weed_level > 0:
                 return f"Unkraut reduziert! Level {vegetable.weed_level} ({vegetable.weed_level} Klicks nötig)"
@@ -364,44 +511,141 @@ class Garden:
             return "Totes Feld - kaufe Samen im Shop zum Pflanzen!"
         # Priority 4: Harvest
         else:
-            earned = vegetable.harvest()
+            earned = vegetable.harvest(current_time)
             if earned > 0:
                 self.sound.play('harvest')
-                self.effects.add_sparkles(vegetable.x, vegetable.y, YELLOW)
-                self.effects.add_coin_popup(vegetable.x, vegetable.y, earned)
+                self.effects.add_sparkles(vegetable.x, vegetable.y, YELLOW, current_time)
+                self.effects.add_coin_popup(vegetable.x, vegetable.y, earned, current_time)
             self.credits += earned
             return f"Geerntet: {earned} Credits"
 
-    def draw(self, screen, font, title_font):
-        """Draw the entire game"""
+    def draw(self, screen, font, title_font, alpha=1.0):
+        """Draw the entire game and return the screen areas that changed
+
+        Moving agents are drawn `alpha` of the way from their previous to
+        their current step position. The result is meant for
+        pygame.display.update(rects).
+        """
+        current_time = self.clock.now
+        current_weather = self.weather.get_weather()
+        renderer = self.renderer
+        profiler = self.profiler
+        profiler.begin('draw')
+
+        # Static layer (re-rendered only when weather, ownership or buttons change)
+        renderer.begin_frame(screen, self._static_layer_key(),
+                             lambda surface: self._draw_static_layer(surface, font, title_font))
+        profiler.lap('static')
+
+        # Rain and the shop overlay cover the whole screen
+        if current_weather == 'rainy' or self.shop.show:
+            renderer.mark_full()
+
+        # Draw chimney smoke and rain barrel drops
+        self.storage_house.draw_smoke(screen, current_time)
+        if self.inventory.has_rain_barrel():
+            self.rain_barrel_visual.draw_drops(screen, current_time)
+        renderer.mark_dirty(self.particles.bounds(('smoke', 'drop'), 10))
+        profiler.lap('smoke')
+
+        # Draw weather TV if owned (the screen flickers every frame)
+        if self.inventory.has_weather_tv():
+            forecast = self.weather.get_forecast(current_time, 3)
+            self.weather_tv.draw(screen, font, forecast)
+            tv = self.weather_tv
+            renderer.mark_dirty((tv.x - 5, tv.y - 20, tv.width + 10, tv.height + 25))
+        profiler.lap('weather_tv')
+
+        # Draw credits
+        credits_label = render_text(font, "Credits: ", BLACK)
+        renderer.mark_dirty(screen.blit(credits_label, (20, 20)))
+        renderer.mark_dirty(get_glyph_atlas(font, BLACK).draw(screen, str(self.credits),
+                                                              (20 + credits_label.get_width(), 20)))
+        profiler.lap('credits')
+
+        # Draw selected vegetable highlight
+        if self.selected_vegetable:
+            selection_rect = pygame.Rect(self.selected_vegetable.x - 2,
+                                        self.selected_vegetable.y - 2, 64, 64)
+            pygame.draw.rect(screen, YELLOW, selection_rect, 3)
+
+        # Draw vegetables
+        for vegetable in self.vegetables:
+            vegetable.draw(screen, font, current_time)
+            self.effects.draw_hover_effect(screen, font, current_time)
+            self.effects.draw_growth_progress(screen, vegetable, current_time)
+        self.particles.draw(screen, ('seed', 'fertilizer', 'water', 'weed'), current_time)
+        renderer.mark_dirty(self._garden_bounds())
+        renderer.mark_dirty(self.particles.bounds(('seed', 'fertilizer', 'water', 'weed'), 10))
+        profiler.lap('vegetables')
+
+        # Draw snails, weed pickers and ducks
+        for helper in list(self.snails) + self.weed_pickers + self.ducks:
+            renderer.mark_dirty(helper.draw(screen, current_time, alpha))
+        profiler.lap('agents')
+
+        # Draw sprinkler system (heads and mist lie within the garden bounds)
+        self.sprinkler.draw(screen, self.vegetables, current_time)
+        profiler.lap('sprinkler')
+
+        # Draw weather effects
+        if current_weather == 'sunny':
+            self.effects.draw_sun(screen)
+            renderer.mark_dirty(SKY_EFFECT_RECT)
+        elif current_weather == 'cloudy':
+            self.effects.draw_clouds(screen)
+            renderer.mark_dirty(SKY_EFFECT_RECT)
+
+        self.weather.draw_rain(screen, current_time)
+        profiler.lap('weather')
+
+        # Draw particle effects
+        self.effects.draw_sparkles(screen, current_time)
+        self.effects.draw_coin_popups(screen, font, current_time)
+        renderer.mark_dirty(self.particles.bounds(('sparkle',), 10))
+        renderer.mark_dirty(self.particles.bounds(('coin',), 80))
+        profiler.lap('effects')
+
+        # Draw shop
+        self.shop.draw(screen, font, self.inventory, self.credits)
+        profiler.lap('shop')
+
+        # Draw the profiler overlay
+        if profiler.enabled:
+            renderer.mark_dirty(profiler.draw(screen))
+            profiler.lap('profiler')
+
+        rects = renderer.end_frame(screen)
+        profiler.lap('dirty_rects')
+        profiler.end()
+        return rects
+
+    def _static_layer_key(self):
+        """Everything the cached static layer depends on"""
+        return (self.weather.get_weather(), self.inventory.has_rain_barrel(),
+                self.sound.muted, self.sound.music_playing,
+                tuple(self.inventory.items.values()), self.inventory.active_tool)
+
+    def _draw_static_layer(self, screen, font, title_font):
+        """Draw the parts of the frame that rarely change"""
         # Draw background
         current_weather = self.weather.get_weather()
         screen.fill(BACKGROUND_COLORS[current_weather])
 
         # Draw title
-        title = title_font.render("Garten-Spiel", True, BLACK)
-        from config import WINDOW_WIDTH
+        title = render_text(title_font, "Garten-Spiel", BLACK)
         screen.blit(title, (WINDOW_WIDTH // 2 - title.get_width() // 2, 20))
 
         # Draw storage house (before other UI elements)
-        self.storage_house.draw(screen)
+        self.storage_house.draw_building(screen)
 
         # Draw rain barrel if owned
         if self.inventory.has_rain_barrel():
-            self.rain_barrel_visual.draw(screen)
-
-        # Draw weather TV if owned
-        if self.inventory.has_weather_tv():
-            forecast = self.weather.get_forecast(3)
-            self.weather_tv.draw(screen, font, forecast)
-
-        # Draw credits
-        credits_text = font.render(f"Credits: {self.credits}", True, BLACK)
-        screen.blit(credits_text, (20, 20))
+            self.rain_barrel_visual.draw_barrel(screen)
 
         # Draw weather
         weather_color = WEATHER_COLORS[current_weather]
-        weather_text = font.render(f"Wetter: {current_weather.title()}", True, weather_color)
+        weather_text = render_text(font, f"Wetter: {current_weather.title()}", weather_color)
         screen.blit(weather_text, (20, 50))
 
         # Draw inventory
@@ -416,55 +660,21 @@ class Garden:
         # Draw music button
         self._draw_music_button(screen, font)
 
-        # Draw selected vegetable highlight
-        if self.selected_vegetable:
-            selection_rect = pygame.Rect(self.selected_vegetable.x - 2,
-                                        self.selected_vegetable.y - 2, 64, 64)
-            pygame.draw.rect(screen, YELLOW, selection_rect, 3)
-
         # Draw info text
-        from config import WINDOW_HEIGHT
-        info_text1 = font.render("Links: Ernten/Unkraut entfernen | Rechts: Feld wählen", True, BLACK)
+        info_text1 = render_text(font, "Links: Ernten/Unkraut entfernen | Rechts: Feld wählen", BLACK)
         screen.blit(info_text1, (20, WINDOW_HEIGHT - 60))
 
-        info_text2 = font.render("Tool wählen → Feld klicken | Rechts=Feld auswählen | Gelb=Aktives Tool", True, BLACK)
+        info_text2 = render_text(font, "Tool wählen → Feld klicken | Rechts=Feld auswählen | Gelb=Aktives Tool", BLACK)
         screen.blit(info_text2, (20, WINDOW_HEIGHT - 40))
 
-        # Draw vegetables
-        for vegetable in self.vegetables:
-            vegetable.draw(screen, font)
-            self.effects.draw_hover_effect(screen, font)
-            self.effects.draw_growth_progress(screen, vegetable)
-
-        # Draw snails
-        for snail in self.snails:
-            snail.draw(screen)
-
-        # Draw weed pickers
-        for picker in self.weed_pickers:
-            picker.draw(screen)
-
-        # Draw ducks
-        for duck in self.ducks:
-            duck.draw(screen)
-
-        # Draw sprinkler system
-        self.sprinkler.draw(screen, self.vegetables)
-
-        # Draw weather effects
-        if current_weather == 'sunny':
-            self.effects.draw_sun(screen)
-        elif current_weather == 'cloudy':
-            self.effects.draw_clouds(screen)
-
-        self.weather.draw_rain(screen)
-
-        # Draw particle effects
-        self.effects.draw_sparkles(screen)
-        self.effects.draw_coin_popups(screen, font)
-
-        # Draw shop
-        self.shop.draw(screen, font, self.inventory, self.credits)
+    def _garden_bounds(self):
+        """Screen area of all plots including labels, tooltips and sprinkler heads"""
+        if not self.vegetables:
+            return None
+        rects = [vegetable.rect for vegetable in self.vegetables]
+        bounds = rects[0].unionall(rects[1:])
+        # Tooltips reach 40px above and ~230px to the right of a plot, weeds hang below
+        return pygame.Rect(bounds.x - 20, bounds.y - 45, bounds.width + 250, bounds.height + 80)
 
     def _draw_mute_button(self, screen, font):
         """Draw the mute button"""
@@ -472,7 +682,7 @@ class Garden:
         mute_color = CONFIG_RED if self.sound.muted else CONFIG_GREEN
         pygame.draw.rect(screen, mute_color, mute_button)
         pygame.draw.rect(screen, BLACK, mute_button, 2)
-        mute_text = font.render("🔇 Muted" if self.sound.muted else "🔊 Sound ON", True, BLACK)
+        mute_text = render_text(font, "🔇 Muted" if self.sound.muted else "🔊 Sound ON", BLACK)
         screen.blit(mute_text, (MUTE_BUTTON_X + 30, MUTE_BUTTON_Y + 8))
 
     def _draw_music_button(self, screen, font):
@@ -482,5 +692,5 @@ class Garden:
         music_color = CONFIG_RED if not self.sound.music_playing else CONFIG_GREEN
         pygame.draw.rect(screen, music_color, music_button)
         pygame.draw.rect(screen, BLACK, music_button, 2)
-        music_text = font.render("🎵 Musik AUS" if not self.sound.music_playing else "🎵 Musik AN", True, BLACK)
+        music_text = render_text(font, "🎵 Musik AUS" if not self.sound.music_playing else "🎵 Musik AN", BLACK)
         screen.blit(music_text, (MUSIC_BUTTON_X + 30, MUSIC_BUTTON_Y + 8))
@@ -0,0 +1,114 @@
+"""
+Index sets - sets of plot indices with O(1) updates and a dense array view
+
+A sparse-set layout: `dense` packs the members, `position` maps an index
+to its slot in `dense` (-1 when absent). Membership tests, inserts and
+swap-removes are O(1) and the members can be handed to NumPy as an array.
+"""
+import random
+import numpy as np
+
+
+class IndexSet:
+    """Set of small non-negative integers backed by NumPy arrays"""
+
+    def __init__(self, capacity=16):
+        self.capacity = max(1, capacity)
+        self.dense = np.zeros(self.capacity, dtype=np.int64)
+        self.position = np.full(self.capacity, -1, dtype=np.int64)
+        self.count = 0
+
+    def _ensure_capacity(self, needed):
+        """Grow both arrays (amortized doubling) to hold indices below `needed`"""
+        if needed <= self.capacity:
+            return
+        new_capacity = max(needed, self.capacity * 2)
+        dense = np.zeros(new_capacity, dtype=np.int64)
+        dense[:self.count] = self.dense[:self.count]
+        position = np.full(new_capacity, -1, dtype=np.int64)
+        position[:self.capacity] = self.position
+        self.dense, self.position, self.capacity = dense, position, new_capacity
+
+    def add(self, index):
+        """Insert one index"""
+        self._ensure_capacity(index + 1)
+        if self.position[index] < 0:
+            self.dense[self.count] = index
+            self.position[index] = self.count
+            self.count += 1
+
+    def discard(self, index):
+        """Remove one index if present (the last member fills its slot)"""
+        if index >= self.capacity:
+            return
+        slot = self.position[index]
+        if slot < 0:
+            return
+        last = self.dense[self.count - 1]
+        self.dense[slot] = last
+        self.position[last] = slot
+        self.position[index] = -1
+        self.count -= 1
+
+    def update(self, indices, members):
+        """Set membership of each index in `indices` to the matching flag in `members`"""
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) == 0:
+            return
+        if len(indices) == 1:
+            # Single plot (clicks, view writes): skip the vectorized bookkeeping
+            index = int(indices[0])
+            if members[0]:
+                self.add(index)
+            else:
+                self.discard(index)
+            return
+        self._ensure_capacity(int(indices.max()) + 1)
+        present = self.position[indices] >= 0
+        removed = indices[present & ~members]
+        if len(removed) > 32:
+            # Many removals: drop them and re-pack the survivors in one pass
+            self.position[removed] = -1
+            survivors = self.dense[:self.count]
+            survivors = survivors[self.position[survivors] >= 0]
+            self.count = len(survivors)
+            self.dense[:self.count] = survivors
+            self.position[survivors] = np.arange(self.count)
+        else:
+            for index in removed.tolist():
+                self.discard(index)
+        added = indices[members & ~present]
+        if len(added):
+            added = np.unique(added)
+            self.dense[self.count:self.count + len(added)] = added
+            self.position[added] = np.arange(self.count, self.count + len(added))
+            self.count += len(added)
+
+    def mask(self, n):
+        """Boolean membership of indices 0..n-1"""
+        self._ensure_capacity(n)
+        return self.position[:n] >= 0
+
+    def contains(self, indices):
+        """Membership flags of an array of indices"""
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices):
+            self._ensure_capacity(int(indices.max()) + 1)
+        return self.position[indices] >= 0
+
+    def indices(self):
+        """Members as an array (a view; copy it before changing the set)"""
+        return self.dense[:self.count]
+
+    def choice(self):
+        """A uniformly random member"""
+        return int(self.dense[random.randrange(self.count)])
+
+    def __contains__(self, index):
+        return index < self.capacity and self.position[index] >= 0
+
+    def __iter__(self):
+        return iter(self.dense[:self.count].tolist())
+
+    def __len__(self):
+        return self.count
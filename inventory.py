@@ -2,6 +2,7 @@
 Inventory management system
 """
 import pygame
+from fonts import get_font, render_text, get_glyph_atlas
 from config import (
     INVENTORY_BUTTONS, INVENTORY_BUTTON_WIDTH, INVENTORY_BUTTON_HEIGHT,
     GREEN, RED, YELLOW, BLACK, WHITE, WATER_BLUE, GRAY, ORANGE, PURPLE
@@ -97,8 +98,8 @@ class Inventory:
         """Draw icon for a tool"""
         if tool_type == 'fertilizer':
             pygame.draw.rect(screen, (0, 150, 0), (x+5, y+10, 15, 15))
-            font = pygame.font.Font(None, 16)
-            text = font.render("D", True, WHITE)
+            font = get_font(16)
+            text = render_text(font, "D", WHITE)
             screen.blit(text, (x+10, y+12))
         elif tool_type == 'water':
             pygame.draw.circle(screen, WATER_BLUE, (x+12, y+15), 8)
@@ -142,5 +143,4 @@ class Inventory:
             count = self.items[tool]
             if isinstance(count, bool):
                 count = 1 if count else 0
-            count_text = font.render(str(count), True, BLACK)
-            screen.blit(count_text, (x + 65, y + 25))
+            get_glyph_atlas(font, BLACK).draw(screen, str(count), (x + 65, y + 25))
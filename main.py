@@ -7,15 +7,59 @@ A pygame-based garden management game with:
 - Shop system with seeds and upgrades
 - Sprinkler automation
 - Sound effects and background music
+
+Run `python main.py --headless --ticks N` to step the simulation without
+a display or audio device and report ticks per second. `--fps N` caps the
+render rate; the simulation keeps its fixed step either way. The game is
+saved to SAVE_FILE on exit and every AUTOSAVE_INTERVAL seconds, and
+resumed from it on start (`--new` starts a fresh garden).
+
+F3 toggles the frame profiler overlay; F4 writes the recorded frames to
+PROFILER_TRACE_FILE in Chrome trace-event format.
 """
 import pygame
 import asyncio
+import argparse
+import time
 from garden import Garden
-from config import WINDOW_WIDTH, WINDOW_HEIGHT, FPS
+from save_game import save_garden, load_garden
+from fonts import get_font
+from config import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, FPS, GARDEN_ROWS, GARDEN_COLS, SAVE_FILE, AUTOSAVE_INTERVAL,
+    PROFILER_TRACE_FILE
+)
+
+
+def run_headless(ticks, rows=GARDEN_ROWS, cols=GARDEN_COLS):
+    """Step a headless garden as fast as possible and print ticks/second"""
+    garden = Garden(rows, cols, headless=True)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        garden.update()
+    elapsed = time.perf_counter() - start
+
+    ticks_per_second = ticks / elapsed if elapsed > 0 else float('inf')
+    print(f"{ticks} ticks in {elapsed:.3f}s ({ticks_per_second:.1f} ticks/s, "
+          f"{rows * cols} plots)")
+    return ticks_per_second
 
 
-async def main():
-    """Main game loop"""
+def store_garden(garden):
+    """Save the garden; a failed save is reported and the game goes on"""
+    try:
+        save_garden(garden, SAVE_FILE)
+    except OSError as error:
+        print(f"Spielstand konnte nicht gespeichert werden: {error}")
+
+
+async def main(fps=FPS, new_game=False):
+    """Main game loop
+
+    The simulation advances in fixed steps driven by real elapsed time,
+    so a lower frame rate draws fewer, interpolated frames of the same
+    game speed.
+    """
     # Initialize pygame
     pygame.init()
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
@@ -23,15 +67,29 @@ async def main():
     clock = pygame.time.Clock()
 
     # Setup fonts
-    font = pygame.font.Font(None, 24)
-    title_font = pygame.font.Font(None, 48)
+    font = get_font(24)
+    title_font = get_font(48)
 
-    # Create garden
-    garden = Garden()
+    # Resume the saved garden, or create a new one
+    garden = None
+    if not new_game:
+        try:
+            garden, summary = load_garden(SAVE_FILE)
+            if summary:
+                print(summary)
+        except (OSError, ValueError) as error:
+            print(f"Spielstand konnte nicht geladen werden: {error}")
+    if garden is None:
+        garden = Garden()
 
     # Game loop
     running = True
+    last_frame = time.perf_counter()
+    next_save = last_frame + AUTOSAVE_INTERVAL
     while running:
+        profiler = garden.profiler
+        profiler.begin_frame()
+
         # Handle events
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -45,25 +103,60 @@ async def main():
                     message = garden.handle_click(event.pos, True)
                     if message:
                         print(message)
+            elif event.type == pygame.MOUSEMOTION:
+                # Hover only changes when the mouse moves
+                garden.update_hover(event.pos)
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    profiler.toggle()
+                elif event.key == pygame.K_F4:
+                    frames = profiler.dump_trace(PROFILER_TRACE_FILE)
+                    print(f"Wrote {frames} frames to {PROFILER_TRACE_FILE}")
+        profiler.lap('events')
 
-        # Update hover effect based on mouse position
-        mouse_pos = pygame.mouse.get_pos()
-        garden.update_hover(mouse_pos)
+        # Run the simulation steps that are due for the time since the last frame
+        now = time.perf_counter()
+        alpha = garden.advance(now - last_frame)
+        last_frame = now
 
-        # Update game state
-        garden.update()
+        if now >= next_save:
+            store_garden(garden)
+            next_save = now + AUTOSAVE_INTERVAL
 
-        # Draw everything
-        garden.draw(screen, font, title_font)
+        # Draw everything (agents interpolated between the last two steps)
+        dirty_rects = garden.draw(screen, font, title_font, alpha)
 
-        # Update display
-        pygame.display.flip()
+        # Push only the areas that changed
+        pygame.display.update(dirty_rects)
+        profiler.lap('present')
         await asyncio.sleep(0)  # Allow other async tasks to run
-        clock.tick(FPS)
+        clock.tick(fps)
 
     # Cleanup
+    store_garden(garden)
     pygame.quit()
 
 
+def parse_args():
+    """Parse command line options (unknown ones are ignored, e.g. under pygbag)"""
+    parser = argparse.ArgumentParser(description="Garten-Spiel")
+    parser.add_argument('--headless', action='store_true',
+                        help="run the simulation without display or sound")
+    parser.add_argument('--ticks', type=int, default=10000,
+                        help="number of ticks to simulate in headless mode")
+    parser.add_argument('--fps', type=int, default=FPS,
+                        help="render frame cap (the simulation speed does not change)")
+    parser.add_argument('--new', action='store_true',
+                        help="start a new garden instead of loading the save game")
+    parser.add_argument('--rows', type=int, default=GARDEN_ROWS)
+    parser.add_argument('--cols', type=int, default=GARDEN_COLS)
+    args, _ = parser.parse_known_args()
+    return args
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    if args.headless:
+        run_headless(args.ticks, args.rows, args.cols)
+    else:
+        asyncio.run(main(args.fps, args.new))
@@ -0,0 +1,305 @@
+"""
+Net sync - delta-compressed state stream for remote (browser) clients
+
+A SyncEncoder turns a Garden into one packet per tick that holds only
+what changed since the previous packet: plot fields, agent positions and
+states, credits, inventory and weather. Fields are quantized (moisture
+and fertility to a byte, positions to whole pixels, deadlines to ticks)
+and compared in quantized form, so changes below that resolution cost
+nothing. Every NET_KEYFRAME_INTERVAL ticks, and whenever a client asks
+for one, a keyframe carries the complete state so clients that join or
+fall out of step resynchronize. SyncDecoder rebuilds the state on the
+client side.
+
+Moisture is sent the way the plot store keeps it: the value and tick of
+the plot's last re-base, plus the moisture rate of the weather. Clients
+evaluate the current moisture themselves, so a plot only changes when it
+is watered or the weather changes.
+
+Packet layout (little-endian):
+    header   kind (0 delta, 1 keyframe), tick (u32), sections present (u8)
+    globals  credits (i32), weather (u8), moisture rate (f32), then one u16
+             per inventory item, in Inventory.items order
+    plots    mode (u8: 0 listed, 1 all plots), [count (u32), indices (u32)],
+             one PLOT_SYNC record per plot
+    agents   removed count (u16) and slots (u16), moved count (u16) and
+             MOVE_SYNC records, changed count (u16) and AGENT_SYNC records
+Agents are identified by their AgentStore slot. Moves are pixel offsets
+from the last position sent; agents that appear, change state or jump
+further than an offset can hold are sent in full.
+"""
+import struct
+import numpy as np
+from config import WEATHER_OPTIONS, NET_KEYFRAME_INTERVAL
+
+DELTA = 0
+KEYFRAME = 1
+
+# Section flags of the header
+GLOBALS = 1
+PLOTS = 2
+AGENTS = 4
+
+# Agent kinds
+SNAIL = 1
+DUCK = 2
+WEED_PICKER = 3
+
+# Plot flags
+GROWN = 1
+DEAD = 2
+
+# Agent flags
+BUSY = 1  # Snail or duck eating, weed picker working
+
+HEADER = struct.Struct('<BIB')
+GLOBALS_RECORD = struct.Struct('<iBf')
+PLOT_MODE = struct.Struct('<B')
+COUNT = struct.Struct('<I')
+SHORT_COUNT = struct.Struct('<H')
+
+PLOT_SYNC = np.dtype([('crop', 'u1'), ('flags', 'u1'), ('moisture', 'u1'), ('moisture_tick', '<u4'),
+                      ('fertility', 'u1'), ('weeds', 'u1'), ('regrow_tick', '<u4')])
+AGENT_SYNC = np.dtype([('slot', '<u2'), ('kind', 'u1'), ('flags', 'u1'), ('x', '<i2'), ('y', '<i2')])
+MOVE_SYNC = np.dtype([('slot', '<u2'), ('dx', 'i1'), ('dy', 'i1')])
+
+
+def _quantize(values, scale, dtype):
+    """Round values to a fixed-point integer type, saturating at its range"""
+    info = np.iinfo(dtype)
+    return np.clip(np.rint(np.asarray(values) * scale), info.min, info.max).astype(dtype)
+
+
+def quantize_plots(garden):
+    """Every plot of a garden as PLOT_SYNC records"""
+    plots = garden.plots
+    n = plots.count
+    step = garden.clock.step
+    records = np.empty(n, dtype=PLOT_SYNC)
+    records['crop'] = plots.crop[:n]
+    records['flags'] = plots.grown[:n] * GROWN | plots.plant_dead[:n] * DEAD
+    records['moisture'] = _quantize(plots.soil_moisture[:n], 255, np.uint8)
+    records['moisture_tick'] = _quantize(plots.last_moisture_update[:n], 1 / step, np.uint32)
+    records['fertility'] = _quantize(plots.soil_fertility[:n], 255, np.uint8)
+    records['weeds'] = plots.weed_level[:n]
+    records['regrow_tick'] = _quantize(np.ceil(plots.regrow_time[:n] / step), 1, np.uint32)
+    return records
+
+
+def quantize_agents(garden):
+    """Kind, flags and whole-pixel position of every agent slot (kind 0 = free)"""
+    agents = garden.agents
+    n = agents.count
+    kind = np.zeros(n, dtype=np.uint8)
+    flags = np.zeros(n, dtype=np.uint8)
+    for group, code, busy in ((garden.snails, SNAIL, 'reached_target'),
+                              (garden.ducks, DUCK, 'eating'),
+                              (garden.weed_pickers, WEED_PICKER, 'working')):
+        for agent in group:
+            kind[agent.slot] = code
+            flags[agent.slot] = BUSY if getattr(agent, busy) else 0
+    x = _quantize(agents.x[:n], 1, np.int16)
+    y = _quantize(agents.y[:n], 1, np.int16)
+    return kind, flags, x, y
+
+
+def _globals(garden):
+    inventory = [min(int(value), 0xFFFF) for value in garden.inventory.items.values()]
+    return (garden.credits, WEATHER_OPTIONS.index(garden.weather.get_weather()),
+            float(np.float32(garden.plots.rate)), tuple(inventory))
+
+
+class SyncEncoder:
+    """Encodes one garden into a stream of delta packets for one client"""
+
+    def __init__(self, keyframe_interval=NET_KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.last_keyframe = None  # Tick of the last keyframe (None: next packet is one)
+        # Last state sent, in quantized form
+        self.globals = None
+        self.plots = None
+        self.kind = self.flags = np.zeros(0, dtype=np.uint8)
+        self.x = self.y = np.zeros(0, dtype=np.int16)
+
+    def request_keyframe(self):
+        """Send the full state next (new client, or a client that lost track)"""
+        self.last_keyframe = None
+
+    def encode(self, garden):
+        """The packet bringing the client from the last packet to the garden's current state"""
+        tick = garden.clock.ticks
+        keyframe = self.last_keyframe is None or tick - self.last_keyframe >= self.keyframe_interval
+        if keyframe:
+            self.last_keyframe = tick
+        sections = 0
+        parts = []
+
+        # Credits, weather and inventory
+        current = _globals(garden)
+        if keyframe or current != self.globals:
+            credits, weather, rate, inventory = current
+            parts.append(GLOBALS_RECORD.pack(credits, weather, rate))
+            parts.append(np.array(inventory, dtype='<u2').tobytes())
+            self.globals = current
+            sections |= GLOBALS
+
+        # Plots whose quantized record changed
+        plots = quantize_plots(garden)
+        if keyframe or self.plots is None or len(plots) != len(self.plots):
+            parts.append(PLOT_MODE.pack(1))
+            parts.append(COUNT.pack(len(plots)))
+            parts.append(plots.tobytes())
+            sections |= PLOTS
+        else:
+            changed = np.flatnonzero(plots != self.plots)
+            if len(changed):
+                parts.append(PLOT_MODE.pack(0))
+                parts.append(COUNT.pack(len(changed)))
+                parts.append(changed.astype('<u4').tobytes())
+                parts.append(plots[changed].tobytes())
+                sections |= PLOTS
+        self.plots = plots
+
+        # Agents
+        agent_parts = self._encode_agents(garden, keyframe)
+        if agent_parts:
+            parts.extend(agent_parts)
+            sections |= AGENTS
+
+        return HEADER.pack(KEYFRAME if keyframe else DELTA, tick, sections) + b''.join(parts)
+
+    def _encode_agents(self, garden, keyframe):
+        """Agent section parts (empty when nothing changed)"""
+        kind, flags, x, y = quantize_agents(garden)
+        n = len(kind)
+        if keyframe:
+            # The client drops all agents on a keyframe; everything is new
+            prev_kind = np.zeros(n, dtype=np.uint8)
+            prev_flags, prev_x, prev_y = flags, x, y
+        else:
+            prev_kind, prev_flags, prev_x, prev_y = (_resized(a, n) for a in (self.kind, self.flags, self.x, self.y))
+        self.kind, self.flags, self.x, self.y = kind, flags, x, y
+
+        removed = np.flatnonzero((prev_kind > 0) & (kind == 0))
+        alive = kind > 0
+        dx = x.astype(np.int32) - prev_x
+        dy = y.astype(np.int32) - prev_y
+        far = (np.abs(dx) > 127) | (np.abs(dy) > 127)
+        full = np.flatnonzero(alive & ((kind != prev_kind) | (flags != prev_flags) | far))
+        moved = np.flatnonzero(alive & (kind == prev_kind) & (flags == prev_flags) & ~far & ((dx != 0) | (dy != 0)))
+        if not (len(removed) or len(moved) or len(full)):
+            return []
+
+        moves = np.empty(len(moved), dtype=MOVE_SYNC)
+        moves['slot'] = moved
+        moves['dx'] = dx[moved]
+        moves['dy'] = dy[moved]
+        records = np.empty(len(full), dtype=AGENT_SYNC)
+        records['slot'] = full
+        records['kind'] = kind[full]
+        records['flags'] = flags[full]
+        records['x'] = x[full]
+        records['y'] = y[full]
+        return [SHORT_COUNT.pack(len(removed)), removed.astype('<u2').tobytes(),
+                SHORT_COUNT.pack(len(moves)), moves.tobytes(),
+                SHORT_COUNT.pack(len(records)), records.tobytes()]
+
+
+def _resized(array, n):
+    """Array zero-padded to length n (the agent store never shrinks)"""
+    if len(array) >= n:
+        return array
+    return np.concatenate([array, np.zeros(n - len(array), dtype=array.dtype)])
+
+
+class _Reader:
+    """Sequential reader over the bytes of a packet"""
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, layout):
+        if self.offset + layout.size > len(self.data):
+            raise ValueError("Truncated packet")
+        values = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return values
+
+    def array(self, dtype, count):
+        dtype = np.dtype(dtype)
+        size = count * dtype.itemsize
+        if self.offset + size > len(self.data):
+            raise ValueError("Truncated packet")
+        values = np.frombuffer(self.data, dtype=dtype, count=count, offset=self.offset)
+        self.offset += size
+        return values
+
+
+class SyncDecoder:
+    """Client-side mirror of a garden, rebuilt from the packet stream
+
+    Reference implementation for clients: `plots` holds PLOT_SYNC records,
+    `agents` maps slots to (kind, flags, x, y).
+    """
+
+    def __init__(self, inventory_names):
+        self.inventory_names = list(inventory_names)
+        self.tick = None
+        self.credits = 0
+        self.weather = None
+        self.rate = 0.0
+        self.inventory = {}
+        self.plots = np.zeros(0, dtype=PLOT_SYNC)
+        self.agents = {}
+
+    def apply(self, packet):
+        """Apply one packet (raises ValueError on bad data or a delta without a keyframe)
+
+        A ValueError usually means a packet was lost; the client should ask
+        for a keyframe (SyncEncoder.request_keyframe) and wait for it.
+        """
+        reader = _Reader(packet)
+        kind, tick, sections = reader.unpack(HEADER)
+        if kind == DELTA and self.tick is None:
+            raise ValueError("Delta packet before the first keyframe")
+        self.tick = tick
+
+        if sections & GLOBALS:
+            self.credits, weather, self.rate = reader.unpack(GLOBALS_RECORD)
+            self.weather = WEATHER_OPTIONS[weather]
+            values = reader.array('<u2', len(self.inventory_names))
+            self.inventory = dict(zip(self.inventory_names, values.tolist()))
+
+        if sections & PLOTS:
+            (mode,) = reader.unpack(PLOT_MODE)
+            (count,) = reader.unpack(COUNT)
+            if mode == 1:
+                self.plots = reader.array(PLOT_SYNC, count).copy()
+            else:
+                indices = reader.array('<u4', count)
+                if count and indices.max() >= len(self.plots):
+                    raise ValueError(f"Plot {indices.max()} out of range")
+                self.plots[indices] = reader.array(PLOT_SYNC, count)
+
+        if kind == KEYFRAME:
+            self.agents = {}
+        if sections & AGENTS:
+            (count,) = reader.unpack(SHORT_COUNT)
+            for slot in reader.array('<u2', count).tolist():
+                self.agents.pop(slot, None)
+            (count,) = reader.unpack(SHORT_COUNT)
+            for slot, dx, dy in reader.array(MOVE_SYNC, count).tolist():
+                if slot not in self.agents:
+                    raise ValueError(f"Move for unknown agent slot {slot}")
+                agent_kind, flags, x, y = self.agents[slot]
+                self.agents[slot] = (agent_kind, flags, x + dx, y + dy)
+            (count,) = reader.unpack(SHORT_COUNT)
+            for slot, agent_kind, flags, x, y in reader.array(AGENT_SYNC, count).tolist():
+                self.agents[slot] = (agent_kind, flags, x, y)
+
+    def moisture(self, index, step):
+        """A plot's current moisture, evaluated like the plot store does"""
+        record = self.plots[index]
+        elapsed = (self.tick - int(record['moisture_tick'])) * step
+        return min(1.0, max(0.0, record['moisture'] / 255 + self.rate * elapsed))
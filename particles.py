@@ -0,0 +1,284 @@
+"""
+Pooled particle engine
+
+Every particle kind (water, weeds, seeds, fertilizer, sparkles, coin
+popups, rain, chimney smoke, barrel drops, sprinkler mist) lives in its
+own fixed-capacity struct-of-arrays pool. Integration and expiry are
+vectorized; expired particles are swap-removed so pools stay dense.
+"""
+import math
+import random
+import numpy as np
+import pygame
+from fonts import get_glyph_atlas
+from config import (
+    BLACK, WATER_BLUE, YELLOW, WINDOW_HEIGHT, FPS,
+    MAX_PARTICLES, PARTICLE_POOL_CAPACITY
+)
+
+# Float fields shared by all pools
+PARTICLE_FIELDS = (
+    'x', 'y', 'vx', 'vy', 'ay',      # Position, velocity (px/s), vertical acceleration (px/s²)
+    'size', 'spawn_time', 'lifetime',
+    'phase', 'phase_speed', 'anchor_y',  # Oscillation (sprinkler mist)
+    'value'                          # Payload, e.g. coin popup amount
+)
+
+# How each kind moves and is drawn
+PARTICLE_KINDS = {
+    'water': {'style': 'circle'},
+    'weed': {'style': 'circle'},
+    'seed': {'style': 'outlined', 'shrink': True},
+    'fertilizer': {'style': 'circle'},
+    'sparkle': {'style': 'sparkle'},
+    'coin': {'style': 'coin'},
+    'rain': {'style': 'rain', 'jitter': 0.5, 'max_y': WINDOW_HEIGHT},
+    'smoke': {'style': 'smoke', 'wobble': 0.3},
+    'drop': {'style': None},  # Drawn by the rain barrel itself
+    'sprinkler': {'style': 'dot', 'oscillate': 3}
+}
+
+
+class ParticlePool:
+    """Fixed-capacity arrays for one particle kind"""
+
+    def __init__(self, kind, capacity):
+        self.kind = kind
+        self.spec = PARTICLE_KINDS[kind]
+        self.capacity = capacity
+        self.count = 0
+        for name in PARTICLE_FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=np.float64))
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+
+    def add(self, n, fields, color):
+        """Append n particles (caller guarantees there is room)"""
+        start, end = self.count, self.count + n
+        for name, value in fields.items():
+            if not np.isscalar(value):
+                value = value[:n]
+            getattr(self, name)[start:end] = value
+        self.color[start:end] = color if np.ndim(color) == 1 else color[:n]
+        self.count = end
+
+    def expire(self, alive):
+        """Swap-remove dead particles: tail survivors fill the holes"""
+        n = self.count
+        new_count = int(np.count_nonzero(alive))
+        if new_count == n:
+            return
+        dead = np.flatnonzero(~alive)
+        holes = dead[dead < new_count]
+        movers = np.flatnonzero(alive[new_count:]) + new_count
+        for name in PARTICLE_FIELDS:
+            array = getattr(self, name)
+            array[holes] = array[movers]
+        self.color[holes] = self.color[movers]
+        self.count = new_count
+
+    def clear(self):
+        """Drop every particle"""
+        self.count = 0
+
+    def update(self, current_time, delta_time):
+        """Integrate motion and expire old particles"""
+        n = self.count
+        if n == 0:
+            return
+        spec = self.spec
+        x, y, vy = self.x[:n], self.y[:n], self.vy[:n]
+        age = current_time - self.spawn_time[:n]
+
+        x += self.vx[:n] * delta_time
+        y += vy * delta_time
+        vy += self.ay[:n] * delta_time
+
+        # Rates below were tuned per frame; scale them to the time step
+        frames = delta_time * FPS
+        if 'jitter' in spec:
+            x += np.random.uniform(-spec['jitter'], spec['jitter'], n) * frames
+        if 'wobble' in spec:
+            x += np.sin(age * 2) * spec['wobble'] * frames
+        if 'oscillate' in spec:
+            phase = self.phase[:n]
+            phase += self.phase_speed[:n] * frames
+            y[:] = self.anchor_y[:n] + np.sin(phase) * spec['oscillate']
+        if spec.get('shrink'):
+            late = age > 1.0
+            self.size[:n][late] = 6 * np.maximum(0.3, 1.0 - (age[late] - 1.0))
+
+        alive = age < self.lifetime[:n]
+        if 'max_y' in spec:
+            alive &= y <= spec['max_y']
+        self.expire(alive)
+
+
+class ParticleSystem:
+    """All particle pools plus a global particle budget"""
+
+    def __init__(self, max_particles=MAX_PARTICLES):
+        self.max_particles = max_particles
+        self.pools = {kind: ParticlePool(kind, PARTICLE_POOL_CAPACITY.get(kind, PARTICLE_POOL_CAPACITY['default']))
+                      for kind in PARTICLE_KINDS}
+
+    @property
+    def count(self):
+        """Number of live particles across all pools"""
+        return sum(pool.count for pool in self.pools.values())
+
+    def pool(self, kind):
+        """Get the pool for a particle kind"""
+        return self.pools[kind]
+
+    def emit(self, kind, current_time, n, color=(255, 255, 255), lifetime=math.inf, **fields):
+        """Spawn up to n particles; fields are scalars or arrays of length n
+
+        Emission is truncated when the pool or the global budget is full.
+        Returns the number of particles actually spawned.
+        """
+        pool = self.pools[kind]
+        n = min(n, pool.capacity - pool.count, self.max_particles - self.count)
+        if n <= 0:
+            return 0
+        fields['spawn_time'] = current_time
+        fields['lifetime'] = lifetime
+        for name in PARTICLE_FIELDS:
+            fields.setdefault(name, 0.0)
+        pool.add(n, fields, np.asarray(color, dtype=np.uint8))
+        return n
+
+    def update(self, current_time, delta_time):
+        """Advance every pool"""
+        for pool in self.pools.values():
+            pool.update(current_time, delta_time)
+
+    def clear(self, kind):
+        """Remove all particles of one kind"""
+        self.pools[kind].clear()
+
+    def bounds(self, kinds, margin=0):
+        """Rectangle covering every live particle of the given kinds (or None)"""
+        rects = []
+        for kind in kinds:
+            pool = self.pools[kind]
+            n = pool.count
+            if n:
+                pad = margin + int(pool.size[:n].max())
+                left, top = int(pool.x[:n].min()) - pad, int(pool.y[:n].min()) - pad
+                right, bottom = int(pool.x[:n].max()) + pad, int(pool.y[:n].max()) + pad
+                rects.append(pygame.Rect(left, top, right - left + 1, bottom - top + 1))
+        return rects[0].unionall(rects[1:]) if rects else None
+
+    def draw(self, screen, kinds, current_time, font=None):
+        """Draw the given particle kinds (font is needed for coin popups)"""
+        for kind in kinds:
+            pool = self.pools[kind]
+            if pool.count:
+                _DRAW_STYLES[pool.spec['style']](screen, pool, current_time, font)
+
+
+def _fade(pool, current_time):
+    """Remaining-life fraction (1 → 0) of every live particle"""
+    n = pool.count
+    return np.maximum(0.0, 1.0 - (current_time - pool.spawn_time[:n]) / pool.lifetime[:n])
+
+
+def _visible(pool, sizes):
+    """(x, y, size, color) tuples for particles that are still visible"""
+    n = pool.count
+    visible = sizes > 0
+    return zip(pool.x[:n][visible].astype(int).tolist(),
+               pool.y[:n][visible].astype(int).tolist(),
+               sizes[visible].tolist(),
+               map(tuple, pool.color[:n][visible].tolist()))
+
+
+def _draw_circles(screen, pool, current_time, font):
+    sizes = (pool.size[:pool.count] * _fade(pool, current_time)).astype(int)
+    for x, y, size, color in _visible(pool, sizes):
+        pygame.draw.circle(screen, color, (x, y), size)
+
+
+def _draw_outlined(screen, pool, current_time, font):
+    sizes = (pool.size[:pool.count] * _fade(pool, current_time)).astype(int)
+    for x, y, size, color in _visible(pool, sizes):
+        pygame.draw.circle(screen, color, (x, y), size)
+        pygame.draw.circle(screen, BLACK, (x, y), size, 1)
+
+
+def _draw_sparkles(screen, pool, current_time, font):
+    sizes = (pool.size[:pool.count] * _fade(pool, current_time)).astype(int)
+    for x, y, size, color in _visible(pool, sizes):
+        pygame.draw.circle(screen, color, (x, y), size)
+        # Add cross for star effect
+        if size > 2:
+            pygame.draw.line(screen, color, (x - size, y), (x + size, y), 2)
+            pygame.draw.line(screen, color, (x, y - size), (x, y + size), 2)
+
+
+def _draw_coins(screen, pool, current_time, font):
+    n = pool.count
+    alpha = _fade(pool, current_time)
+    coin_atlas = get_glyph_atlas(font, YELLOW)
+    shadow_atlas = get_glyph_atlas(font, BLACK)
+    for x, y, amount in zip(pool.x[:n][alpha > 0].astype(int).tolist(),
+                            pool.y[:n][alpha > 0].astype(int).tolist(),
+                            pool.value[:n][alpha > 0].astype(int).tolist()):
+        # Shadow
+        shadow_atlas.draw(screen, f"+{amount}", (x + 22, y - 42))
+        # Main text
+        coin_atlas.draw(screen, f"+{amount}", (x + 20, y - 44))
+
+
+def _draw_rain(screen, pool, current_time, font):
+    n = pool.count
+    for x, y in zip(pool.x[:n].tolist(), pool.y[:n].tolist()):
+        # Main rain drop
+        pygame.draw.line(screen, WATER_BLUE, (x, y), (x - 2, y + 10), 2)
+        # Lighter drops for depth
+        if random.random() > 0.7:
+            pygame.draw.line(screen, (100, 200, 255), (x + 1, y), (x - 1, y + 8), 1)
+
+
+def _draw_smoke(screen, pool, current_time, font):
+    n = pool.count
+    age = current_time - pool.spawn_time[:n]
+    alpha = _fade(pool, current_time)
+    shades = (200 * alpha).astype(int)
+    sizes = (3 + age * 2).astype(int)
+    visible = alpha > 0
+    for x, y, size, shade in zip(pool.x[:n][visible].astype(int).tolist(),
+                                 pool.y[:n][visible].astype(int).tolist(),
+                                 sizes[visible].tolist(), shades[visible].tolist()):
+        # Draw smoke puff (light gray circle)
+        pygame.draw.circle(screen, (shade, shade, shade), (x, y), size)
+
+
+def _draw_dots(screen, pool, current_time, font):
+    n = pool.count
+    for x, y in zip(pool.x[:n].astype(int).tolist(), pool.y[:n].astype(int).tolist()):
+        pygame.draw.circle(screen, WATER_BLUE, (x, y), 2)
+
+
+_DRAW_STYLES = {
+    'circle': _draw_circles,
+    'outlined': _draw_outlined,
+    'sparkle': _draw_sparkles,
+    'coin': _draw_coins,
+    'rain': _draw_rain,
+    'smoke': _draw_smoke,
+    'dot': _draw_dots
+}
+
+
+class NullParticleSystem(ParticleSystem):
+    """Particle backend for headless gardens: nothing is ever spawned"""
+
+    def __init__(self):
+        super().__init__(max_particles=0)
+
+    def emit(self, kind, current_time, n, color=(255, 255, 255), lifetime=math.inf, **fields):
+        return 0
+
+    def update(self, current_time, delta_time):
+        pass
@@ -0,0 +1,41 @@
+"""
+Grid index for plot hit-testing
+
+Plots sit on a regular grid, so a screen position maps to its plot with
+two divisions instead of testing every plot rect.
+"""
+from config import (
+    GARDEN_START_X, GARDEN_START_Y, GARDEN_SPACING_X, GARDEN_SPACING_Y, PLOT_SIZE
+)
+
+
+class PlotGrid:
+    """Maps screen coordinates to the plot under them in constant time"""
+
+    def __init__(self, rows, cols, origin_x=GARDEN_START_X, origin_y=GARDEN_START_Y,
+                 spacing_x=GARDEN_SPACING_X, spacing_y=GARDEN_SPACING_Y, plot_size=PLOT_SIZE):
+        self.rows = rows
+        self.cols = cols
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.spacing_x = spacing_x
+        self.spacing_y = spacing_y
+        self.plot_size = plot_size
+        self.cells = [None] * (rows * cols)  # Row-major
+
+    def position(self, row, col):
+        """Top-left screen position of a grid cell"""
+        return self.origin_x + col * self.spacing_x, self.origin_y + row * self.spacing_y
+
+    def place(self, row, col, plot):
+        """Register the plot occupying a grid cell"""
+        self.cells[row * self.cols + col] = plot
+
+    def at(self, pos):
+        """Plot under a screen position, or None (gaps between plots miss)"""
+        col, offset_x = divmod(pos[0] - self.origin_x, self.spacing_x)
+        row, offset_y = divmod(pos[1] - self.origin_y, self.spacing_y)
+        if (0 <= col < self.cols and 0 <= row < self.rows
+                and offset_x < self.plot_size and offset_y < self.plot_size):
+            return self.cells[row * self.cols + col]
+        return None
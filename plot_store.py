@@ -0,0 +1,455 @@
+"""
+Plot store - struct-of-arrays state for all garden plots
+
+Every plot lives in a slot of parallel NumPy arrays so bulk changes run
+as vectorized passes instead of one Python call per plot.
+
+Moisture is evaluated lazily: each plot stores its moisture at a
+timestamp, and all plots share the rate of the current weather, so the
+current value is a closed-form expression computed on read. Rates are
+re-based when the weather changes, and a plot's value when it is watered
+or planted. Plots drying out or crossing the sprinkler threshold are
+found by sweep events scheduled for the moment it happens, so idle plots
+cost nothing per tick. Regrowth and weed growth are deadlines registered
+with the Scheduler as well.
+
+The store also keeps live indexes of plots by state (living, ripe, weedy,
+thirsty), updated whenever a plot's state changes, so consumers like the
+sprinkler, snail spawns and weed pickers only touch the matching plots.
+"""
+import numpy as np
+from scheduler import Scheduler
+from game_clock import TickClock
+from particles import NullParticleSystem
+from index_set import IndexSet
+from weed_queue import WeedQueue
+from config import (
+    VEGETABLE_CREDITS,
+    MIN_REGROW_TIME, MAX_REGROW_TIME,
+    BASE_MOISTURE_LOSS_RATE, MOISTURE_LOSS_SUNNY, MOISTURE_LOSS_RAINY, MOISTURE_LOSS_CLOUDY,
+    RAIN_MOISTURE_GAIN,
+    WEED_CHECK_INTERVAL, WEED_SPAWN_CHANCE, WEED_GROWTH_TIME, MAX_WEED_LEVEL,
+    SPRINKLER_THRESHOLD, SPRINKLER_INTERVAL
+)
+
+# Crop types are stored as small integer codes
+CROP_TYPES = tuple(VEGETABLE_CREDITS)
+CROP_CODES = {crop: code for code, crop in enumerate(CROP_TYPES)}
+
+MOISTURE_LOSS_FACTORS = {
+    'sunny': MOISTURE_LOSS_SUNNY,
+    'rainy': MOISTURE_LOSS_RAINY,
+    'cloudy': MOISTURE_LOSS_CLOUDY
+}
+
+# Lowest moisture a living plot drops to while the sprinkler runs: it is
+# topped up below the threshold at least once per interval of sunshine
+SPRINKLER_FLOOR = SPRINKLER_THRESHOLD - BASE_MOISTURE_LOSS_RATE * MOISTURE_LOSS_SUNNY * SPRINKLER_INTERVAL
+
+
+def moisture_rate(weather):
+    """Net moisture change per second in a weather (clamping aside)"""
+    gain = RAIN_MOISTURE_GAIN if weather == 'rainy' else 0.0
+    return gain - BASE_MOISTURE_LOSS_RATE * MOISTURE_LOSS_FACTORS.get(weather, 1.0)
+
+
+def _compose_moisture(changes, floor):
+    """Compose per-segment moisture maps m -> clamp(m + change, floor, 1)
+
+    The composition of such maps is again of the form
+    m -> clamp(m + total, low, high), so a whole weather timeline reduces
+    to three numbers per segment boundary. Returns the arrays
+    (total, low, high) after each segment.
+    """
+    total = np.cumsum(changes)
+    low = np.empty(len(changes))
+    high = np.empty(len(changes))
+    lo, hi = 0.0, 1.0
+    for k, change in enumerate(changes.tolist()):
+        lo = min(max(lo + change, floor), 1.0)
+        hi = min(max(hi + change, floor), 1.0)
+        low[k] = lo
+        high[k] = hi
+    return total, low, high
+
+# Per-plot fields and their dtypes
+PLOT_FIELDS = {
+    'x': np.int32,
+    'y': np.int32,
+    'crop': np.int8,
+    'soil_moisture': np.float64,   # Moisture at last_moisture_update
+    'soil_fertility': np.float64,
+    'weed_level': np.int16,
+    'weed_start_time': np.float64,  # NaN while the plot has no weeds
+    'regrow_time': np.float64,
+    'grown': np.bool_,
+    'plant_dead': np.bool_,
+    'harvest_count': np.int32,
+    'last_moisture_update': np.float64
+}
+
+# One packed little-endian record per plot, used for save games
+PLOT_RECORD = np.dtype([(name, np.dtype(dtype).newbyteorder('<')) for name, dtype in PLOT_FIELDS.items()])
+
+
+class PlotStore:
+    """Parallel arrays holding the state of every plot"""
+
+    def __init__(self, capacity=16, scheduler=None, clock=None):
+        self.scheduler = scheduler if scheduler is not None else Scheduler()
+        self.clock = clock if clock is not None else TickClock()
+        self.count = 0
+        self.capacity = max(1, capacity)
+        for name, dtype in PLOT_FIELDS.items():
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+
+        # Moisture change per second of every plot; no change until a weather is set
+        self.rate = 0.0
+        # Time of each plot's pending sweep (inf when none is due)
+        self.sweep_time = np.full(self.capacity, np.inf)
+
+        # Particle engine the plot views emit their effects into
+        self.particles = NullParticleSystem()
+
+        # Live state indexes, refreshed for every plot whose state changes
+        self.living = IndexSet(self.capacity)   # Not dead
+        self.ripe = IndexSet(self.capacity)     # Grown and not dead
+        self.weedy = IndexSet(self.capacity)    # weed_level > 0
+        self.thirsty = IndexSet(self.capacity)  # Living with moisture below the sprinkler threshold
+
+        # Weed picker claims on weedy plots
+        self.weed_queue = WeedQueue(self)
+
+    def _ensure_capacity(self, needed):
+        """Grow all arrays (amortized doubling) to hold at least `needed` plots"""
+        if needed <= self.capacity:
+            return
+        new_capacity = max(needed, self.capacity * 2)
+        for name, dtype in PLOT_FIELDS.items():
+            new_array = np.zeros(new_capacity, dtype=dtype)
+            new_array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, new_array)
+        sweep_time = np.full(new_capacity, np.inf)
+        sweep_time[:self.count] = self.sweep_time[:self.count]
+        self.sweep_time = sweep_time
+        self.capacity = new_capacity
+        for index_set in (self.living, self.ripe, self.weedy, self.thirsty):
+            index_set._ensure_capacity(new_capacity)
+
+    def add_plot(self, x, y, veg_type, current_time):
+        """Append a single plot and return its index"""
+        return self.add_plots([x], [y], [veg_type], current_time)[0]
+
+    def add_plots(self, xs, ys, veg_types, current_time):
+        """Append many plots at once and return their index range
+
+        New plots start grown with full soil, like a fresh Vegetable.
+        """
+        n = len(xs)
+        start = self.count
+        self._ensure_capacity(start + n)
+        end = start + n
+        self.count = end
+
+        self.x[start:end] = xs
+        self.y[start:end] = ys
+        self.crop[start:end] = [CROP_CODES[t] for t in veg_types]
+        self.soil_moisture[start:end] = 1.0
+        self.soil_fertility[start:end] = 1.0
+        self.weed_level[start:end] = 0
+        self.weed_start_time[start:end] = np.nan
+        self.regrow_time[start:end] = current_time + np.random.uniform(MIN_REGROW_TIME, MAX_REGROW_TIME, n)
+        self.grown[start:end] = True
+        self.plant_dead[start:end] = False
+        self.harvest_count[start:end] = 0
+        self.last_moisture_update[start:end] = current_time
+        self.refresh_states(np.arange(start, end))
+        return range(start, end)
+
+    def refresh_states(self, indices=None):
+        """Re-derive the state indexes of some plots (all plots by default)
+
+        Also plans the next sweep of each of them.
+        """
+        if indices is None:
+            indices = np.arange(self.count)
+        indices = np.atleast_1d(indices)
+        living = ~self.plant_dead[indices]
+        self.living.update(indices, living)
+        self.ripe.update(indices, living & self.grown[indices])
+        self.thirsty.update(indices, living & (self.moisture(indices) < SPRINKLER_THRESHOLD))
+        weedy = self.weed_level[indices] > 0
+        self.weedy.update(indices, weedy)
+        self.weed_queue.update(indices, weedy)
+        self._schedule_sweeps(indices)
+
+    def moisture(self, indices=None, current_time=None):
+        """Current moisture of some plots (all plots by default)"""
+        if indices is None:
+            indices = slice(0, self.count)
+        if current_time is None:
+            current_time = self.clock.now
+        elapsed = current_time - self.last_moisture_update[indices]
+        return np.clip(self.soil_moisture[indices] + self.rate * elapsed, 0.0, 1.0)
+
+    def set_moisture(self, indices, values):
+        """Set the moisture of some plots as of now (watering, planting)"""
+        self.soil_moisture[indices] = values
+        self.last_moisture_update[indices] = self.clock.now
+        self.refresh_states(indices)
+
+    def set_weather(self, weather, current_time):
+        """Re-base every plot on the moisture rate of a new weather"""
+        n = self.count
+        self.soil_moisture[:n] = self.moisture(None, current_time)
+        self.last_moisture_update[:n] = current_time
+        self.rate = moisture_rate(weather)
+        self._schedule_sweeps(np.arange(n))
+
+    def _schedule_sweeps(self, indices):
+        """Plan a sweep for each plot at its next moisture crossing
+
+        Under the current rate a living plot next crosses the sprinkler
+        threshold (either way) or dries out; a plot whose thirsty index
+        entry is out of date is swept right away. The sweep runs on the
+        first tick at or after that moment; plots due on the same tick
+        share one event.
+        """
+        rate = self.rate
+        moisture = self.moisture(indices)
+        thirsty = self.thirsty.contains(indices)
+        if rate < 0:
+            crossing = np.where(thirsty, moisture, moisture - SPRINKLER_THRESHOLD) / -rate
+        elif rate > 0:
+            crossing = np.where(thirsty, (SPRINKLER_THRESHOLD - moisture) / rate, np.inf)
+        else:
+            crossing = np.full(len(indices), np.inf)
+        crossing[thirsty != (moisture < SPRINKLER_THRESHOLD)] = 0.0
+        crossing[self.soil_fertility[indices] <= 0] = 0.0
+        crossing[self.plant_dead[indices]] = np.inf
+
+        # Always a later tick, so a sweep never re-plans itself for the same tick
+        clock = self.clock
+        ticks = np.maximum(np.ceil((clock.now + crossing) / clock.step), clock.ticks + 1)
+        when = ticks * clock.step
+
+        changed = when != self.sweep_time[indices]
+        indices, when = indices[changed], when[changed]
+        self.sweep_time[indices] = when
+        planned = np.isfinite(when)
+        indices, when = indices[planned], when[planned]
+        if len(indices) == 0:
+            return
+        order = np.argsort(when, kind='stable')
+        indices, when = indices[order], when[order]
+        times, starts = np.unique(when, return_index=True)
+        for when, batch in zip(times.tolist(), np.split(indices, starts[1:])):
+            self.scheduler.schedule(when, self._sweep, when, batch)
+
+    def _sweep(self, current_time, when, indices):
+        """Moisture crossings are due: plots that dried out die, the rest change index
+
+        Plots re-planned since the sweep was scheduled drop out of it.
+        """
+        due = indices[self.sweep_time[indices] == when]
+        if len(due) == 0:
+            return
+        self.sweep_time[due] = np.inf
+        dead = (self.moisture(due, current_time) <= 0) | (self.soil_fertility[due] <= 0)
+        dying = due[dead]
+        self.plant_dead[dying] = True
+        self.grown[dying] = False
+        self.refresh_states(due)
+
+    def to_records(self):
+        """Every plot as a PLOT_RECORD array"""
+        records = np.empty(self.count, dtype=PLOT_RECORD)
+        for name in PLOT_FIELDS:
+            records[name] = getattr(self, name)[:self.count]
+        return records
+
+    def restore(self, records):
+        """Overwrite the plots with saved PLOT_RECORDs and re-register their timers
+
+        The store must already hold as many plots as there are records.
+        """
+        n = len(records)
+        if n != self.count:
+            raise ValueError(f"{n} saved plots, but the garden has {self.count}")
+        for name in PLOT_FIELDS:
+            getattr(self, name)[:n] = records[name]
+
+        # Regrowth of growing plots
+        for index in np.flatnonzero(~self.grown[:n] & ~self.plant_dead[:n]).tolist():
+            self.scheduler.schedule(self.regrow_time[index], self._regrow, index)
+
+        self._schedule_weed_growth()
+        self.refresh_states()
+
+    def _schedule_weed_growth(self):
+        """Register the next weed growth of every growing plot, one batch per deadline"""
+        level = self.weed_level[:self.count]
+        growing = np.flatnonzero((level > 0) & (level < MAX_WEED_LEVEL))
+        starts = self.weed_start_time[growing]
+        for start in np.unique(starts).tolist():
+            self.scheduler.schedule(start + WEED_GROWTH_TIME, self._grow_weeds, growing[starts == start])
+
+    def catch_up(self, segments, sprinkler_from=None):
+        """Advance every plot over a weather timeline in closed form
+
+        `segments` is a list of (start, end, weather) covering the time
+        since the last update. Moisture follows the same per-weather rates
+        as moisture(), and plots whose moisture runs out die at the exact
+        moment it happens. From `sprinkler_from` on (the next sprinkler
+        round, None without sprinkler) living plots are kept above
+        SPRINKLER_FLOOR instead. Weeds spawn and grow following the weed
+        checks' odds and growth time, and plots whose regrow time passed
+        are grown. The cost depends on the number of plots and segments,
+        not on the length of the timeline.
+
+        Returns the indices of the plots that dried out and their times of death.
+        """
+        n = self.count
+        if n == 0 or not segments:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        begin, end_time = segments[0][0], segments[-1][1]
+        moisture = self.soil_moisture[:n]
+        moisture[:] = self.moisture(None, begin)
+        self.last_moisture_update[:n] = begin
+
+        # Deaths, as long as no sprinkler protects the plots
+        unprotected = segments
+        if sprinkler_from is not None:
+            unprotected = [(start, min(end, sprinkler_from), weather)
+                           for start, end, weather in segments if start < sprinkler_from]
+        dying, death_time = self._dry_out(unprotected)
+
+        # Final moisture
+        changes = np.array([moisture_rate(weather) * (end - start) for start, end, weather in segments])
+        total, low, high = _compose_moisture(changes, 0.0)
+        final = np.clip(moisture + total[-1], low[-1], high[-1])
+        if sprinkler_from is not None:
+            living = ~self.plant_dead[:n]
+            total, low, high = _compose_moisture(changes, SPRINKLER_FLOOR)
+            final[living] = np.clip(moisture[living] + total[-1], low[-1], high[-1])
+        moisture[:] = final
+        self.last_moisture_update[:n] = end_time
+        self.rate = moisture_rate(segments[-1][2])
+
+        # Regrowth that completed (dead plots stay unripe)
+        self.grown[:n] |= ~self.plant_dead[:n] & (self.regrow_time[:n] <= end_time)
+
+        self._catch_up_weeds(begin, end_time)
+        self.refresh_states()
+        return dying, death_time
+
+    def _dry_out(self, segments):
+        """Kill the living plots whose moisture runs out during the segments
+
+        Returns the indices of those plots and their times of death.
+        """
+        n = self.count
+        candidates = np.flatnonzero(~self.plant_dead[:n])
+        if not segments or len(candidates) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        starts = np.array([start for start, _, _ in segments])
+        rates = np.array([moisture_rate(weather) for _, _, weather in segments])
+        changes = rates * (np.array([end for _, end, _ in segments]) - starts)
+        total, low, high = _compose_moisture(changes, 0.0)
+
+        # After segment k a plot starting at m is dry iff m <= threshold[k];
+        # the first such segment is found with a running maximum
+        threshold = np.where(high <= 0, np.inf, np.where(low <= 0, -total, -np.inf))
+        reach = np.maximum.accumulate(threshold)
+        moisture = self.soil_moisture[candidates]
+        first = np.searchsorted(reach, moisture, side='left')
+        dies = first < len(segments)
+        dying, segment = candidates[dies], first[dies]
+
+        # Moisture at the start of the fatal segment, then linear decline to zero
+        before = moisture[dies]
+        later = segment > 0
+        k = segment[later] - 1
+        before[later] = np.clip(before[later] + total[k], low[k], high[k])
+        death_time = starts[segment] + before / -rates[segment]
+
+        self.plant_dead[dying] = True
+        self.grown[dying] = False
+        return dying, death_time
+
+    def _catch_up_weeds(self, begin, end_time):
+        """Spawn and grow weeds over [begin, end_time] like the periodic checks would"""
+        n = self.count
+        level = self.weed_level[:n]
+        start = self.weed_start_time[:n]
+
+        # Weed-free plots: checks every WEED_CHECK_INTERVAL until one succeeds
+        clean = np.flatnonzero(level == 0)
+        checks = np.random.geometric(WEED_SPAWN_CHANCE, len(clean))
+        spawn_time = begin + checks * WEED_CHECK_INTERVAL
+        spawned = spawn_time <= end_time
+        level[clean[spawned]] = 1
+        start[clean[spawned]] = spawn_time[spawned]
+
+        # Whole growth steps since each plot's last level-up
+        weedy = np.flatnonzero((level > 0) & (level < MAX_WEED_LEVEL))
+        steps = np.floor((end_time - start[weedy]) / WEED_GROWTH_TIME).astype(np.int64)
+        steps = np.minimum(np.maximum(steps, 0), MAX_WEED_LEVEL - level[weedy])
+        level[weedy] += steps.astype(level.dtype)
+        start[weedy] += steps * WEED_GROWTH_TIME
+        self._schedule_weed_growth()
+
+    def set_regrow_time(self, index, when):
+        """Set a plot's regrow deadline and schedule the regrowth"""
+        self.regrow_time[index] = when
+        self.scheduler.schedule(when, self._regrow, index)
+
+    def _regrow(self, current_time, index):
+        """Regrowth deadline reached (stale if the deadline moved since)"""
+        if (not self.grown[index] and not self.plant_dead[index]
+                and current_time >= self.regrow_time[index]):
+            self.grown[index] = True
+            self.refresh_states(index)
+
+    def set_weed_level(self, index, level):
+        """Set one plot's weed level and keep the weedy index in sync"""
+        previous = self.weed_level[index]
+        self.weed_level[index] = level
+        # Plots without weeds or at the top level have no growth pending; re-arm it
+        if not 0 < previous < MAX_WEED_LEVEL and 0 < level < MAX_WEED_LEVEL:
+            now = self.clock.now
+            self.weed_start_time[index] = now
+            self.scheduler.schedule(now + WEED_GROWTH_TIME, self._grow_weeds, np.array([index]))
+        self.refresh_states(index)
+
+    def start_weed_checks(self, current_time):
+        """Begin the recurring weed spawn check over all plots"""
+        self.scheduler.schedule(current_time + WEED_CHECK_INTERVAL, self._check_weeds)
+
+    def _check_weeds(self, current_time):
+        """Spawn weeds on weed-free plots, then schedule their growth"""
+        n = self.count
+        rolls = np.random.random(n) < WEED_SPAWN_CHANCE
+        spawn = np.flatnonzero(rolls & (self.weed_level[:n] == 0))
+        if len(spawn):
+            self.weed_level[spawn] = 1
+            self.weed_start_time[spawn] = current_time
+            self.refresh_states(spawn)
+            self.scheduler.schedule(current_time + WEED_GROWTH_TIME, self._grow_weeds, spawn)
+        self.scheduler.schedule(current_time + WEED_CHECK_INTERVAL, self._check_weeds)
+
+    def _grow_weeds(self, current_time, indices):
+        """Grow one weed level on a batch of plots whose growth time is up
+
+        Plots that were weeded (or re-seeded with weeds at another time)
+        since the batch was scheduled drop out of the batch.
+        """
+        level = self.weed_level[indices]
+        growing = indices[(level > 0) & (level < MAX_WEED_LEVEL) &
+                          (current_time - self.weed_start_time[indices] >= WEED_GROWTH_TIME)]
+        if len(growing):
+            self.weed_level[growing] += 1
+            self.weed_start_time[growing] = current_time
+            still_growing = growing[self.weed_level[growing] < MAX_WEED_LEVEL]
+            if len(still_growing):
+                self.scheduler.schedule(current_time + WEED_GROWTH_TIME, self._grow_weeds, still_growing)
@@ -0,0 +1,168 @@
+"""
+Frame profiler - opt-in phase timings, overlay and Chrome trace export
+
+Garden.update and Garden.draw open a section with begin() and call
+lap(name) after each of their phases; the main loop calls begin_frame()
+once per frame. While the profiler is disabled each call is a single
+attribute check. Enabled, lap() records the time since the previous lap
+as one phase of the current frame, and the last PROFILER_FRAMES frames
+are kept: the overlay shows the rolling milliseconds per phase and a
+frame-time histogram, and dump_trace() writes the frames in Chrome's
+trace-event format (load it in chrome://tracing or ui.perfetto.dev).
+"""
+import json
+import time
+from collections import deque
+import pygame
+from fonts import get_font, render_text, get_glyph_atlas
+from config import (
+    FPS, WHITE, YELLOW, RED, PROFILER_FRAMES, PROFILER_AVERAGE_FRAMES,
+    PROFILER_BUCKET_MS, PROFILER_BUCKETS, PROFILER_OVERLAY_ROWS
+)
+
+OVERLAY_X = 10
+OVERLAY_Y = 80
+OVERLAY_WIDTH = 280
+ROW_HEIGHT = 14
+HISTOGRAM_HEIGHT = 40
+FONT_SIZE = 16
+
+
+class FrameProfiler:
+    """Per-phase timings of the last frames, recorded only while enabled
+
+    A frame is (start, duration, events) with events as (name, start,
+    duration) in perf_counter seconds. Section events enclose the phases
+    lapped inside them, so the trace shows them nested.
+    """
+
+    def __init__(self, max_frames=PROFILER_FRAMES):
+        self.enabled = False
+        self.frames = deque(maxlen=max_frames)
+        self.frame_start = None
+        self.events = []
+        self.section = 'frame'
+        self.section_start = None
+        self.last = None
+        self.panel = None  # Translucent overlay background, made on first draw
+
+    def toggle(self):
+        """Switch recording and the overlay on or off"""
+        self.enabled = not self.enabled
+        if self.enabled:
+            # Time spent disabled is not a frame
+            self.frame_start = None
+            self.begin_frame()
+
+    def begin_frame(self):
+        """Close the running frame (its duration includes the frame cap's wait) and open the next"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.frames.append((self.frame_start, now - self.frame_start, self.events))
+        self.frame_start = now
+        self.events = []
+        self.section = 'frame'
+        self.last = now
+
+    def begin(self, section):
+        """Start a section (update, draw); its phases are named section.phase"""
+        if not self.enabled:
+            return
+        self.section = section
+        self.section_start = self.last = time.perf_counter()
+
+    def lap(self, phase):
+        """End the phase that ran since the previous lap"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.events.append((f"{self.section}.{phase}", self.last, now - self.last))
+        self.last = now
+
+    def end(self):
+        """Close the current section; laps go to the frame again"""
+        if not self.enabled or self.section_start is None:
+            return
+        now = time.perf_counter()
+        self.events.append((self.section, self.section_start, now - self.section_start))
+        self.section = 'frame'
+        self.section_start = None
+        self.last = now
+
+    def phase_means(self, frames=PROFILER_AVERAGE_FRAMES):
+        """Mean milliseconds per frame of every phase over the last frames, slowest first"""
+        recent = list(self.frames)[-frames:]
+        totals = {}
+        for _, _, events in recent:
+            for name, _, duration in events:
+                if '.' in name:
+                    totals[name] = totals.get(name, 0.0) + duration
+        means = {name: total * 1000 / len(recent) for name, total in totals.items()}
+        return sorted(means.items(), key=lambda item: item[1], reverse=True)
+
+    def histogram(self, bucket_ms=PROFILER_BUCKET_MS, buckets=PROFILER_BUCKETS):
+        """Frame counts per frame-time bucket; the last bucket also holds slower frames"""
+        counts = [0] * buckets
+        for _, duration, _ in self.frames:
+            counts[min(int(duration * 1000 / bucket_ms), buckets - 1)] += 1
+        return counts
+
+    def dump_trace(self, path, frames=None):
+        """Write the last `frames` frames (all kept ones by default) as Chrome trace events"""
+        recent = list(self.frames)
+        if frames is not None:
+            recent = recent[-frames:]
+        events = []
+        for start, duration, phases in recent:
+            events.append(_trace_event('frame', start, duration))
+            events.extend(_trace_event(name, event_start, event_duration)
+                          for name, event_start, event_duration in phases)
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(recent)
+
+    def draw(self, screen):
+        """Draw the overlay and return its rect"""
+        font = get_font(FONT_SIZE)
+        means = self.phase_means()[:PROFILER_OVERLAY_ROWS]
+        counts = self.histogram()
+        height = ROW_HEIGHT * (len(means) + 2) + HISTOGRAM_HEIGHT + 10
+        if self.panel is None or self.panel.get_height() != height:
+            self.panel = pygame.Surface((OVERLAY_WIDTH, height), pygame.SRCALPHA)
+            self.panel.fill((0, 0, 0, 170))
+        rect = screen.blit(self.panel, (OVERLAY_X, OVERLAY_Y))
+
+        # Mean frame time over the averaged frames
+        recent = list(self.frames)[-PROFILER_AVERAGE_FRAMES:]
+        frame_ms = sum(duration for _, duration, _ in recent) * 1000 / len(recent) if recent else 0.0
+        numbers = get_glyph_atlas(font, WHITE)
+        x = OVERLAY_X + 5
+        y = OVERLAY_Y + 3
+        screen.blit(render_text(font, "frame ms", WHITE), (x, y))
+        numbers.draw(screen, f"{frame_ms:6.2f}", (x + 190, y))
+
+        # Slowest phases
+        for name, ms in means:
+            y += ROW_HEIGHT
+            screen.blit(render_text(font, name, WHITE), (x, y))
+            numbers.draw(screen, f"{ms:6.2f}", (x + 190, y))
+
+        # Frame-time histogram; bars past the frame budget are red
+        y += ROW_HEIGHT + 5
+        bar_width = (OVERLAY_WIDTH - 10) // len(counts)
+        tallest = max(counts) or 1
+        budget = 1000 / FPS
+        for bucket, count in enumerate(counts):
+            bar_height = round(HISTOGRAM_HEIGHT * count / tallest)
+            color = RED if bucket * PROFILER_BUCKET_MS >= budget else YELLOW
+            pygame.draw.rect(screen, color, (x + bucket * bar_width, y + HISTOGRAM_HEIGHT - bar_height,
+                                             bar_width - 1, bar_height))
+        return rect
+
+
+def _trace_event(name, start, duration):
+    """A complete ('X') trace event; times in microseconds"""
+    return {'name': name, 'cat': name.split('.')[0], 'ph': 'X', 'pid': 1, 'tid': 1,
+            'ts': round(start * 1e6, 1), 'dur': round(duration * 1e6, 1)}
@@ -2,50 +2,43 @@
 Rain Barrel - Visual representation of the water collection system
 """
 import pygame
-import math
-import time
+import random
 
 
 class RainBarrel:
     """A decorative rain barrel that collects water during rain"""
 
-    def __init__(self, x, y):
+    def __init__(self, x, y, particles, current_time):
         self.x = x
         self.y = y
         self.width = 30
         self.height = 40
+        self.water_height = 25  # Assume always has some water
 
         # Animation for water drops during rain
-        self.water_drops = []
-        self.last_drop_spawn = time.time()
+        self.particles = particles
+        self.last_drop_spawn = current_time
         self.drop_spawn_interval = 0.2  # Drop every 0.2 seconds when raining
 
-    def update(self, weather='sunny'):
+    def update(self, current_time, weather='sunny'):
         """Update rain barrel animations"""
-        current_time = time.time()
 
         # Spawn water drops during rain
         if weather == 'rainy':
             if current_time - self.last_drop_spawn > self.drop_spawn_interval:
-                self.water_drops.append({
-                    'x': self.x + self.width // 2 + random.randint(-5, 5),
-                    'y': self.y - 10,
-                    'velocity': random.randint(80, 120),
-                    'spawn_time': current_time,
-                    'lifetime': 1.0
-                })
+                self.particles.emit('drop', current_time, 1, lifetime=1.0,
+                                    x=self.x + self.width // 2 + random.randint(-5, 5),
+                                    y=self.y - 10,
+                                    vy=random.randint(80, 120))
                 self.last_drop_spawn = current_time
 
-        # Update water drops
-        for drop in self.water_drops[:]:
-            elapsed = current_time - drop['spawn_time']
-            if elapsed > drop['lifetime']:
-                self.water_drops.remove(drop)
-            else:
-                drop['y'] += drop['velocity'] * (1/60.0)
-
-    def draw(self, screen):
+    def draw(self, screen, current_time):
         """Draw the rain barrel"""
+        self.draw_barrel(screen)
+        self.draw_drops(screen, current_time)
+
+    def draw_barrel(self, screen):
+        """Draw the static barrel body (cached by the renderer)"""
         x, y = self.x, self.y
 
         # Draw barrel body (brown cylinder)
@@ -64,26 +57,31 @@ class RainBarrel:
         pygame.draw.ellipse(screen, (80, 80, 80), lid_rect, 2)
 
         # Draw water level indicator (blue rectangle inside)
-        water_height = 25  # Assume always has some water
+        water_height = self.water_height
         water_rect = pygame.Rect(x + 3, y + self.height - water_height, self.width - 6, water_height)
         pygame.draw.rect(screen, (0, 150, 200), water_rect)
 
+    def draw_drops(self, screen, current_time):
+        """Draw water drops falling into the barrel and their splashes"""
+        y = self.y
+        water_height = self.water_height
+
         # Draw water drops falling into barrel
-        for drop in self.water_drops:
-            if drop['y'] < y + self.height:
-                pygame.draw.circle(screen, (0, 191, 255),
-                                 (int(drop['x']), int(drop['y'])), 2)
+        drops = self.particles.pool('drop')
+        n = drops.count
+        drop_xs = drops.x[:n].astype(int).tolist()
+        drop_ys = drops.y[:n].tolist()
+        for drop_x, drop_y in zip(drop_xs, drop_ys):
+            if drop_y < y + self.height:
+                pygame.draw.circle(screen, (0, 191, 255), (drop_x, int(drop_y)), 2)
 
         # Draw splash effect when drops hit water
-        for drop in self.water_drops:
-            if y + self.height - 5 < drop['y'] < y + self.height + 5:
+        ages = (current_time - drops.spawn_time[:n]).tolist()
+        for drop_x, drop_y, elapsed in zip(drop_xs, drop_ys, ages):
+            if y + self.height - 5 < drop_y < y + self.height + 5:
                 # Small splash ripple
-                elapsed = time.time() - drop['spawn_time']
                 ripple_radius = int(3 + elapsed * 10)
                 if ripple_radius < 8:
                     pygame.draw.circle(screen, (0, 191, 255),
-                                     (int(drop['x']), y + self.height - water_height),
+                                     (drop_x, y + self.height - water_height),
                                      ripple_radius, 1)
-
-
-import random
@@ -0,0 +1,75 @@
+"""
+Layered renderer with dirty-rect display updates
+
+Each frame starts from a cached static layer (background, title, buttons,
+inventory, building bodies) that is only re-rendered when its cache key
+changes, e.g. on a weather or ownership change. The dynamic layer is drawn
+on top, and only the rectangles it touched this frame or the last one are
+pushed to the display.
+"""
+import pygame
+
+
+class LayeredRenderer:
+    """Caches the static layer and collects the dirty rectangles of a frame"""
+
+    def __init__(self):
+        self.static_surface = None
+        self.static_key = None
+        self.static_renders = 0  # How often the static layer was rebuilt
+        self.dirty = []
+        self.full_redraw = True
+        self.last_rects = []
+
+    def begin_frame(self, screen, key, paint_static):
+        """Restore the static layer, re-rendering it via paint_static(surface) if `key` changed"""
+        size = screen.get_size()
+        if (self.static_surface is None or key != self.static_key
+                or self.static_surface.get_size() != size):
+            surface = pygame.Surface(size, 0, screen)
+            paint_static(surface)
+            self.static_surface = surface
+            self.static_key = key
+            self.static_renders += 1
+            self.full_redraw = True
+
+        screen.blit(self.static_surface, (0, 0))
+        self.dirty = []
+
+    def mark_dirty(self, rect):
+        """Record an area the dynamic layer draws into"""
+        if rect is not None:
+            self.dirty.append(pygame.Rect(rect))
+
+    def mark_full(self):
+        """Push the whole screen this frame (e.g. rain or an open overlay)"""
+        self.full_redraw = True
+
+    def end_frame(self, screen):
+        """Return the rectangles to pass to pygame.display.update()"""
+        screen_rect = screen.get_rect()
+        if self.full_redraw:
+            # Next frame must push everything too, so whatever covered the screen gets erased
+            self.full_redraw = False
+            self.last_rects = [screen_rect]
+            return [screen_rect]
+
+        current = [rect.clip(screen_rect) for rect in self.dirty]
+        current = [rect for rect in current if rect.width and rect.height]
+        # Old positions need repainting too, or moving objects leave trails
+        rects = _merge(current + self.last_rects)
+        self.last_rects = current
+        return rects
+
+
+def _merge(rects):
+    """Union overlapping rectangles so fewer, larger areas are pushed"""
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
@@ -0,0 +1,209 @@
+"""
+Save games - compact binary snapshots of a Garden
+
+Layout (all little-endian):
+    header     magic b'GRDN', format version (u16)
+    garden     clock, wall time of the save, size, credits, weather and timers
+    inventory  item count, then (name length, name, value) per item
+    plots      count, then one packed PLOT_RECORD per plot
+    snails     count, then SNAIL_RECORDs
+    ducks      count, then DUCK_RECORDs
+    pickers    count, then PICKER_RECORDs
+
+Plots are written straight from the plot store's arrays, so saving and
+loading cost a few array copies regardless of the garden size. Saves are
+plain files. In the browser (pygbag) they go to the in-memory virtual
+filesystem, which is not synced to IndexedDB, so a save only lasts until
+the page is closed or reloaded.
+"""
+import os
+import struct
+import time
+import numpy as np
+from garden import Garden
+from game_clock import TickClock
+from snail import Snail
+from duck import Duck
+from weed_picker import WeedPicker
+from plot_store import PLOT_RECORD
+from config import WEATHER_OPTIONS
+
+MAGIC = b'GRDN'
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct('<4sH')
+# step, ticks, saved_at, rows, cols, credits, weather,
+# last_weather_change, weather_duration, last_snail_spawn, last_rain_barrel_collection
+GARDEN_RECORD = struct.Struct('<dqdIIqBdddd')
+COUNT = struct.Struct('<I')
+ITEM_VALUE = struct.Struct('<i')
+
+SNAIL_RECORD = np.dtype([('x', '<f8'), ('y', '<f8'), ('target', '<i4'),
+                         ('eating_start_time', '<f8')])  # NaN while crawling
+DUCK_RECORD = np.dtype([('x', '<f8'), ('y', '<f8'), ('spawn_time', '<f8')])
+PICKER_RECORD = np.dtype([('x', '<f8'), ('y', '<f8'), ('spawn_time', '<f8'), ('weeds_removed', '<i4')])
+
+
+def _pack_records(parts, dtype, rows):
+    """Append a count and a packed record array built from row tuples"""
+    records = np.array(rows, dtype=dtype) if rows else np.empty(0, dtype=dtype)
+    parts.append(COUNT.pack(len(records)))
+    parts.append(records.tobytes())
+
+
+class _Reader:
+    """Sequential reader over the bytes of a save"""
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, layout):
+        values = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return values
+
+    def read(self, size):
+        if self.offset + size > len(self.data):
+            raise ValueError("Truncated save game")
+        chunk = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return chunk
+
+    def records(self, dtype):
+        (count,) = self.unpack(COUNT)
+        return np.frombuffer(self.read(count * dtype.itemsize), dtype=dtype, count=count)
+
+
+def encode_garden(garden):
+    """Serialize a garden into save game bytes"""
+    clock = garden.clock
+    weather = garden.weather
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION),
+             GARDEN_RECORD.pack(clock.step, clock.ticks, time.time(), garden.rows, garden.cols,
+                                garden.credits, WEATHER_OPTIONS.index(weather.weather),
+                                weather.last_weather_change, weather.weather_duration,
+                                garden.last_snail_spawn, garden.last_rain_barrel_collection)]
+
+    # Inventory (booleans are stored as 0/1)
+    items = garden.inventory.items
+    parts.append(COUNT.pack(len(items)))
+    for name, value in items.items():
+        encoded = name.encode('utf-8')
+        parts.append(bytes([len(encoded)]) + encoded + ITEM_VALUE.pack(int(value)))
+
+    # Plots
+    records = garden.plots.to_records()
+    parts.append(COUNT.pack(len(records)))
+    parts.append(records.tobytes())
+
+    # Agents
+    _pack_records(parts, SNAIL_RECORD, [
+        (snail.x, snail.y, snail.target.index,
+         np.nan if snail.eating_start_time is None else snail.eating_start_time)
+        for snail in garden.snails])
+    _pack_records(parts, DUCK_RECORD, [(duck.x, duck.y, duck.spawn_time) for duck in garden.ducks])
+    _pack_records(parts, PICKER_RECORD, [(picker.x, picker.y, picker.spawn_time, picker.weeds_removed)
+                                         for picker in garden.weed_pickers])
+    return b''.join(parts)
+
+
+def decode_garden(data, headless=False, catch_up=True):
+    """Build a garden from save game bytes (raises ValueError on bad data)
+
+    Returns (garden, summary). With catch_up the garden is advanced by
+    the wall time that passed since it was saved (see Garden.catch_up)
+    and summary is its message for the player, otherwise None.
+    """
+    reader = _Reader(data)
+    try:
+        magic, version = reader.unpack(HEADER)
+        if magic != MAGIC:
+            raise ValueError("Not a garden save game")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported save game version {version}")
+
+        (step, ticks, saved_at, rows, cols, credits, weather_code, last_weather_change,
+         weather_duration, last_snail_spawn, last_rain_barrel_collection) = reader.unpack(GARDEN_RECORD)
+
+        (item_count,) = reader.unpack(COUNT)
+        items = {}
+        for _ in range(item_count):
+            name = bytes(reader.read(reader.read(1)[0])).decode('utf-8')
+            (items[name],) = reader.unpack(ITEM_VALUE)
+
+        plots = reader.records(PLOT_RECORD)
+        snails = reader.records(SNAIL_RECORD)
+        ducks = reader.records(DUCK_RECORD)
+        pickers = reader.records(PICKER_RECORD)
+    except struct.error as error:
+        raise ValueError("Truncated save game") from error
+    if weather_code >= len(WEATHER_OPTIONS):
+        raise ValueError(f"Unknown weather {weather_code} in save game")
+    if len(snails) and not ((snails['target'] >= 0) & (snails['target'] < rows * cols)).all():
+        raise ValueError("Snail target outside the garden in save game")
+
+    garden = Garden(rows, cols, headless=headless, clock=TickClock(step, ticks))
+    now = garden.clock.now
+    garden.credits = credits
+
+    # Inventory keeps its own item types; unknown items from other versions are dropped
+    inventory = garden.inventory.items
+    for name, value in items.items():
+        if name in inventory:
+            inventory[name] = bool(value) if isinstance(inventory[name], bool) else value
+
+    # Weather and the timers that depend on it
+    garden.weather.restore(WEATHER_OPTIONS[weather_code], last_weather_change, weather_duration)
+    garden.last_snail_spawn = last_snail_spawn
+    garden.last_rain_barrel_collection = last_rain_barrel_collection
+    garden._on_weather_change(garden.weather.get_weather(), now)
+    if garden.inventory.has_sprinkler():
+        garden.sprinkler.activate()
+
+    garden.plots.restore(plots)
+
+    # Snails first, so ducks can pick their targets
+    agents = garden.agents
+    for x, y, target, eating_start_time in snails.tolist():
+        snail = Snail(agents, garden.vegetables[target], garden.snails, now)
+        agents.place(snail.slot, x, y)
+        garden.snails.move(snail)
+        if not np.isnan(eating_start_time):
+            agents.stop(snail.slot)
+            snail.arrive(eating_start_time)
+    for x, y, spawn_time in ducks.tolist():
+        duck = Duck(agents, garden.snails, spawn_time)
+        agents.place(duck.slot, x, y)
+        duck.target_lost()  # Nearest snail from the saved position
+        garden._add_helper(garden.ducks, duck)
+    for x, y, spawn_time, weeds_removed in pickers.tolist():
+        picker = WeedPicker(agents, garden.vegetables, garden.plots.weed_queue, spawn_time,
+                            garden.weather.get_weather())
+        agents.place(picker.slot, x, y)
+        picker.weeds_removed = weeds_removed
+        picker.claim_lost()  # Best plot from the saved position
+        garden._add_helper(garden.weed_pickers, picker)
+
+    summary = None
+    if catch_up:
+        summary = garden.catch_up(max(0.0, time.time() - saved_at))
+    return garden, summary
+
+
+def save_garden(garden, path):
+    """Write a save game file (replaced atomically, so a crash keeps the old save)"""
+    data = encode_garden(garden)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return len(data)
+
+
+def load_garden(path, headless=False, catch_up=True):
+    """Read a save game file; returns (garden, catch-up summary), or (None, None) if there is none"""
+    if not os.path.exists(path):
+        return None, None
+    with open(path, 'rb') as f:
+        return decode_garden(f.read(), headless, catch_up)
@@ -0,0 +1,65 @@
+"""
+Event scheduler for garden timers
+
+Subsystems register deadlines (regrowth, weed growth, weather changes,
+helper lifetimes, ...) instead of polling timestamps every frame. Each
+tick only pops the events that are due, so the per-frame cost scales with
+the number of events that fire rather than with plots x timers.
+"""
+import heapq
+import itertools
+
+
+class ScheduledEvent:
+    """Handle for a scheduled callback; can be cancelled"""
+
+    __slots__ = ('when', 'callback', 'args', 'cancelled')
+
+    def __init__(self, when, callback, args):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Prevent the callback from running"""
+        self.cancelled = True
+
+
+class Scheduler:
+    """Min-heap of pending events ordered by deadline
+
+    Cancelled events stay in the heap and are skipped when they surface.
+    Callbacks receive the current time followed by their own arguments and
+    may schedule further events (including ones that are already due).
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()  # Tie-breaker keeps FIFO order
+
+    def schedule(self, when, callback, *args):
+        """Run callback(current_time, *args) once the clock reaches `when`"""
+        event = ScheduledEvent(when, callback, args)
+        heapq.heappush(self._heap, (when, next(self._counter), event))
+        return event
+
+    def run_due(self, current_time):
+        """Fire every event whose deadline has passed; returns how many ran"""
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][0] <= current_time:
+            event = heapq.heappop(heap)[2]
+            if not event.cancelled:
+                event.callback(current_time, *event.args)
+                fired += 1
+        return fired
+
+    def next_deadline(self):
+        """Deadline of the earliest pending event, or None"""
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def __len__(self):
+        return len(self._heap)
@@ -0,0 +1,521 @@
+"""
+Garden server - hosts many headless gardens on a pool of worker processes
+
+Gardens are sharded across worker processes. Every shard steps all of its
+gardens in fixed steps on an asyncio tick loop and applies player
+commands between ticks. The front process accepts clients on a local TCP
+socket, routes each command to the shard that owns the garden and prints
+the shards' tick latency reports. When a shard spends more than
+SERVER_MAX_LOAD of each step ticking, or has to drop steps, gardens move
+to a less busy shard as save game snapshots. A garden whose update
+raises is dropped from its shard; if a shard process dies, its pending
+requests fail and its gardens are gone.
+
+Protocol: one JSON object per line, answered by one JSON line.
+    {"id": 1, "action": "create", "garden": "anna", "rows": 6, "cols": 8}
+    {"id": 2, "action": "click", "garden": "anna", "x": 300, "y": 250, "right": false}
+    {"id": 3, "action": "tool", "garden": "anna", "tool": "water", "row": 0, "col": 2}
+    {"id": 4, "action": "state", "garden": "anna"}
+    {"id": 5, "action": "close", "garden": "anna"}
+    {"id": 6, "action": "stats"}
+Replies are {"id": 1, "ok": true, "result": ...} or {"id": 1, "ok": false, "error": "..."}.
+"click" is Garden.handle_click (shop, inventory, snails and plots) and
+"tool" applies a tool to a plot like Garden._apply_tool.
+
+Usage:
+    python server.py [--shards 4] [--port 8765] [--gardens 0] [--rows 6] [--cols 8]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from garden import Garden
+from save_game import encode_garden, decode_garden
+from config import (
+    GARDEN_ROWS, GARDEN_COLS, SIMULATION_STEP, MAX_STEPS_PER_FRAME,
+    SERVER_HOST, SERVER_PORT, SERVER_STATS_INTERVAL, SERVER_MAX_LOAD,
+    SERVER_MAX_ROWS, SERVER_MAX_COLS
+)
+
+
+def garden_state(garden):
+    """Summary of a garden for clients"""
+    plots = garden.plots
+    return {
+        'time': garden.clock.now,
+        'credits': garden.credits,
+        'weather': garden.weather.get_weather(),
+        'plots': plots.count,
+        'living': len(plots.living),
+        'ripe': len(plots.ripe),
+        'weedy': len(plots.weedy),
+        'snails': len(garden.snails),
+        'ducks': len(garden.ducks),
+        'weed_pickers': len(garden.weed_pickers),
+        'inventory': dict(garden.inventory.items)
+    }
+
+
+def apply_command(garden, action, args):
+    """Run one player action on a garden and return its reply"""
+    if action == 'click':
+        return garden.handle_click((int(args['x']), int(args['y'])), bool(args.get('right', False)))
+    if action == 'tool':
+        row, col = int(args['row']), int(args['col'])
+        if not (0 <= row < garden.rows and 0 <= col < garden.cols):
+            raise ValueError(f"No plot at row {row}, column {col}")
+        return garden._apply_tool(garden.vegetables[row * garden.cols + col], args['tool'])
+    if action == 'state':
+        return garden_state(garden)
+    raise ValueError(f"Unknown action {action!r}")
+
+
+class ShardWorker:
+    """Steps the gardens of one shard (runs inside a worker process)
+
+    Messages from the front process are (kind, request_id, *args) tuples
+    and are answered with ('reply', request_id, ok, result). Every
+    SERVER_STATS_INTERVAL the worker sends ('stats', stats) on its own,
+    and ('failed', garden_id, error) when a garden's update raised.
+    """
+
+    def __init__(self, index, conn, step=SIMULATION_STEP):
+        self.index = index
+        self.conn = conn
+        self.step = step
+        self.gardens = {}
+        self.costs = {}       # Garden id -> seconds spent updating it this interval
+        self.tick_times = []  # Seconds per tick of the whole shard, this interval
+        self.dropped = 0      # Steps skipped this interval because the shard fell behind
+        self.running = True
+        self.handlers = {
+            'create': self._create,
+            'close': self._close,
+            'command': self._command,
+            'release': self._release,
+            'adopt': self._adopt
+        }
+
+    async def run(self):
+        """Tick loop: apply commands, run the steps that are due, report stats"""
+        next_tick = time.perf_counter()
+        interval_start = next_tick
+        while self.running:
+            self._handle_messages()
+            now = time.perf_counter()
+            steps = 0
+            while now >= next_tick and steps < MAX_STEPS_PER_FRAME:
+                self._tick()
+                next_tick += self.step
+                steps += 1
+            backlog = int((now - next_tick) / self.step)
+            if backlog > MAX_STEPS_PER_FRAME:
+                # Too far behind to catch up - drop the backlog, the gardens slow down
+                self.dropped += backlog
+                next_tick += backlog * self.step
+            if now - interval_start >= SERVER_STATS_INTERVAL:
+                self._report(now - interval_start)
+                interval_start = now
+            await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+
+    def _tick(self):
+        """Advance every garden by one step"""
+        start = time.perf_counter()
+        failed = []
+        for garden_id, garden in self.gardens.items():
+            begin = time.perf_counter()
+            try:
+                garden.update()
+            except Exception as error:
+                # One broken garden must not take the shard's other gardens down
+                traceback.print_exc()
+                failed.append((garden_id, describe_error(error)))
+            self.costs[garden_id] = self.costs.get(garden_id, 0.0) + time.perf_counter() - begin
+        self.tick_times.append(time.perf_counter() - start)
+        for garden_id, error in failed:
+            self._close(garden_id)
+            self.conn.send(('failed', garden_id, error))
+
+    def _report(self, elapsed):
+        """Send this interval's tick latency and per-garden cost, then start a new interval"""
+        times = np.array(self.tick_times) if self.tick_times else np.zeros(1)
+        ticks = max(1, len(self.tick_times))
+        self.conn.send(('stats', {
+            'gardens': len(self.gardens),
+            'ticks': len(self.tick_times),
+            'mean_ms': times.mean() * 1000,
+            'p95_ms': np.percentile(times, 95) * 1000,
+            'max_ms': times.max() * 1000,
+            'load': times.sum() / elapsed,
+            'dropped': self.dropped,
+            'costs': {garden_id: cost / ticks for garden_id, cost in self.costs.items()}  # Seconds per tick
+        }))
+        self.tick_times = []
+        self.costs = {}
+        self.dropped = 0
+
+    def _handle_messages(self):
+        """Apply every message that arrived since the last tick"""
+        while self.running and self.conn.poll():
+            kind, request_id, *args = self.conn.recv()
+            if kind == 'stop':
+                self.running = False
+                return
+            try:
+                reply = ('reply', request_id, True, self.handlers[kind](*args))
+            except (KeyError, ValueError, IndexError, TypeError) as error:
+                reply = ('reply', request_id, False, str(error))
+            except Exception as error:
+                traceback.print_exc()
+                reply = ('reply', request_id, False, describe_error(error))
+            self.conn.send(reply)
+
+    def _garden(self, garden_id):
+        if garden_id not in self.gardens:
+            raise ValueError(f"Unknown garden {garden_id!r}")
+        return self.gardens[garden_id]
+
+    def _create(self, garden_id, rows, cols):
+        if garden_id in self.gardens:
+            raise ValueError(f"Garden {garden_id!r} already exists")
+        garden = self.gardens[garden_id] = Garden(rows, cols, headless=True)
+        return garden_state(garden)
+
+    def _close(self, garden_id):
+        self._garden(garden_id)
+        del self.gardens[garden_id]
+        self.costs.pop(garden_id, None)
+
+    def _command(self, garden_id, action, args):
+        return apply_command(self._garden(garden_id), action, args)
+
+    def _release(self, garden_id):
+        """Hand a garden over: remove it and return its snapshot"""
+        snapshot = encode_garden(self._garden(garden_id))
+        self._close(garden_id)
+        return snapshot
+
+    def _adopt(self, garden_id, snapshot):
+        """Take over a garden from its snapshot; it resumes on the next tick"""
+        self.gardens[garden_id], _ = decode_garden(snapshot, headless=True, catch_up=False)
+
+
+def describe_error(error):
+    """Error text for a reply, with the type for unexpected errors"""
+    return f"{type(error).__name__}: {error}"
+
+
+def _run_shard(index, conn):
+    """Worker process entry point"""
+    try:
+        asyncio.run(ShardWorker(index, conn).run())
+    except KeyboardInterrupt:
+        pass
+
+
+class Shard:
+    """Front-process handle of one worker process"""
+
+    def __init__(self, index):
+        self.index = index
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_run_shard, args=(index, child_conn), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.gardens = set()
+        self.pending = {}  # Request id -> future of the shard's reply
+        self.alive = True
+        self.stats_at = 0.0  # Front-process time of the latest report
+        self.moved_at = 0.0  # and of the latest garden move to or from this shard
+        self.stats = {'gardens': 0, 'ticks': 0, 'mean_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0,
+                      'load': 0.0, 'dropped': 0, 'costs': {}}
+
+    def describe(self):
+        if not self.alive:
+            return f"shard {self.index}: stopped"
+        stats = self.stats
+        return (f"shard {self.index}: {len(self.gardens)} gardens, tick {stats['mean_ms']:.2f} ms "
+                f"(p95 {stats['p95_ms']:.2f}, max {stats['max_ms']:.2f}), "
+                f"load {stats['load']:.0%}, dropped {stats['dropped']}")
+
+
+class GardenServer:
+    """Routes client commands to the shards and keeps their load balanced"""
+
+    def __init__(self, shard_count):
+        self.shards = [Shard(index) for index in range(shard_count)]
+        self.placement = {}   # Garden id -> owning Shard
+        self.migrations = {}  # Garden id -> event set once its move is over
+        self.request_ids = itertools.count()
+        # One thread per shard waits on its pipe
+        self.readers = ThreadPoolExecutor(max_workers=shard_count)
+        self.tasks = []
+
+    async def start(self, host=SERVER_HOST, port=SERVER_PORT):
+        """Start reading from the shards, the monitor and the client listener"""
+        loop = asyncio.get_running_loop()
+        self.tasks = [loop.create_task(self._read_shard(shard)) for shard in self.shards]
+        self.tasks.append(loop.create_task(self._monitor()))
+        return await asyncio.start_server(self._serve_client, host, port)
+
+    def stop(self):
+        """Stop the worker processes"""
+        for task in self.tasks:
+            task.cancel()
+        for shard in self.shards:
+            try:
+                shard.conn.send(('stop', None))
+            except OSError:
+                pass  # Already gone
+        for shard in self.shards:
+            shard.process.join(timeout=5)
+            shard.conn.close()
+        self.readers.shutdown(wait=False)
+
+    async def _read_shard(self, shard):
+        """Deliver a shard's replies and keep its latest stats"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                message = await loop.run_in_executor(self.readers, shard.conn.recv)
+            except (EOFError, OSError):
+                self._shard_died(shard)
+                return
+            if message[0] == 'stats':
+                shard.stats = message[1]
+                shard.stats_at = loop.time()
+                continue
+            if message[0] == 'failed':
+                _, garden_id, error = message
+                print(f"garden {garden_id} on shard {shard.index} failed and was dropped: {error}")
+                self._forget(garden_id)
+                continue
+            _, request_id, ok, result = message
+            future = shard.pending.pop(request_id)
+            if future.done():
+                continue  # The client went away
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(ValueError(result))
+
+    def _shard_died(self, shard):
+        """Fail everything waiting on a shard whose process is gone and drop its gardens"""
+        if not shard.alive:
+            return
+        shard.alive = False
+        print(f"shard {shard.index} stopped; lost gardens: {', '.join(sorted(shard.gardens)) or 'none'}")
+        for future in shard.pending.values():
+            if not future.done():
+                future.set_exception(ValueError(f"Shard {shard.index} stopped"))
+        shard.pending.clear()
+        for garden_id in list(shard.gardens):
+            self._forget(garden_id)
+
+    def _forget(self, garden_id):
+        """Remove a garden that no shard hosts any more"""
+        shard = self.placement.pop(garden_id, None)
+        if shard is not None:
+            shard.gardens.discard(garden_id)
+
+    async def request(self, shard, kind, *args):
+        """Send a message to a shard and wait for its reply"""
+        if not shard.alive:
+            raise ValueError(f"Shard {shard.index} stopped")
+        request_id = next(self.request_ids)
+        future = asyncio.get_running_loop().create_future()
+        shard.pending[request_id] = future
+        try:
+            shard.conn.send((kind, request_id) + args)
+        except OSError:
+            del shard.pending[request_id]
+            self._shard_died(shard)
+            raise ValueError(f"Shard {shard.index} stopped")
+        return await future
+
+    def _least_loaded(self):
+        shards = [shard for shard in self.shards if shard.alive]
+        if not shards:
+            raise ValueError("No shards running")
+        return min(shards, key=lambda shard: (shard.stats['load'], len(shard.gardens)))
+
+    async def _owner(self, garden_id):
+        """Shard that owns a garden, once a move in progress is over"""
+        while garden_id in self.migrations:
+            await self.migrations[garden_id].wait()
+        if garden_id not in self.placement:
+            raise ValueError(f"Unknown garden {garden_id!r}")
+        return self.placement[garden_id]
+
+    async def create(self, garden_id, rows=GARDEN_ROWS, cols=GARDEN_COLS):
+        """Start a new garden on the least loaded shard"""
+        if garden_id in self.placement:
+            raise ValueError(f"Garden {garden_id!r} already exists")
+        if not (0 < rows <= SERVER_MAX_ROWS and 0 < cols <= SERVER_MAX_COLS):
+            raise ValueError(f"Gardens have 1-{SERVER_MAX_ROWS} rows and 1-{SERVER_MAX_COLS} columns")
+        shard = self._least_loaded()
+        self.placement[garden_id] = shard
+        shard.gardens.add(garden_id)
+        try:
+            return await self.request(shard, 'create', garden_id, rows, cols)
+        except ValueError:
+            self._forget(garden_id)
+            raise
+
+    async def close(self, garden_id):
+        """Stop hosting a garden"""
+        shard = await self._owner(garden_id)
+        await self.request(shard, 'close', garden_id)
+        self._forget(garden_id)
+
+    async def command(self, garden_id, action, args):
+        """Run a player action on the shard that owns the garden"""
+        shard = await self._owner(garden_id)
+        return await self.request(shard, 'command', garden_id, action, args)
+
+    async def move(self, garden_id, target):
+        """Move a garden to another shard; its commands wait until it arrived"""
+        source = self.placement[garden_id]
+        done = self.migrations[garden_id] = asyncio.Event()
+        try:
+            snapshot = await self.request(source, 'release', garden_id)
+            source.gardens.discard(garden_id)
+            try:
+                await self.request(target, 'adopt', garden_id, snapshot)
+            except ValueError:
+                # Target gone - the garden goes back where it came from
+                target = source
+                try:
+                    await self.request(source, 'adopt', garden_id, snapshot)
+                except ValueError:
+                    self._forget(garden_id)
+                    raise
+            target.gardens.add(garden_id)
+            self.placement[garden_id] = target
+            source.moved_at = target.moved_at = asyncio.get_running_loop().time()
+        finally:
+            del self.migrations[garden_id]
+            done.set()
+
+    def stats(self):
+        """Latest report of every shard"""
+        return [dict(shard.stats, shard=shard.index, gardens=len(shard.gardens)) for shard in self.shards]
+
+    async def _monitor(self):
+        """Print the shards' tick latency and rebalance every SERVER_STATS_INTERVAL"""
+        while True:
+            await asyncio.sleep(SERVER_STATS_INTERVAL)
+            for shard in self.shards:
+                print(shard.describe())
+            await self._rebalance()
+
+    async def _rebalance(self):
+        """Move one garden off every shard that falls behind, to the least loaded shard
+
+        The garden moved is the most expensive one whose move leaves the
+        target less loaded than the source, so gardens do not bounce back.
+        A shard is only judged by a report that started after its last move.
+        """
+        for source in sorted(self.shards, key=lambda shard: shard.stats['load'], reverse=True):
+            stats = source.stats
+            if not source.alive or stats['load'] <= SERVER_MAX_LOAD and not stats['dropped']:
+                continue
+            if source.stats_at - SERVER_STATS_INTERVAL < source.moved_at:
+                continue
+            target = self._least_loaded()
+            if target is source:
+                continue
+            best, best_share = None, 0.0
+            for garden_id, cost in stats['costs'].items():
+                share = cost / SIMULATION_STEP
+                if (self.placement.get(garden_id) is source and garden_id not in self.migrations
+                        and target.stats['load'] + share < stats['load'] - share and share > best_share):
+                    best, best_share = garden_id, share
+            if best is None:
+                continue
+            print(f"moving {best} from shard {source.index} to shard {target.index} ({best_share:.0%} of a step)")
+            try:
+                await self.move(best, target)
+            except ValueError as error:
+                print(f"moving {best} failed: {error}")
+                continue
+            # Estimate the new loads until the next reports arrive
+            stats['load'] -= best_share
+            target.stats['load'] += best_share
+            stats['costs'].pop(best, None)
+
+    async def handle(self, request):
+        """Answer one client request"""
+        if not isinstance(request, dict):
+            raise ValueError("Requests are JSON objects")
+        action = request['action']
+        if action == 'stats':
+            return self.stats()
+        garden_id = str(request['garden'])
+        if action == 'create':
+            return await self.create(garden_id, int(request.get('rows', GARDEN_ROWS)),
+                                     int(request.get('cols', GARDEN_COLS)))
+        if action == 'close':
+            return await self.close(garden_id)
+        return await self.command(garden_id, action, request)
+
+    async def _serve_client(self, reader, writer):
+        """One client connection: a JSON request per line, a JSON reply per line"""
+        while True:
+            try:
+                line = await reader.readline()
+            except (ConnectionError, asyncio.CancelledError):
+                break  # Client gone, or the server is shutting down
+            if not line:
+                break
+            request_id = None
+            try:
+                request = json.loads(line)
+                if isinstance(request, dict):
+                    request_id = request.get('id')
+                reply = {'id': request_id, 'ok': True, 'result': await self.handle(request)}
+            except (ValueError, KeyError, TypeError, OverflowError) as error:
+                reply = {'id': request_id, 'ok': False, 'error': str(error)}
+            writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+            await writer.drain()
+        writer.close()
+
+
+async def serve(shard_count, host=SERVER_HOST, port=SERVER_PORT, gardens=0, rows=GARDEN_ROWS, cols=GARDEN_COLS):
+    """Run the server until interrupted, optionally starting with some gardens"""
+    server = GardenServer(shard_count)
+    try:
+        listener = await server.start(host, port)
+        for number in range(gardens):
+            await server.create(f"garden{number}", rows, cols)
+        print(f"Serving {gardens} gardens on {shard_count} shards at {host}:{port}")
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.stop()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Multi-garden simulation server")
+    parser.add_argument('--shards', type=int, default=max(1, multiprocessing.cpu_count() - 1),
+                        help="number of worker processes")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--gardens', type=int, default=0,
+                        help="gardens to create on start (named garden0, garden1, ...)")
+    parser.add_argument('--rows', type=int, default=GARDEN_ROWS)
+    parser.add_argument('--cols', type=int, default=GARDEN_COLS)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        asyncio.run(serve(args.shards, args.host, args.port, args.gardens, args.rows, args.cols))
+    except KeyboardInterrupt:
+        pass
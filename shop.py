@@ -2,6 +2,7 @@
 Shop system for buying seeds and upgrades
 """
 import pygame
+from fonts import get_font, render_text
 from config import (
     SHOP_X, SHOP_Y, SHOP_WIDTH, SHOP_HEIGHT,
     SHOP_ITEM_START_Y, SHOP_ITEM_SPACING, SHOP_ITEM_HEIGHT,
@@ -97,12 +98,12 @@ class Shop:
         pygame.draw.rect(screen, BLACK, close_button_rect, 2)
 
         # Draw X
-        x_font = pygame.font.Font(None, 28)
-        x_text = x_font.render("X", True, WHITE)
+        x_font = get_font(28)
+        x_text = render_text(x_font, "X", WHITE)
         screen.blit(x_text, (close_button_x + 8, close_button_y + 4))
 
         # Draw title
-        title_text = font.render("SHOP", True, BLACK)
+        title_text = render_text(font, "SHOP", BLACK)
         screen.blit(title_text, (SHOP_X + SHOP_WIDTH // 2 - title_text.get_width() // 2, SHOP_Y + 10))
 
         # Draw shop items
@@ -129,14 +130,14 @@ class Shop:
             pygame.draw.rect(screen, color, button_rect)
             pygame.draw.rect(screen, BLACK, button_rect, 1)
 
-            item_text = font.render(f"{display_name}: {price} Credits", True, BLACK)
+            item_text = render_text(font, f"{display_name}: {price} Credits", BLACK)
             screen.blit(item_text, (SHOP_X + 15, y_offset + 5))
 
             # Show inventory count
             if item_key not in ['sprinkler_system', 'rain_barrel', 'weather_tv']:
                 count = inventory.get_item_count(item_key)
                 if count > 0:
-                    count_text = font.render(f"({count})", True, BLACK)
+                    count_text = render_text(font, f"({count})", BLACK)
                     screen.blit(count_text, (SHOP_X + SHOP_WIDTH - 60, y_offset + 5))
 
             y_offset += SHOP_ITEM_SPACING
@@ -144,19 +145,19 @@ class Shop:
         # Show sprinkler status
         status_y = SHOP_Y + SHOP_HEIGHT - 50
         if inventory.has_sprinkler():
-            sprinkler_text = font.render("Sprinkler aktiv!", True, GREEN)
+            sprinkler_text = render_text(font, "Sprinkler aktiv!", GREEN)
             screen.blit(sprinkler_text, (SHOP_X + 65, status_y))
             status_y += 20
 
         # Show rain barrel status
         if inventory.has_rain_barrel():
-            barrel_text = font.render("Regentonne aktiv!", True, GREEN)
+            barrel_text = render_text(font, "Regentonne aktiv!", GREEN)
             screen.blit(barrel_text, (SHOP_X + 65, status_y))
             status_y += 20
 
         # Show weather TV status
         if inventory.has_weather_tv():
-            tv_text = font.render("Wetter-TV aktiv!", True, GREEN)
+            tv_text = render_text(font, "Wetter-TV aktiv!", GREEN)
             screen.blit(tv_text, (SHOP_X + 65, status_y))
 
     def draw_button(self, screen, font):
@@ -165,6 +166,6 @@ class Shop:
         shop_button = pygame.Rect(SHOP_BUTTON_X, SHOP_BUTTON_Y, SHOP_BUTTON_WIDTH, SHOP_BUTTON_HEIGHT)
         pygame.draw.rect(screen, YELLOW, shop_button)
         pygame.draw.rect(screen, BLACK, shop_button, 2)
-        shop_text = font.render("Shop", True, BLACK)
+        shop_text = render_text(font, "Shop", BLACK)
         screen.blit(shop_text, (SHOP_BUTTON_X + 65, SHOP_BUTTON_Y + 15))
         return shop_button
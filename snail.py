@@ -3,81 +3,93 @@ Snail pest system - snails crawl from edges to eat vegetables
 """
 import pygame
 import random
-import math
-import time
-from config import GARDEN_ROWS, GARDEN_COLS, GARDEN_START_X, GARDEN_START_Y, GARDEN_SPACING_X, GARDEN_SPACING_Y
+from agent_store import _agent_field
+from sprites import SpriteSheet, bar_level, draw_bar
 
 
 class Snail:
-    """A single snail that crawls from the edge toward a target vegetable"""
+    """A single snail that crawls from the edge toward a target vegetable
 
-    def __init__(self, target_vegetable):
+    Position and movement live in an AgentStore slot; the store moves the
+    snail and calls arrive()/timer_done() when it reaches the plot and
+    when it has finished eating.
+    """
+
+    x = _agent_field('x')
+    y = _agent_field('y')
+
+    def __init__(self, agents, target_vegetable, index=None, current_time=0.0):
+        self.agents = agents
         self.target = target_vegetable
+        self.index = index  # Spatial hash of live snails, kept up to date while moving
         self.size = 20  # Larger, more visible snail
 
         # Spawn from random edge
         edge = random.choice(['top', 'bottom', 'left', 'right'])
         if edge == 'top':
-            self.x = random.randint(100, 750)
-            self.y = -30
+            x = random.randint(100, 750)
+            y = -30
         elif edge == 'bottom':
-            self.x = random.randint(100, 750)
-            self.y = 630
+            x = random.randint(100, 750)
+            y = 630
         elif edge == 'left':
-            self.x = -30
-            self.y = random.randint(100, 550)
+            x = -30
+            y = random.randint(100, 550)
         else:  # right
-            self.x = 750
-            self.y = random.randint(100, 550)
+            x = 750
+            y = random.randint(100, 550)
 
         self.speed = 15  # Pixels per second
         self.reached_target = False
         self.eating_start_time = None
         self.eating_duration = 5.0  # 5 seconds to eat
 
-        # Create hitbox for clicking
-        self.rect = pygame.Rect(self.x - self.size // 2, self.y - self.size // 2, self.size, self.size)
-
-    def update(self, delta_time):
-        """Update snail position and eating state"""
+        # Crawl to the center of the vegetable plot
+        self.slot = agents.spawn(self, x, y, self.speed, 5, current_time)
+        agents.move_to(self.slot, self.target.x + 30, self.target.y + 30)
+
+        if self.index is not None:
+            self.index.add(self)
+
+    def arrive(self, current_time):
+        """Reached the plot - start eating"""
+        self.reached_target = True
+        self.eating_start_time = current_time
+        self.agents.start_timer(self.slot, current_time + self.eating_duration)
+
+    def timer_done(self, current_time):
+        """Finished eating - the plant dies (both ripe and unripe) and the snail leaves"""
+        self.target.grown = False
+        self.target.plant_dead = True
+        self.remove()
+
+    def target_lost(self):
+        """Snails only head for plots, never for other agents"""
+
+    def remove(self):
+        """Take the snail out of the garden (eaten, picked or done eating)"""
+        if self.slot is None:
+            return
+        if self.index is not None:
+            self.index.remove(self)
+        self.agents.despawn(self.slot)
+        self.slot = None
+
+    def draw(self, screen, current_time, alpha=1.0):
+        """Draw the snail and return the covered rect"""
+        x, y = self.agents.position(self.slot, alpha)
+        rect = SNAIL_SPRITES.blit(screen, (x, y))
+
+        # Eating progress bar only while eating
         if self.eating_start_time:
-            # Already eating
-            elapsed = time.time() - self.eating_start_time
-            if elapsed >= self.eating_duration:
-                # Finished eating - plant should be dead
-                return True  # Signal to remove snail
-            return False
-
-        # Move toward target
-        target_x = self.target.x + 30  # Center of vegetable plot
-        target_y = self.target.y + 30
-
-        # Calculate direction
-        dx = target_x - self.x
-        dy = target_y - self.y
-        distance = math.sqrt(dx * dx + dy * dy)
-
-        # Check if reached target
-        if distance < 5:
-            self.reached_target = True
-            self.eating_start_time = time.time()
-            return False
-
-        # Move toward target
-        if distance > 0:
-            self.x += (dx / distance) * self.speed * delta_time
-            self.y += (dy / distance) * self.speed * delta_time
-
-        # Update hitbox
-        self.rect.x = self.x - self.size // 2
-        self.rect.y = self.y - self.size // 2
-
-        return False
-
-    def draw(self, screen):
-        """Draw the snail"""
-        x, y = int(self.x), int(self.y)
-
+            elapsed = current_time - self.eating_start_time
+            rect = rect.union(draw_bar(screen, x, y + 15, SNAIL_BAR_WIDTH,
+                                       bar_level(elapsed / self.eating_duration, SNAIL_BAR_WIDTH), (255, 0, 0)))
+        return rect
+
+    @staticmethod
+    def paint(screen, x, y):
+        """Paint the snail with primitives; the eating bar is drawn separately"""
         # Draw snail body (larger oval)
         body_rect = pygame.Rect(x - 12, y - 6, 24, 12)
         pygame.draw.ellipse(screen, (139, 90, 43), body_rect)
@@ -101,22 +113,14 @@ class Snail:
         pygame.draw.circle(screen, (139, 90, 43), (antenna_left_x, antenna_y), 2)
         pygame.draw.circle(screen, (139, 90, 43), (antenna_right_x, antenna_y), 2)
 
-        # Draw eating progress bar if eating
-        if self.eating_start_time:
-            elapsed = time.time() - self.eating_start_time
-            progress = elapsed / self.eating_duration
-            bar_width = 30
-            bar_height = 4
-            bar_x = x - bar_width // 2
-            bar_y = y + 15
-
-            # Background
-            pygame.draw.rect(screen, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
-            # Progress
-            pygame.draw.rect(screen, (255, 0, 0), (bar_x, bar_y, int(bar_width * progress), bar_height))
-            # Border
-            pygame.draw.rect(screen, (0, 0, 0), (bar_x, bar_y, bar_width, bar_height), 1)
-
     def is_clicked(self, mouse_pos):
         """Check if snail was clicked"""
-        return self.rect.collidepoint(mouse_pos)
+        x, y = self.x, self.y
+        rect = pygame.Rect(x - self.size // 2, y - self.size // 2, self.size, self.size)
+        return rect.collidepoint(mouse_pos)
+
+
+SNAIL_BAR_WIDTH = 30
+
+# A single frame; the eating bar is drawn over it
+SNAIL_SPRITES = SpriteSheet((40, 40), (20, 16), Snail.paint)
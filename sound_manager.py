@@ -1,34 +1,194 @@
 """
 Sound and music management system
+
+Sound effects are decoded in the background so the first frame does not
+wait for the audio files: a loader thread works through SOUND_LOAD_ORDER
+while the game runs. Where threads are not available (pygbag), update()
+loads one sound per tick instead. The music is streamed by the mixer and
+only opened up front.
+
+The ambient loops are by far the largest sounds once decoded, and the
+mixer streams only the music. So an ambient loop is decoded when its
+weather starts, crossfaded in on one of two reserved channels, and
+released once it has faded out again: at most the audible loops stay
+in memory instead of all of them for the whole session. Their small
+compressed files are kept, so a loop heard again is decoded from memory.
+Without a loader thread the decode would stall a frame on every weather
+change, so there the file is read AMBIENT_READ_CHUNK bytes per tick, the
+decode gets a tick of its own, and the loop heard before the current one
+stays decoded: once both loops have played, changing weather costs nothing.
+
+Sound effects go through a VoiceManager instead of Sound.play(): requests
+made during a frame are merged per sound and started together on the
+next update(), within a per-sound voice limit and a minimum retrigger
+interval. When the mixer runs out of channels, an effect takes over the
+oldest voice of the lowest priority that does not outrank it.
 """
+import io
+import math
+import threading
+import time
 import pygame
 from config import (
-    SOUND_FILES, BACKGROUND_MUSIC, DEFAULT_VOLUME,
-    MUSIC_VOLUME_MULTIPLIER, AMBIENT_VOLUME_MULTIPLIER
+    SOUND_FILES, SOUND_LOAD_ORDER, BACKGROUND_MUSIC, DEFAULT_VOLUME,
+    MUSIC_VOLUME_MULTIPLIER, AMBIENT_VOLUME_MULTIPLIER,
+    MIXER_CHANNELS, SOUND_VOICE_LIMIT, SOUND_RETRIGGER_INTERVAL, SOUND_BURST_GAIN, SOUND_PRIORITIES,
+    AMBIENT_SOUNDS, AMBIENT_CROSSFADE, AMBIENT_READ_CHUNK
 )
 
 
+class AmbientChannel:
+    """The weather loop on two reserved mixer channels, crossfading between loops
+
+    The current loop plays on the front channel; a new loop fades in on
+    the other one while the old fades out. `names` holds the loops that
+    are still audible; the others can be released.
+    """
+
+    def __init__(self, first_channel):
+        self.channels = [pygame.mixer.Channel(first_channel), pygame.mixer.Channel(first_channel + 1)]
+        self.names = [None, None]  # Loop on each channel (also while it fades out)
+        self.fade_end = [0.0, 0.0]
+        self.front = 0
+        self.current = None
+
+    def play(self, name, sound, volume, now):
+        """Fade from the current loop to `sound`"""
+        if self.current is not None:
+            self._fade_out(self.front, now)
+        back = 1 - self.front  # A loop still fading out there is cut short
+        sound.set_volume(volume)
+        self.channels[back].play(sound, loops=-1, fade_ms=int(AMBIENT_CROSSFADE * 1000))
+        self.names[back] = name
+        self.front = back
+        self.current = name
+
+    def stop(self, now):
+        """Fade the current loop out"""
+        if self.current is not None:
+            self._fade_out(self.front, now)
+            self.current = None
+
+    def _fade_out(self, index, now):
+        self.channels[index].fadeout(int(AMBIENT_CROSSFADE * 1000))
+        self.fade_end[index] = now + AMBIENT_CROSSFADE
+
+    def update(self, now):
+        """Forget loops whose fade-out is over"""
+        for index, name in enumerate(self.names):
+            if name is None or index == self.front and name == self.current:
+                continue
+            if now >= self.fade_end[index] or not self.channels[index].get_busy():
+                self.channels[index].stop()
+                self.names[index] = None
+
+
+class VoiceManager:
+    """Assigns sound effects to mixer channels
+
+    play() only counts the request; flush() starts at most one voice per
+    sound, louder the more requests it merged. Requests for a sound that
+    started less than SOUND_RETRIGGER_INTERVAL ago wait for a later flush.
+    """
+
+    def __init__(self, first_channel, channel_count):
+        self.channels = [pygame.mixer.Channel(i) for i in range(first_channel, channel_count)]
+        self.voices = {}  # Index into self.channels -> (sound name, priority, start time)
+        self.requests = {}  # Sound name -> requests since the last flush
+        self.last_start = {}
+        # Counters for tuning the limits
+        self.merged = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def play(self, sound_name):
+        """Request a sound effect for the next flush"""
+        self.requests[sound_name] = self.requests.get(sound_name, 0) + 1
+
+    def flush(self, sounds, volume, now):
+        """Start the requested effects; sounds that are not loaded are skipped"""
+        if not self.requests:
+            return
+        waiting = {}
+        for name, count in self.requests.items():
+            sound = sounds.get(name)
+            if not sound:
+                continue
+            if now - self.last_start.get(name, -math.inf) < SOUND_RETRIGGER_INTERVAL:
+                waiting[name] = count
+                continue
+            priority = SOUND_PRIORITIES.get(name, 0)
+            index = self._channel_for(name, priority)
+            if index is None:
+                self.dropped += count
+                continue
+            channel = self.channels[index]
+            channel.play(sound)
+            channel.set_volume(min(1.0, volume * (1 + SOUND_BURST_GAIN * math.log2(count))))
+            self.voices[index] = (name, priority, now)
+            self.last_start[name] = now
+            self.merged += count - 1
+        self.requests = waiting
+
+    def _channel_for(self, name, priority):
+        """Channel for a new voice of `name`, or None if every channel plays something more important"""
+        # Forget voices that have finished
+        self.voices = {index: voice for index, voice in self.voices.items() if self.channels[index].get_busy()}
+
+        # At the limit, the sound restarts on its oldest voice
+        same = [(voice[2], index) for index, voice in self.voices.items() if voice[0] == name]
+        if len(same) >= SOUND_VOICE_LIMIT:
+            return min(same)[1]
+
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return index
+
+        # Take over the oldest voice of the lowest priority not above ours
+        candidates = [(voice[1], voice[2], index) for index, voice in self.voices.items() if voice[1] <= priority]
+        if not candidates:
+            return None
+        self.stolen += 1
+        return min(candidates)[2]
+
+
 class SoundManager:
-    """Manages all game sounds with graceful fallback if files are missing"""
-    def __init__(self):
+    """Manages all game sounds with graceful fallback if files are missing
+
+    Until a sound is loaded, its effects are skipped. play_ambient() puts
+    a loop that is not decoded at the front of the queue and keeps the
+    previous one playing; the crossfade starts on the first call after
+    the loop is ready (Garden.update asks every tick).
+    """
+    def __init__(self, background=True):
         pygame.mixer.init()
+        pygame.mixer.set_num_channels(MIXER_CHANNELS)
+        pygame.mixer.set_reserved(2)
+        self.ambient = AmbientChannel(0)
+        self.voices = VoiceManager(2, MIXER_CHANNELS)
         self.sounds = {}
         self.music_playing = False
         self.muted = False
         self.volume = DEFAULT_VOLUME
         self.current_ambient = None  # Track current ambient sound
+        self.wanted_ambient = None  # Ambient of the current weather, playing or still decoding
+        self.kept_ambient = None  # Loop heard before the current one, kept decoded without a loader thread
+        self.encoded = {}  # Ambient loop -> compressed file bytes, kept for the session
+        self.reading = {}  # Ambient loop -> (open file, chunks so far) while it is read tick by tick
 
-        # Try to load each sound
-        for name, path in SOUND_FILES.items():
+        # Sounds still to load, next first (shared with the loader thread)
+        self.lock = threading.Lock()
+        self.work = threading.Condition(self.lock)
+        self.pending = [name for name in SOUND_LOAD_ORDER if name in SOUND_FILES]
+        self.pending += [name for name in SOUND_FILES if name not in self.pending and name not in AMBIENT_SOUNDS]
+        self.decoding = None
+        self.loader = None
+        if background:
             try:
-                sound = pygame.mixer.Sound(path)
-                sound.set_volume(self.volume)
-                self.sounds[name] = sound
-                print(f"Loaded sound: {name}")
-            except:
-                # Sound file not found - that's okay, we'll just skip it
-                self.sounds[name] = None
-                print(f"Sound not found (optional): {path}")
+                self.loader = threading.Thread(target=self._load_pending, name='sound-loader', daemon=True)
+                self.loader.start()
+            except RuntimeError:
+                self.loader = None  # No threads here; update() loads instead
 
         # Try to load background music
         try:
@@ -38,13 +198,104 @@ class SoundManager:
         except:
             print("Background music not found (optional)")
 
+    def _next_pending(self):
+        """Take the next sound to load off the queue (None when all are loaded)"""
+        with self.lock:
+            return self.pending.pop(0) if self.pending else None
+
+    def _load_pending(self):
+        """Loader thread: decode queued sounds, then wait for more (ambient loops come later)"""
+        while True:
+            with self.work:
+                while not self.pending:
+                    self.work.wait()
+                self.decoding = self.pending.pop(0)
+            self._load(self.decoding)
+            with self.lock:
+                self.decoding = None
+
+    def _load(self, name):
+        """Decode one sound; missing files are stored as None"""
+        path = SOUND_FILES[name]
+        try:
+            if name in AMBIENT_SOUNDS:
+                if name not in self.encoded:
+                    with open(path, 'rb') as f:
+                        self.encoded[name] = f.read()
+                sound = pygame.mixer.Sound(file=io.BytesIO(self.encoded[name]))
+            else:
+                sound = pygame.mixer.Sound(path)
+            print(f"Loaded sound: {name}")
+        except:
+            # Sound file not found - that's okay, we'll just skip it
+            sound = None
+            print(f"Sound not found (optional): {path}")
+        # Effects play at full sound volume; the voice's channel volume applies self.volume
+        with self.lock:
+            self.sounds[name] = sound
+
+    def _read_chunk(self, name):
+        """Read the next chunk of an ambient loop's file; True once it is all read (or cannot be)"""
+        if name in self.encoded:
+            return True
+        if name not in self.reading:
+            try:
+                self.reading[name] = (open(SOUND_FILES[name], 'rb'), [])
+            except OSError:
+                return True  # _load reports the missing file
+        f, chunks = self.reading[name]
+        chunk = f.read(AMBIENT_READ_CHUNK)
+        if chunk:
+            chunks.append(chunk)
+            return False
+        f.close()
+        del self.reading[name]
+        self.encoded[name] = b''.join(chunks)
+        return True
+
+    def request(self, sound_name):
+        """Load a sound next, unless it is loaded or being decoded"""
+        with self.work:
+            if sound_name in self.sounds or sound_name == self.decoding:
+                return
+            if sound_name in self.pending:
+                self.pending.remove(sound_name)
+            self.pending.insert(0, sound_name)
+            self.work.notify()
+
+    def loading(self):
+        """True while sounds are still queued or being decoded"""
+        with self.lock:
+            return bool(self.pending) or self.decoding is not None
+
+    def update(self):
+        """Start the sound effects requested since the last update and release unheard ambient loops
+
+        Without a loader thread, the next queued sound is loaded here
+        (an ambient loop after its file has been read chunk by chunk).
+        """
+        if self.loader is None and self.pending:
+            name = self.pending[0]
+            if name not in AMBIENT_SOUNDS or self._read_chunk(name):
+                self._load(self._next_pending())
+        now = time.perf_counter()
+        self.voices.flush(self.sounds, self.volume, now)
+
+        # Ambient loops that faded out, or whose weather was over before they were decoded
+        self.ambient.update(now)
+        for name in AMBIENT_SOUNDS:
+            if name in (self.wanted_ambient, self.kept_ambient) or name in self.ambient.names:
+                continue
+            if self.sounds.get(name):
+                with self.lock:
+                    del self.sounds[name]
+
     def play(self, sound_name):
-        """Play a sound effect"""
+        """Play a sound effect (starts on the next update, merged with identical requests)"""
         if self.muted:
             return
 
-        if sound_name in self.sounds and self.sounds[sound_name]:
-            self.sounds[sound_name].play()
+        self.voices.play(sound_name)
 
     def play_music(self, loops=-1):
         """Start background music (loops infinitely by default)"""
@@ -85,27 +336,78 @@ class SoundManager:
         """Set volume (0.0 to 1.0)"""
         self.volume = max(0.0, min(1.0, volume))
         pygame.mixer.music.set_volume(self.volume * MUSIC_VOLUME_MULTIPLIER)
-        for sound in self.sounds.values():
-            if sound:
-                sound.set_volume(self.volume)
+        # Effects pick the volume up when they start
+        if self.current_ambient and self.sounds.get(self.current_ambient):
+            self.sounds[self.current_ambient].set_volume(self.volume * AMBIENT_VOLUME_MULTIPLIER)
 
     def play_ambient(self, sound_name):
         """Play an ambient sound on loop"""
-        if self.muted or sound_name == self.current_ambient:
+        if self.muted:
+            return
+        self.wanted_ambient = sound_name
+        if sound_name == self.current_ambient:
             return
 
-        # Stop current ambient if different
-        if self.current_ambient and self.sounds.get(self.current_ambient):
-            self.sounds[self.current_ambient].stop()
-
-        # Start new ambient
-        if sound_name in self.sounds and self.sounds[sound_name]:
-            self.sounds[sound_name].play(loops=-1)  # Loop infinitely
-            self.sounds[sound_name].set_volume(self.volume * AMBIENT_VOLUME_MULTIPLIER)
+        # Crossfade to the new ambient (loops infinitely)
+        sound = self.sounds.get(sound_name)
+        if sound:
+            self._keep_current_ambient()
+            self.ambient.play(sound_name, sound, self.volume * AMBIENT_VOLUME_MULTIPLIER, time.perf_counter())
             self.current_ambient = sound_name
+        elif sound_name not in self.sounds:
+            # Not decoded yet; the current ambient keeps playing until it is
+            self.request(sound_name)
 
     def stop_ambient(self):
-        """Stop current ambient sound"""
-        if self.current_ambient and self.sounds.get(self.current_ambient):
-            self.sounds[self.current_ambient].stop()
+        """Fade out the current ambient sound"""
+        self.wanted_ambient = None
+        if self.current_ambient:
+            self._keep_current_ambient()
+            self.ambient.stop(time.perf_counter())
             self.current_ambient = None
+
+    def _keep_current_ambient(self):
+        """Without a loader thread, keep the loop that is about to fade out decoded"""
+        if self.loader is None and self.current_ambient:
+            self.kept_ambient = self.current_ambient
+
+
+class NullSoundManager:
+    """Silent stand-in used by headless gardens (no mixer, no files loaded)"""
+
+    def __init__(self):
+        self.sounds = {}
+        self.music_playing = False
+        self.muted = True
+        self.volume = 0.0
+        self.current_ambient = None
+
+    def play(self, sound_name):
+        pass
+
+    def play_music(self, loops=-1):
+        pass
+
+    def stop_music(self):
+        pass
+
+    def toggle_music(self):
+        return self.music_playing
+
+    def toggle_mute(self):
+        return self.muted
+
+    def set_volume(self, volume):
+        pass
+
+    def loading(self):
+        return False
+
+    def update(self):
+        pass
+
+    def play_ambient(self, sound_name):
+        pass
+
+    def stop_ambient(self):
+        pass
@@ -0,0 +1,104 @@
+"""
+Spatial hash for moving objects
+
+Objects with x/y attributes are bucketed into square cells, so point
+queries and nearest-neighbour searches only look at nearby cells instead
+of every object. The hash also works as an ordered set of its objects.
+"""
+import math
+
+
+class SpatialHash:
+    """Uniform-grid bucketing of objects by their (x, y) position"""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}    # (cell_x, cell_y) -> set of objects
+        self.cell_of = {}  # object -> its cell (insertion ordered)
+        # Occupied cell range; it only grows, which keeps searches bounded but correct
+        self.min_cell = None
+        self.max_cell = None
+
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def add(self, obj):
+        """Insert an object at its current position"""
+        cell = self._cell(obj.x, obj.y)
+        self.cell_of[obj] = cell
+        self.cells.setdefault(cell, set()).add(obj)
+        if self.min_cell is None:
+            self.min_cell = self.max_cell = cell
+        else:
+            self.min_cell = (min(self.min_cell[0], cell[0]), min(self.min_cell[1], cell[1]))
+            self.max_cell = (max(self.max_cell[0], cell[0]), max(self.max_cell[1], cell[1]))
+
+    def remove(self, obj):
+        """Remove an object (ignored if it is not in the hash)"""
+        cell = self.cell_of.pop(obj, None)
+        if cell is None:
+            return
+        bucket = self.cells[cell]
+        bucket.discard(obj)
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, obj):
+        """Re-bucket an object after it moved (cheap if it stayed in its cell)"""
+        cell = self._cell(obj.x, obj.y)
+        if self.cell_of.get(obj) != cell:
+            self.remove(obj)
+            self.add(obj)
+
+    def query(self, x, y, radius):
+        """Objects in the cells overlapping the square of `radius` around (x, y)"""
+        (left, top), (right, bottom) = self._cell(x - radius, y - radius), self._cell(x + radius, y + radius)
+        found = []
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def nearest(self, x, y):
+        """Closest object to (x, y), or None; searches rings of cells outward"""
+        if not self.cell_of:
+            return None
+        center_x, center_y = self._cell(x, y)
+        max_ring = max(abs(center_x - self.min_cell[0]), abs(center_x - self.max_cell[0]),
+                       abs(center_y - self.min_cell[1]), abs(center_y - self.max_cell[1]))
+        best, best_distance = None, math.inf
+        for ring in range(max_ring + 1):
+            # Everything in this ring or beyond is at least (ring - 1) cells away
+            if best is not None and (ring - 1) * self.cell_size >= best_distance:
+                break
+            for cell in self._ring(center_x, center_y, ring):
+                for obj in self.cells.get(cell, ()):
+                    distance = math.hypot(obj.x - x, obj.y - y)
+                    if distance < best_distance:
+                        best, best_distance = obj, distance
+        return best
+
+    @staticmethod
+    def _ring(center_x, center_y, ring):
+        """Cells at Chebyshev distance `ring` from the center cell"""
+        if ring == 0:
+            yield (center_x, center_y)
+            return
+        for cell_x in range(center_x - ring, center_x + ring + 1):
+            yield (cell_x, center_y - ring)
+            yield (cell_x, center_y + ring)
+        for cell_y in range(center_y - ring + 1, center_y + ring):
+            yield (center_x - ring, cell_y)
+            yield (center_x + ring, cell_y)
+
+    def __contains__(self, obj):
+        return obj in self.cell_of
+
+    def __iter__(self):
+        # Iterate over a snapshot so objects can be removed while looping
+        return iter(list(self.cell_of))
+
+    def __len__(self):
+        return len(self.cell_of)
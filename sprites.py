@@ -0,0 +1,87 @@
+"""
+Pre-baked sprite frames
+
+Animated entities (snails, ducks, weed pickers) describe every pose they
+can be drawn in - walk-cycle phase bucket, eating/working/umbrella variant -
+and a paint function that draws one pose with pygame primitives. Each pose
+is painted once into its own surface, so drawing an entity at runtime is a
+single blit. Timer bars change every few frames and are cheap rectangles,
+so they are drawn over the pose with draw_bar() instead of being baked.
+"""
+import math
+import itertools
+import pygame
+from config import SPRITE_WALK_PHASES
+
+BAR_HEIGHT = 4
+
+# Every sheet created, so they can all be baked up front
+SHEETS = []
+
+
+def walk_phase(walk_cycle, phases=SPRITE_WALK_PHASES):
+    """Bucket a continuous walk cycle (radians) into one of `phases` frames"""
+    return int((walk_cycle % (2 * math.pi)) / (2 * math.pi) * phases) % phases
+
+
+def phase_cycle(phase, phases=SPRITE_WALK_PHASES):
+    """Walk cycle (radians) a phase bucket is painted at"""
+    return phase * 2 * math.pi / phases
+
+
+def bar_level(ratio, bar_width):
+    """Filled pixels of a timer bar, clamped to the bar"""
+    return max(0, min(bar_width, int(bar_width * ratio)))
+
+
+def draw_bar(screen, x, y, width, filled, color):
+    """Draw a timer bar centered on x with `filled` pixels in color and return its rect"""
+    rect = pygame.Rect(x - width // 2, y, width, BAR_HEIGHT)
+    # Background
+    screen.fill((50, 50, 50), rect)
+    # Progress
+    if filled:
+        screen.fill(color, (rect.x, y, filled, BAR_HEIGHT))
+    # Border
+    pygame.draw.rect(screen, (0, 0, 0), rect, 1)
+    return rect
+
+
+class SpriteSheet:
+    """All states of one entity, each baked into its own surface
+
+    paint(surface, x, y, *state) draws the entity anchored at (x, y);
+    `origin` is where that anchor lies inside the frame of `size`.
+    """
+
+    def __init__(self, size, origin, paint, *state_values):
+        self.size = size
+        self.origin = origin
+        self.paint = paint
+        self.states = list(itertools.product(*state_values))
+        self.frames = None
+        SHEETS.append(self)
+
+    def bake(self):
+        """Paint every state (converted for fast blits once a display exists)"""
+        convert = pygame.display.get_surface() is not None
+        x, y = self.origin
+        frames = {}
+        for state in self.states:
+            surface = pygame.Surface(self.size, pygame.SRCALPHA)
+            self.paint(surface, x, y, *state)
+            frames[state] = surface.convert_alpha() if convert else surface
+        self.frames = frames
+
+    def blit(self, screen, pos, *state):
+        """Draw one state anchored at pos and return the covered rect"""
+        if self.frames is None:
+            self.bake()
+        return screen.blit(self.frames[state], (pos[0] - self.origin[0], pos[1] - self.origin[1]))
+
+
+def bake_all():
+    """Bake every sheet that has not been baked yet (call after the display is set up)"""
+    for sheet in SHEETS:
+        if sheet.frames is None:
+            sheet.bake()
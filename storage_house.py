@@ -2,14 +2,14 @@
 Storage House - A building where inventory is stored
 """
 import pygame
-import math
-import time
+from fonts import get_font, render_text
+from config import FPS
 
 
 class StorageHouse:
     """A decorative house that represents the storage/inventory system"""
 
-    def __init__(self, x, y):
+    def __init__(self, x, y, particles, current_time):
         self.x = x
         self.y = y
         self.width = 80
@@ -19,38 +19,27 @@ class StorageHouse:
         self.rect = pygame.Rect(x, y, self.width, self.height)
 
         # Animation for chimney smoke
-        self.smoke_particles = []
-        self.last_smoke_spawn = time.time()
+        self.particles = particles
+        self.last_smoke_spawn = current_time
         self.smoke_spawn_interval = 0.5  # Spawn smoke every 0.5 seconds
 
-    def update(self):
+    def update(self, current_time):
         """Update house animations"""
-        current_time = time.time()
 
         # Spawn smoke particles from chimney
         if current_time - self.last_smoke_spawn > self.smoke_spawn_interval:
-            self.smoke_particles.append({
-                'x': self.x + 60,
-                'y': self.y + 10,
-                'offset_x': 0,
-                'offset_y': 0,
-                'spawn_time': current_time,
-                'lifetime': 2.0
-            })
+            # Smoke rises and drifts (the drift is the pool's wobble)
+            self.particles.emit('smoke', current_time, 1, lifetime=2.0,
+                                x=self.x + 60, y=self.y + 10, vy=-0.5 * FPS)
             self.last_smoke_spawn = current_time
 
-        # Update smoke particles
-        for particle in self.smoke_particles[:]:
-            elapsed = current_time - particle['spawn_time']
-            if elapsed > particle['lifetime']:
-                self.smoke_particles.remove(particle)
-            else:
-                # Smoke rises and drifts
-                particle['offset_y'] -= 0.5
-                particle['offset_x'] += math.sin(elapsed * 2) * 0.3
-
-    def draw(self, screen):
+    def draw(self, screen, current_time):
         """Draw the storage house"""
+        self.draw_building(screen)
+        self.draw_smoke(screen, current_time)
+
+    def draw_building(self, screen):
+        """Draw the static house body (cached by the renderer)"""
         x, y = self.x, self.y
 
         # Draw house base (walls)
@@ -97,31 +86,20 @@ class StorageHouse:
         pygame.draw.line(screen, (70, 45, 20), (x + 62, y + 45), (x + 62, y + 60), 1)
         pygame.draw.line(screen, (70, 45, 20), (x + 55, y + 52), (x + 70, y + 52), 1)
 
-        # Draw smoke from chimney
-        for particle in self.smoke_particles:
-            px = int(particle['x'] + particle['offset_x'])
-            py = int(particle['y'] + particle['offset_y'])
-
-            # Calculate alpha based on lifetime
-            elapsed = time.time() - particle['spawn_time']
-            alpha = max(0, 1 - (elapsed / particle['lifetime']))
-
-            if alpha > 0:
-                # Draw smoke puff (light gray circle)
-                size = int(3 + (elapsed * 2))
-                color_value = int(200 * alpha)
-                pygame.draw.circle(screen, (color_value, color_value, color_value), (px, py), size)
-
         # Draw sign above door
         sign_rect = pygame.Rect(x + 25, y + 45, 30, 8)
         pygame.draw.rect(screen, (139, 90, 43), sign_rect)
         pygame.draw.rect(screen, (70, 45, 20), sign_rect, 1)
 
         # Optional: Draw "LAGER" text on sign (Storage in German)
-        font = pygame.font.Font(None, 12)
-        sign_text = font.render("LAGER", True, (70, 45, 20))
+        font = get_font(12)
+        sign_text = render_text(font, "LAGER", (70, 45, 20))
         screen.blit(sign_text, (x + 26, y + 46))
 
+    def draw_smoke(self, screen, current_time):
+        """Draw smoke from chimney"""
+        self.particles.draw(screen, ('smoke',), current_time)
+
     def is_clicked(self, mouse_pos):
         """Check if the house was clicked"""
         return self.rect.collidepoint(mouse_pos)
@@ -3,14 +3,14 @@ Vegetable class for individual garden plots
 """
 import pygame
 import random
-import time
+import numpy as np
+from plot_store import PlotStore, CROP_TYPES, CROP_CODES
+from fonts import get_glyph_atlas
 from config import (
     BROWN, BLACK, WHITE, RED, ORANGE, PURPLE, GREEN, WATER_BLUE,
     VEGETABLE_COLORS, VEGETABLE_CREDITS,
     MIN_REGROW_TIME, MAX_REGROW_TIME, FERTILITY_LOSS_PER_HARVEST, MIN_FERTILITY,
-    BASE_MOISTURE_LOSS_RATE, MOISTURE_LOSS_SUNNY, MOISTURE_LOSS_RAINY, MOISTURE_LOSS_CLOUDY,
-    RAIN_MOISTURE_GAIN, WATER_INCREASE_AMOUNT,
-    WEED_CHECK_INTERVAL, WEED_SPAWN_CHANCE, WEED_GROWTH_TIME, MAX_WEED_LEVEL,
+    WATER_INCREASE_AMOUNT,
     REVIVAL_MIN_FERTILITY, REVIVAL_MIN_MOISTURE,
     SEED_PLANT_FERTILITY, SEED_PLANT_MOISTURE,
     WATER_PARTICLE_COUNT, FERTILIZER_PARTICLE_COUNT, WEED_PARTICLE_COUNT,
@@ -19,31 +19,94 @@ from config import (
 )
 
 
+def _plot_field(name, indexed=False):
+    """Property that reads/writes one field of this plot in the PlotStore
+
+    Writes to `indexed` fields refresh the store's plot-state indexes.
+    """
+    def getter(self):
+        return getattr(self.store, name)[self.index].item()
+
+    def setter(self, value):
+        getattr(self.store, name)[self.index] = value
+        if indexed:
+            self.store.refresh_states(self.index)
+
+    return property(getter, setter)
+
+
 class Vegetable:
-    def __init__(self, x, y, veg_type):
-        self.x = x
-        self.y = y
-        self.type = veg_type
-        self.grown = True
-        self.soil_fertility = 1.0
-        self.soil_moisture = 1.0
-        self.last_moisture_update = time.time()
-        self.harvest_count = 0
-        self.regrow_time = time.time() + random.uniform(MIN_REGROW_TIME, MAX_REGROW_TIME)
+    """Thin view over one slot of a PlotStore
+
+    All simulation state lives in the store's arrays; the view keeps the
+    old attribute interface so clicks, the sprinkler and helpers can keep
+    working with individual plots.
+    """
+
+    x = _plot_field('x')
+    y = _plot_field('y')
+    grown = _plot_field('grown', indexed=True)
+    plant_dead = _plot_field('plant_dead', indexed=True)
+    soil_fertility = _plot_field('soil_fertility', indexed=True)
+    last_moisture_update = _plot_field('last_moisture_update')
+    harvest_count = _plot_field('harvest_count')
+    regrow_time = _plot_field('regrow_time')
+
+    def __init__(self, x, y, veg_type, store=None, current_time=0.0):
+        if store is None:
+            store = PlotStore(1)
+        self.store = store
+        self.index = store.add_plot(x, y, veg_type, current_time)
         self.rect = pygame.Rect(x, y, 60, 60)
-        self.water_particles = []
-        self.weed_level = 0
-        self.weed_start_time = None
-        self.last_weed_check = time.time()
-        self.plant_dead = False
-        self.weed_particles = []
-        self.seed_particles = []
-        self.fertilizer_particles = []
 
         self.colors = VEGETABLE_COLORS
         self.credits = VEGETABLE_CREDITS
 
-    def draw(self, screen, font):
+    @classmethod
+    def attach(cls, store, index):
+        """View over a plot that is already in the store (e.g. added in bulk)"""
+        vegetable = cls.__new__(cls)
+        vegetable.store = store
+        vegetable.index = index
+        vegetable.rect = pygame.Rect(int(store.x[index]), int(store.y[index]), 60, 60)
+        vegetable.colors = VEGETABLE_COLORS
+        vegetable.credits = VEGETABLE_CREDITS
+        return vegetable
+
+    @property
+    def type(self):
+        return CROP_TYPES[self.store.crop[self.index]]
+
+    @type.setter
+    def type(self, veg_type):
+        self.store.crop[self.index] = CROP_CODES[veg_type]
+
+    @property
+    def soil_moisture(self):
+        return self.store.moisture(self.index).item()
+
+    @soil_moisture.setter
+    def soil_moisture(self, value):
+        self.store.set_moisture(self.index, value)
+
+    @property
+    def weed_level(self):
+        return self.store.weed_level[self.index].item()
+
+    @weed_level.setter
+    def weed_level(self, level):
+        self.store.set_weed_level(self.index, level)
+
+    @property
+    def weed_start_time(self):
+        start = self.store.weed_start_time[self.index]
+        return None if np.isnan(start) else start.item()
+
+    @weed_start_time.setter
+    def weed_start_time(self, value):
+        self.store.weed_start_time[self.index] = np.nan if value is None else value
+
+    def draw(self, screen, font, current_time):
         # Draw soil
         soil_color = BROWN if self.soil_fertility > 0.5 else (89, 39, 19)
         if self.plant_dead:
@@ -64,13 +127,11 @@ class Vegetable:
                 pygame.draw.ellipse(screen, PURPLE, (self.x + 20, self.y + 25, 20, 30))
                 pygame.draw.circle(screen, (34, 139, 34), (self.x + 30, self.y + 25), 3)
 
-            credit_text = font.render(f"+{self.credits[self.type]}", True, BLACK)
-            screen.blit(credit_text, (self.x + 10, self.y - 20))
+            get_glyph_atlas(font, BLACK).draw(screen, f"+{self.credits[self.type]}", (self.x + 10, self.y - 20))
         elif not self.plant_dead:
             pygame.draw.rect(screen, (101, 67, 33), (self.x + 5, self.y + 5, 50, 50))
-            remaining_time = max(0, self.regrow_time - time.time())
-            time_text = font.render(f"{remaining_time:.1f}s", True, WHITE)
-            screen.blit(time_text, (self.x + 5, self.y + 25))
+            remaining_time = max(0, self.regrow_time - current_time)
+            get_glyph_atlas(font, WHITE).draw(screen, f"{remaining_time:.1f}s", (self.x + 5, self.y + 25))
 
         # Draw weeds
         if self.weed_level > 0:
@@ -87,54 +148,9 @@ class Vegetable:
                 pygame.draw.line(screen, color, (weed_x, weed_y + weed_height), (weed_x, weed_y), weed_thickness)
                 pygame.draw.circle(screen, color, (weed_x, weed_y), 2 + self.weed_level)
 
-        # Draw particle animations
-        self._draw_particles(screen)
-
         # Draw UI bars
         self._draw_ui_bars(screen)
 
-    def _draw_particles(self, screen):
-        """Draw all particle effects"""
-        current_time = time.time()
-
-        # Seed particles
-        for particle in self.seed_particles:
-            alpha = max(0, 1 - (current_time - particle['spawn_time']) / particle['lifetime'])
-            if alpha > 0:
-                size = int(particle['size'] * alpha)
-                if size > 0:
-                    pygame.draw.circle(screen, particle['color'],
-                                    (int(particle['x']), int(particle['y'])), size)
-                    pygame.draw.circle(screen, BLACK,
-                                    (int(particle['x']), int(particle['y'])), size, 1)
-
-        # Fertilizer particles
-        for particle in self.fertilizer_particles:
-            alpha = max(0, 1 - (current_time - particle['spawn_time']) / particle['lifetime'])
-            if alpha > 0:
-                size = int(particle['size'] * alpha)
-                if size > 0:
-                    pygame.draw.circle(screen, (0, 255, 0),
-                                    (int(particle['x']), int(particle['y'])), size)
-
-        # Water particles
-        for particle in self.water_particles:
-            alpha = max(0, 1 - (current_time - particle['spawn_time']) / WATER_PARTICLE_LIFETIME)
-            if alpha > 0:
-                size = int(3 * alpha)
-                if size > 0:
-                    pygame.draw.circle(screen, WATER_BLUE,
-                                     (int(particle['x']), int(particle['y'])), size)
-
-        # Weed particles
-        for particle in self.weed_particles:
-            alpha = max(0, 1 - (current_time - particle['spawn_time']) / WEED_PARTICLE_LIFETIME)
-            if alpha > 0:
-                size = int(particle['size'] * alpha)
-                if size > 0:
-                    pygame.draw.circle(screen, particle['color'],
-                                     (int(particle['x']), int(particle['y'])), size)
-
     def _draw_ui_bars(self, screen):
         """Draw fertility and moisture bars"""
         # Fertility bar
@@ -147,88 +163,7 @@ class Vegetable:
         pygame.draw.rect(screen, (139, 69, 19), (self.x + 5, self.y + 59, 50, 3))
         pygame.draw.rect(screen, WATER_BLUE, (self.x + 5, self.y + 59, moisture_bar_width, 3))
 
-    def update(self, weather='sunny'):
-        """Update vegetable state"""
-        current_time = time.time()
-        time_passed = current_time - self.last_moisture_update
-
-        # Update moisture based on weather
-        if weather == 'sunny':
-            moisture_loss_rate = BASE_MOISTURE_LOSS_RATE * MOISTURE_LOSS_SUNNY
-        elif weather == 'rainy':
-            moisture_loss_rate = BASE_MOISTURE_LOSS_RATE * MOISTURE_LOSS_RAINY
-            self.soil_moisture = min(1.0, self.soil_moisture + RAIN_MOISTURE_GAIN * time_passed)
-        else:
-            moisture_loss_rate = BASE_MOISTURE_LOSS_RATE
-
-        self.soil_moisture = max(0.0, self.soil_moisture - moisture_loss_rate * time_passed)
-        self.last_moisture_update = current_time
-
-        # Update particles
-        self._update_particles(current_time, time_passed)
-
-        # Update weeds
-        self._update_weeds(current_time)
-
-        # Check for plant death
-        if self.soil_fertility <= 0 or self.soil_moisture <= 0:
-            self.plant_dead = True
-            self.grown = False
-
-        # Check for regrowth
-        if not self.grown and current_time >= self.regrow_time and not self.plant_dead:
-            self.grown = True
-
-    def _update_particles(self, current_time, time_passed):
-        """Update all particle animations"""
-        # Water particles
-        self.water_particles = [p for p in self.water_particles
-                               if current_time - p['spawn_time'] < WATER_PARTICLE_LIFETIME]
-        for particle in self.water_particles:
-            particle['y'] += particle['velocity'] * time_passed
-            particle['velocity'] += 50 * time_passed
-
-        # Weed particles
-        self.weed_particles = [p for p in self.weed_particles
-                              if current_time - p['spawn_time'] < WEED_PARTICLE_LIFETIME]
-        for particle in self.weed_particles:
-            particle['x'] += particle['vx'] * time_passed * 30
-            particle['y'] += particle['vy'] * time_passed * 30
-            particle['vy'] += particle['gravity'] * time_passed * 30
-            particle['rotation'] += time_passed * 180
-
-        # Seed particles
-        self.seed_particles = [p for p in self.seed_particles
-                              if current_time - p['spawn_time'] < p['lifetime']]
-        for particle in self.seed_particles:
-            particle['y'] += particle['vy'] * time_passed * 20
-            elapsed = current_time - particle['spawn_time']
-            if elapsed > 1.0:
-                shrink_factor = max(0.3, 1.0 - (elapsed - 1.0))
-                particle['size'] = 6 * shrink_factor
-
-        # Fertilizer particles
-        self.fertilizer_particles = [p for p in self.fertilizer_particles
-                                    if current_time - p['spawn_time'] < p['lifetime']]
-        for particle in self.fertilizer_particles:
-            particle['x'] += particle['vx'] * time_passed * 10
-            particle['y'] += particle['vy'] * time_passed * 10
-
-    def _update_weeds(self, current_time):
-        """Update weed growth"""
-        if current_time - self.last_weed_check > WEED_CHECK_INTERVAL:
-            if random.random() < WEED_SPAWN_CHANCE and self.weed_level == 0:
-                self.weed_level = 1
-                self.weed_start_time = current_time
-            self.last_weed_check = current_time
-
-        if self.weed_level > 0 and self.weed_start_time:
-            weed_age = current_time - self.weed_start_time
-            if weed_age > WEED_GROWTH_TIME and self.weed_level < MAX_WEED_LEVEL:
-                self.weed_level = min(MAX_WEED_LEVEL, self.weed_level + 1)
-                self.weed_start_time = current_time
-
-    def harvest(self):
+    def harvest(self, current_time):
         """Harvest the vegetable"""
         if self.grown:
             self.grown = False
@@ -239,67 +174,67 @@ class Vegetable:
             fertility_modifier = 1 + (1 - self.soil_fertility) * 2
             moisture_modifier = 1 + (1 - self.soil_moisture) * 1.5
             weed_modifier = 1.0 + (self.weed_level * 0.5)
-            self.regrow_time = time.time() + base_time * fertility_modifier * moisture_modifier * weed_modifier
+            self.store.set_regrow_time(
+                self.index, current_time + base_time * fertility_modifier * moisture_modifier * weed_modifier)
 
             return self.credits[self.type]
         return 0
 
-    def fertilize(self):
+    def fertilize(self, current_time):
         """Apply fertilizer to the plot"""
         self.soil_fertility = 1.0
 
         # Add fertilizer animation
-        for i in range(FERTILIZER_PARTICLE_COUNT):
-            particle = {
-                'x': self.x + 30 + random.uniform(-25, 25),
-                'y': self.y + 20 + random.uniform(-15, 15),
-                'vx': random.uniform(-2, 2),
-                'vy': random.uniform(-2, 2),
-                'size': random.uniform(5, 10),
-                'color': (0, 255, 0),
-                'spawn_time': time.time(),
-                'lifetime': random.uniform(FERTILIZER_PARTICLE_LIFETIME_MIN, FERTILIZER_PARTICLE_LIFETIME_MAX)
-            }
-            self.fertilizer_particles.append(particle)
+        n = FERTILIZER_PARTICLE_COUNT
+        self.store.particles.emit(
+            'fertilizer', current_time, n,
+            color=(0, 255, 0),
+            lifetime=np.random.uniform(FERTILIZER_PARTICLE_LIFETIME_MIN, FERTILIZER_PARTICLE_LIFETIME_MAX, n),
+            x=self.x + 30 + np.random.uniform(-25, 25, n),
+            y=self.y + 20 + np.random.uniform(-15, 15, n),
+            vx=np.random.uniform(-2, 2, n) * 10,
+            vy=np.random.uniform(-2, 2, n) * 10,
+            size=np.random.uniform(5, 10, n))
 
         return True
 
-    def water(self):
+    def water(self, current_time):
         """Water the plot"""
         self.soil_moisture = min(1.0, self.soil_moisture + WATER_INCREASE_AMOUNT)
 
         # Add water animation
-        for i in range(WATER_PARTICLE_COUNT):
-            particle = {
-                'x': self.x + 15 + random.randint(-15, 15),
-                'y': self.y - 10,
-                'velocity': random.randint(20, 40),
-                'spawn_time': time.time()
-            }
-            self.water_particles.append(particle)
+        n = WATER_PARTICLE_COUNT
+        self.store.particles.emit(
+            'water', current_time, n,
+            color=WATER_BLUE,
+            lifetime=WATER_PARTICLE_LIFETIME,
+            x=self.x + 15 + np.random.randint(-15, 16, n),
+            y=self.y - 10,
+            vy=np.random.randint(20, 41, n),
+            ay=50,
+            size=3)
 
         return self.soil_moisture >= 1.0
 
-    def remove_weeds(self):
+    def remove_weeds(self, current_time):
         """Remove weeds from the plot"""
         if self.weed_level > 0:
             clicks_needed = self.weed_level
 
             # Add weed removal animation
-            weed_colors = [(0, 100, 0), (0, 120, 0), (0, 80, 0)]
-            for i in range(WEED_PARTICLE_COUNT):
-                particle = {
-                    'x': self.x + 5 + (i * 8) % 50 + random.randint(-2, 2),
-                    'y': self.y + 5 + (i // 2) * 15 + random.randint(-3, 3),
-                    'vx': random.uniform(-3, 3),
-                    'vy': random.uniform(-7, -2),
-                    'gravity': random.uniform(0.1, 0.3),
-                    'rotation': random.uniform(0, 360),
-                    'size': random.randint(4, 8),
-                    'color': weed_colors[i % len(weed_colors)],
-                    'spawn_time': time.time()
-                }
-                self.weed_particles.append(particle)
+            weed_colors = np.array([(0, 100, 0), (0, 120, 0), (0, 80, 0)])
+            n = WEED_PARTICLE_COUNT
+            i = np.arange(n)
+            self.store.particles.emit(
+                'weed', current_time, n,
+                color=weed_colors[i % len(weed_colors)],
+                lifetime=WEED_PARTICLE_LIFETIME,
+                x=self.x + 5 + (i * 8) % 50 + np.random.randint(-2, 3, n),
+                y=self.y + 5 + (i // 2) * 15 + np.random.randint(-3, 4, n),
+                vx=np.random.uniform(-3, 3, n) * 30,
+                vy=np.random.uniform(-7, -2, n) * 30,
+                ay=np.random.uniform(0.1, 0.3, n) * 900,
+                size=np.random.randint(4, 9, n))
 
             self.weed_level = max(0, self.weed_level - 1)
             if self.weed_level == 0:
@@ -307,16 +242,16 @@ class Vegetable:
             return clicks_needed
         return 0
 
-    def revive_plant(self):
+    def revive_plant(self, current_time):
         """Revive a dead plant"""
         if self.plant_dead and self.soil_fertility > REVIVAL_MIN_FERTILITY and self.soil_moisture > REVIVAL_MIN_MOISTURE:
             self.plant_dead = False
             self.grown = False
-            self.regrow_time = time.time() + random.uniform(5, 10)
+            self.store.set_regrow_time(self.index, current_time + random.uniform(5, 10))
             return True
         return False
 
-    def plant_seed(self, seed_type):
+    def plant_seed(self, seed_type, current_time):
         """Plant a new seed"""
         if self.plant_dead:
             self.type = seed_type
@@ -324,7 +259,7 @@ class Vegetable:
             self.grown = False
             self.soil_fertility = SEED_PLANT_FERTILITY
             self.soil_moisture = SEED_PLANT_MOISTURE
-            self.regrow_time = time.time() + random.uniform(MIN_REGROW_TIME, MAX_REGROW_TIME)
+            self.store.set_regrow_time(self.index, current_time + random.uniform(MIN_REGROW_TIME, MAX_REGROW_TIME))
 
             # Add seed planting animation
             seed_colors = {
@@ -333,16 +268,14 @@ class Vegetable:
                 'eggplant': PURPLE
             }
 
-            particle = {
-                'x': self.x + 30,
-                'y': self.y + 15,
-                'vy': 1.0,
-                'size': 6,
-                'color': seed_colors[seed_type],
-                'spawn_time': time.time(),
-                'lifetime': SEED_PARTICLE_LIFETIME
-            }
-            self.seed_particles.append(particle)
+            self.store.particles.emit(
+                'seed', current_time, 1,
+                color=seed_colors[seed_type],
+                lifetime=SEED_PARTICLE_LIFETIME,
+                x=self.x + 30,
+                y=self.y + 15,
+                vy=20,
+                size=6)
 
             return True
         return False
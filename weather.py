@@ -2,76 +2,109 @@
 Weather system for the garden game
 """
 import random
-import time
+import numpy as np
 from config import (
     WEATHER_OPTIONS, MIN_WEATHER_DURATION, MAX_WEATHER_DURATION,
-    WINDOW_WIDTH, WINDOW_HEIGHT, WATER_BLUE, MAX_RAIN_PARTICLES, RAIN_SPAWN_RATE
+    WINDOW_WIDTH, FPS, MAX_RAIN_PARTICLES, RAIN_SPAWN_RATE, CATCH_UP_MAX_PERIODS
 )
 
 
 class WeatherSystem:
     """Manages weather changes and rain particles"""
 
-    def __init__(self):
+    def __init__(self, scheduler, particles, current_time):
         self.weather = 'sunny'
-        self.last_weather_change = time.time()
+        self.scheduler = scheduler
+        self.particles = particles
+        self.listeners = []  # Called as listener(weather, current_time) on change
+        self.last_weather_change = current_time
         self.weather_duration = random.uniform(MIN_WEATHER_DURATION, MAX_WEATHER_DURATION)
-        self.rain_particles = []
-
-    def update(self):
-        """Update weather state and particles"""
-        current_time = time.time()
-
-        # Check if weather should change
-        if current_time - self.last_weather_change > self.weather_duration:
+        self.change_event = None
+        self._schedule_change()
+
+    def _schedule_change(self):
+        """Register the end of the current weather period"""
+        if self.change_event:
+            self.change_event.cancel()
+        self.change_event = self.scheduler.schedule(self.last_weather_change + self.weather_duration,
+                                                    self._change_weather)
+
+    def restore(self, weather, last_weather_change, weather_duration):
+        """Resume a saved weather period (listeners are not notified)"""
+        self.weather = weather
+        self.last_weather_change = last_weather_change
+        self.weather_duration = weather_duration
+        self._schedule_change()
+
+    def _change_weather(self, current_time):
+        """Weather period is over: pick the next weather"""
+        self.weather = random.choice(WEATHER_OPTIONS)
+        self.last_weather_change = current_time
+        self.weather_duration = random.uniform(MIN_WEATHER_DURATION, MAX_WEATHER_DURATION)
+        self._schedule_change()
+        for listener in self.listeners:
+            listener(self.weather, current_time)
+
+    def fast_forward(self, current_time, end_time, max_periods=CATCH_UP_MAX_PERIODS):
+        """Play the weather forward to end_time without the scheduler
+
+        Returns the timeline as (start, end, weather) segments covering
+        current_time..end_time. If more than `max_periods` periods would
+        fit, all periods are stretched by the same factor so the timeline
+        stays bounded while each weather keeps its share of the time.
+        Listeners are not notified.
+        """
+        mean_duration = (MIN_WEATHER_DURATION + MAX_WEATHER_DURATION) / 2
+        period_end = self.last_weather_change + self.weather_duration
+        stretch = max(1.0, (end_time - period_end) / (max_periods * mean_duration))
+
+        segments = []
+        start = current_time
+        while period_end < end_time and len(segments) < max_periods:
+            segments.append((start, period_end, self.weather))
+            start = period_end
             self.weather = random.choice(WEATHER_OPTIONS)
-            self.last_weather_change = current_time
+            self.last_weather_change = start
+            self.weather_duration = random.uniform(MIN_WEATHER_DURATION, MAX_WEATHER_DURATION) * stretch
+            period_end = start + self.weather_duration
+        segments.append((start, end_time, self.weather))
+
+        if stretch > 1.0:
+            # The weather at resume time lasts a normal period from now on
+            self.last_weather_change = end_time
             self.weather_duration = random.uniform(MIN_WEATHER_DURATION, MAX_WEATHER_DURATION)
+        self._schedule_change()
+        return segments
+
+    def add_listener(self, listener):
+        """Register a callback for weather changes"""
+        self.listeners.append(listener)
 
-        # Update rain particles
+    def update(self, current_time):
+        """Update rain particles"""
         if self.weather == 'rainy':
-            self._update_rain_particles()
+            self._spawn_rain_particles(current_time)
         else:
-            self.rain_particles = []
-
-    def _update_rain_particles(self):
-        """Create and update rain particle effects"""
-        # Spawn new rain particles
-        if len(self.rain_particles) < MAX_RAIN_PARTICLES:
-            for i in range(RAIN_SPAWN_RATE):
-                particle = {
-                    'x': random.randint(0, WINDOW_WIDTH),
-                    'y': random.randint(-20, 0),
-                    'speed': random.uniform(3, 7)
-                }
-                self.rain_particles.append(particle)
-
-        # Update existing rain particles
-        for particle in self.rain_particles[:]:
-            particle['y'] += particle['speed']
-            particle['x'] += random.uniform(-0.5, 0.5)
-            if particle['y'] > WINDOW_HEIGHT:
-                self.rain_particles.remove(particle)
-
-    def draw_rain(self, screen):
+            self.particles.clear('rain')
+
+    def _spawn_rain_particles(self, current_time):
+        """Spawn new rain drops; the particle engine moves and expires them"""
+        if self.particles.pool('rain').count < MAX_RAIN_PARTICLES:
+            n = RAIN_SPAWN_RATE
+            self.particles.emit('rain', current_time, n,
+                                x=np.random.randint(0, WINDOW_WIDTH + 1, n),
+                                y=np.random.randint(-20, 1, n),
+                                vy=np.random.uniform(3, 7, n) * FPS)
+
+    def draw_rain(self, screen, current_time):
         """Draw rain particles with splash effects"""
-        import pygame
-        for particle in self.rain_particles:
-            # Main rain drop
-            pygame.draw.line(screen, WATER_BLUE,
-                           (particle['x'], particle['y']),
-                           (particle['x'] - 2, particle['y'] + 10), 2)
-            # Lighter drops for depth
-            if random.random() > 0.7:
-                pygame.draw.line(screen, (100, 200, 255),
-                               (particle['x'] + 1, particle['y']),
-                               (particle['x'] - 1, particle['y'] + 8), 1)
+        self.particles.draw(screen, ('rain',), current_time)
 
     def get_weather(self):
         """Get current weather"""
         return self.weather
 
-    def get_forecast(self, periods=3):
+    def get_forecast(self, current_time, periods=3):
         """Get weather forecast for next periods
 
         Returns list of weather predictions:
@@ -80,7 +113,6 @@ class WeatherSystem:
         forecast = [self.weather]  # Current weather
 
         # Calculate remaining time for current weather
-        current_time = time.time()
         time_elapsed = current_time - self.last_weather_change
         time_remaining = self.weather_duration - time_elapsed
 
@@ -4,6 +4,7 @@ Weather TV - Displays 3-day weather forecast
 import pygame
 import time
 import math
+from fonts import get_font, render_text
 from config import WEATHER_TV_X, WEATHER_TV_Y, WEATHER_TV_WIDTH, WEATHER_TV_HEIGHT, YELLOW, WATER_BLUE, GRAY, BLACK, WHITE
 
 
@@ -73,8 +74,8 @@ class WeatherTV:
                 self._draw_weather_icon(screen, icon_x, forecast_y, icon_size, weather)
 
                 # Draw label below icon (smaller font)
-                label_font = pygame.font.Font(None, 11)
-                label_text = label_font.render(label, True, BLACK)
+                label_font = get_font(11)
+                label_text = render_text(label_font, label, BLACK)
                 label_rect = label_text.get_rect(center=(icon_x + icon_size // 2, forecast_y + icon_size + 8))
                 screen.blit(label_text, label_rect)
 
@@ -4,117 +4,128 @@ Weed Picker - AI helper that walks through the garden removing weeds
 import pygame
 import random
 import math
-import time
+from agent_store import _agent_field
+from sprites import SpriteSheet, walk_phase, phase_cycle, bar_level, draw_bar
+from config import SPRITE_WALK_PHASES
 
 
 class WeedPicker:
-    """A helper that walks between garden plots removing weeds"""
-
-    def __init__(self, vegetables, weather='sunny'):
-        self.vegetables = vegetables
+    """A helper that walks between garden plots removing weeds
+
+    Position, walk cycle and timers live in an AgentStore slot; the store
+    walks the picker to its claimed plot and calls back when it arrives
+    and after each weed level it removes.
+    """
+
+    x = _agent_field('x')
+    y = _agent_field('y')
+    walk_cycle = _agent_field('walk_cycle')
+    spawn_time = _agent_field('spawn_time')
+    lifetime = _agent_field('lifetime')
+
+    def __init__(self, agents, vegetables, weed_queue, current_time, weather='sunny'):
+        self.agents = agents
+        self.vegetables = vegetables  # Indexed like the plot store
+        self.weed_queue = weed_queue
         self.size = 25
         self.weather = weather
 
-        # Start at a random position near the garden
-        self.x = random.randint(150, 600)
-        self.y = random.randint(150, 500)
-
         self.speed = 30  # Pixels per second
         self.target_plot = None
         self.working = False
         self.work_start_time = None
         self.work_duration = 0.5  # 0.5 seconds to remove weed level (faster!)
+        self.weeds_removed = 0  # Weed levels removed so far
 
-        # Duration: 2 minutes (120 seconds)
-        self.spawn_time = time.time()
-        self.lifetime = 120.0
-
-        # Walking animation
-        self.walk_cycle = 0
-        self.walk_speed = 5.0  # Animation speed
+        # Start at a random position near the garden, walking (animation speed 5)
+        # Duration: 2 minutes (120 seconds), removal is scheduled by the garden
+        self.slot = agents.spawn(self, random.randint(150, 600), random.randint(150, 500),
+                                 self.speed, 10, current_time, lifetime=120.0, walk_speed=5.0)
 
         # Find first weedy plot
         self._find_next_target()
 
+    def _set_working(self, working):
+        self.working = working
+        self.agents.walking[self.slot] = not working
+
     def _find_next_target(self):
-        """Find the next plot with weeds"""
-        weedy_plots = [v for v in self.vegetables if v.weed_level > 0]
-        if weedy_plots:
-            self.target_plot = random.choice(weedy_plots)
-            self.working = False
+        """Claim the next plot with weeds from the work queue (or wait for one)"""
+        self._set_working(False)
+        index = self.weed_queue.claim(self, self.x, self.y)
+        if index is not None:
+            self.target_plot = self.vegetables[index]
+            self.agents.move_to(self.slot, self.target_plot.x + 30, self.target_plot.y + 30)
         else:
             self.target_plot = None
+            self.agents.stop(self.slot)
+
+    def arrive(self, current_time):
+        """Reached the plot - start working"""
+        self._set_working(True)
+        self.work_start_time = current_time
+        self.agents.start_timer(self.slot, current_time + self.work_duration)
+
+    def timer_done(self, current_time):
+        """Finished removing one weed level"""
+        plot = self.target_plot
+        if plot is not None and plot.weed_level > 0:
+            plot.remove_weeds(current_time)
+            self.weeds_removed += 1
+
+            # Continue working while the plot has weeds left
+            if plot.weed_level > 0:
+                self.work_start_time = current_time
+                self.agents.start_timer(self.slot, current_time + self.work_duration)
+                return
+
+        # Plot is clean, find next
+        self._find_next_target()
 
-    def update(self, delta_time):
-        """Update weed picker position and working state"""
-        current_time = time.time()
+    def target_lost(self):
+        """Weed pickers only head for plots, never for other agents"""
 
-        # Update walking animation
+    def claim_lost(self):
+        """The claimed plot was weeded (by us or someone else)"""
+        self.target_plot = None
         if not self.working:
-            self.walk_cycle += self.walk_speed * delta_time
-
-        # Check if lifetime expired
-        if current_time - self.spawn_time >= self.lifetime:
-            return True  # Signal to remove picker
-
-        # If working on a plot
-        if self.working and self.work_start_time:
-            elapsed = current_time - self.work_start_time
-            if elapsed >= self.work_duration:
-                # Finished removing one weed level
-                if self.target_plot and self.target_plot.weed_level > 0:
-                    self.target_plot.remove_weeds()
-
-                    # Check if more weeds on this plot
-                    if self.target_plot.weed_level == 0:
-                        # Move to next plot
-                        self._find_next_target()
-                    else:
-                        # Continue working on this plot
-                        self.work_start_time = current_time
-                else:
-                    # Plot is clean, find next
-                    self._find_next_target()
-            return False
-
-        # If no target, find one
-        if not self.target_plot:
             self._find_next_target()
-            if not self.target_plot:
-                # No weeds anywhere, just wander
-                return False
-
-        # Move toward target plot
-        target_x = self.target_plot.x + 30
-        target_y = self.target_plot.y + 30
-
-        dx = target_x - self.x
-        dy = target_y - self.y
-        distance = math.sqrt(dx * dx + dy * dy)
 
-        # Check if reached target
-        if distance < 10:
-            self.working = True
-            self.work_start_time = current_time
-            return False
-
-        # Move toward target
-        if distance > 0:
-            self.x += (dx / distance) * self.speed * delta_time
-            self.y += (dy / distance) * self.speed * delta_time
+    def work_available(self):
+        """New weeds appeared while the picker was waiting"""
+        if self.target_plot is None and not self.working:
+            self._find_next_target()
 
-        return False
+    def leave(self):
+        """Give the claimed plot back to the queue and free the agent slot"""
+        self.weed_queue.release(self)
+        self.target_plot = None
+        self.agents.despawn(self.slot)
 
     def update_weather(self, weather):
         """Update weather state"""
         self.weather = weather
 
-    def draw(self, screen):
-        """Draw the weed picker with walking animation"""
-        x, y = int(self.x), int(self.y)
+    def draw(self, screen, current_time, alpha=1.0):
+        """Draw the weed picker and return the covered rect"""
+        # Working pickers stand still, walking ones use their walk-cycle frame
+        phase = None if self.working else walk_phase(self.walk_cycle)
+        x, y = self.agents.position(self.slot, alpha)
+        rect = WEED_PICKER_SPRITES.blit(screen, (x, y), phase, self.weather == 'rainy')
+
+        # Timer bar showing remaining time
+        remaining_ratio = 1.0 - ((current_time - self.spawn_time) / self.lifetime)
+        return rect.union(draw_bar(screen, x, y + 25, WEED_PICKER_BAR_WIDTH,
+                                   bar_level(remaining_ratio, WEED_PICKER_BAR_WIDTH), (100, 200, 100)))
+
+    @staticmethod
+    def paint(screen, x, y, phase, umbrella):
+        """Paint one weed picker frame (phase None = working); the timer bar is drawn separately"""
+        working = phase is None
+        walk_cycle = 0 if working else phase_cycle(phase)
 
         # Walking animation - bob up and down
-        bob_offset = int(math.sin(self.walk_cycle) * 2) if not self.working else 0
+        bob_offset = int(math.sin(walk_cycle) * 2) if not working else 0
 
         # Draw body (person shape)
         # Head
@@ -124,19 +135,19 @@ class WeedPicker:
         pygame.draw.line(screen, (100, 150, 100), (x, y - 2 + bob_offset), (x, y + 12 + bob_offset), 5)
 
         # Arms
-        if self.working:
+        if working:
             # Working animation - arms down
             pygame.draw.line(screen, (100, 150, 100), (x, y + 2 + bob_offset), (x - 8, y + 10 + bob_offset), 3)
             pygame.draw.line(screen, (100, 150, 100), (x, y + 2 + bob_offset), (x + 8, y + 10 + bob_offset), 3)
         else:
             # Walking - arms swinging
-            arm_swing = int(math.sin(self.walk_cycle * 2) * 3)
+            arm_swing = int(math.sin(walk_cycle * 2) * 3)
             pygame.draw.line(screen, (100, 150, 100), (x, y + 2 + bob_offset), (x - 8, y + 8 + bob_offset + arm_swing), 3)
             pygame.draw.line(screen, (100, 150, 100), (x, y + 2 + bob_offset), (x + 8, y + 8 + bob_offset - arm_swing), 3)
 
         # Legs with walking animation
-        if not self.working:
-            leg_offset = int(math.sin(self.walk_cycle * 2) * 4)
+        if not working:
+            leg_offset = int(math.sin(walk_cycle * 2) * 4)
             pygame.draw.line(screen, (80, 100, 200), (x, y + 12 + bob_offset), (x - 5, y + 20 + bob_offset + leg_offset), 4)
             pygame.draw.line(screen, (80, 100, 200), (x, y + 12 + bob_offset), (x + 5, y + 20 + bob_offset - leg_offset), 4)
         else:
@@ -145,26 +156,12 @@ class WeedPicker:
             pygame.draw.line(screen, (80, 100, 200), (x, y + 12 + bob_offset), (x + 5, y + 20 + bob_offset), 4)
 
         # Draw tool in hand (small hoe)
-        if self.working:
+        if working:
             pygame.draw.line(screen, (139, 69, 19), (x + 8, y + 10 + bob_offset), (x + 12, y + 18 + bob_offset), 2)
             pygame.draw.rect(screen, (150, 150, 150), (x + 10, y + 18 + bob_offset, 4, 2))
 
-        # Draw timer bar showing remaining time
-        remaining_ratio = 1.0 - ((time.time() - self.spawn_time) / self.lifetime)
-        bar_width = 40
-        bar_height = 4
-        bar_x = x - bar_width // 2
-        bar_y = y + 25
-
-        # Background
-        pygame.draw.rect(screen, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
-        # Progress
-        pygame.draw.rect(screen, (100, 200, 100), (bar_x, bar_y, int(bar_width * remaining_ratio), bar_height))
-        # Border
-        pygame.draw.rect(screen, (0, 0, 0), (bar_x, bar_y, bar_width, bar_height), 1)
-
         # Draw umbrella if raining
-        if self.weather == 'rainy':
+        if umbrella:
             umbrella_x = x
             umbrella_y = y - 25 + bob_offset
 
@@ -191,5 +188,13 @@ class WeedPicker:
             pygame.draw.circle(screen, (139, 69, 19), (umbrella_x, y - 10 + bob_offset), 2)
 
         # Draw working indicator
-        if self.working:
+        if working:
             pygame.draw.circle(screen, (255, 255, 0), (x, y - 20 + bob_offset), 4)
+
+
+WEED_PICKER_BAR_WIDTH = 40
+
+# Walk phases plus the working pose, with and without umbrella
+WEED_PICKER_SPRITES = SpriteSheet((44, 76), (22, 44), WeedPicker.paint,
+                                  [None] + list(range(SPRITE_WALK_PHASES)),
+                                  (False, True))
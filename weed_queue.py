@@ -0,0 +1,73 @@
+"""
+Weed work queue for weed pickers
+
+Candidates come from the plot store's live weedy index instead of a scan
+over all plots. Pickers claim plots from the queue, which keeps several
+pickers from converging on the same plot. The store reports refreshed
+plots, so claimants hear when their plot was weeded and waiting claimants
+when new weeds appear - pickers never poll.
+
+Claimants implement claim_lost() and work_available().
+"""
+import numpy as np
+from config import PLOT_SIZE, WEED_LEVEL_PRIORITY
+
+
+class WeedQueue:
+    """Weedy plots waiting for a picker, plus which picker claimed which plot"""
+
+    def __init__(self, store):
+        self.store = store
+        self.claims = {}       # Plot index -> claimant
+        self.claimed_by = {}   # Claimant -> plot index
+        self.waiting = {}      # Claimants that found no work (insertion ordered)
+
+    def update(self, indices, weedy):
+        """Plots were refreshed; `weedy` flags which of them have weeds"""
+        if self.claims:
+            # Drop the claims on plots that have no weeds any more
+            for index in indices[~weedy].tolist():
+                claimant = self.claims.pop(index, None)
+                if claimant is not None:
+                    del self.claimed_by[claimant]
+                    claimant.claim_lost()
+        if self.waiting and weedy.any():
+            for claimant in list(self.waiting):
+                claimant.work_available()
+
+    def claim(self, claimant, x, y):
+        """Claim the best free weedy plot for a picker at (x, y), or None
+
+        Plots are ranked by distance to the plot center minus
+        WEED_LEVEL_PRIORITY pixels per weed level, so heavily overgrown
+        plots win unless they are much farther away. Any previous claim
+        of the claimant is released.
+        """
+        self.release(claimant)
+        store = self.store
+        candidates = store.weedy.indices()
+        if self.claims:
+            candidates = candidates[~np.isin(candidates, list(self.claims))]
+        if len(candidates) == 0:
+            self.waiting[claimant] = True
+            return None
+        self.waiting.pop(claimant, None)
+
+        distance = np.hypot(store.x[candidates] + PLOT_SIZE / 2 - x,
+                            store.y[candidates] + PLOT_SIZE / 2 - y)
+        score = distance - store.weed_level[candidates] * WEED_LEVEL_PRIORITY
+        index = int(candidates[np.argmin(score)])
+
+        self.claims[index] = claimant
+        self.claimed_by[claimant] = index
+        return index
+
+    def release(self, claimant):
+        """Give up the claimant's plot, if any, and stop waiting for work"""
+        self.waiting.pop(claimant, None)
+        index = self.claimed_by.pop(claimant, None)
+        if index is not None:
+            del self.claims[index]
+
+    def __len__(self):
+        return len(self.store.weedy)